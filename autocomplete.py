@@ -0,0 +1,314 @@
+import heapq
+import threading
+from collections import Counter
+import unicodedata
+
+import database
+
+# Suggestions returned per prefix unless asked otherwise
+SUGGESTION_LIMIT = 8
+
+# Best suggestions cached on every trie node; bigger requests walk the subtree
+TOP_CACHE_SIZE = 16
+
+def normalize_key(text):
+    """Lower-case text, strip accents and collapse whitespace for prefix matching"""
+    text = text or ''
+    if text.isascii():
+        return ' '.join(text.lower().split())
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.casefold().split())
+
+def _rank(item):
+    """Order suggestions by weight, then alphabetically"""
+    (kind, text), weight = item
+    return (-weight, text.casefold(), kind)
+
+class _TrieNode:
+    __slots__ = ('label', 'children', 'entries', 'top')
+
+    def __init__(self, label=''):
+        # Edge label leading to this node; chains of single children are merged into one label
+        self.label = label
+        self.children = {}
+        # Suggestions whose key ends at this node, as {(kind, text): weight}
+        self.entries = None
+        # Cached best (suggestion, weight) pairs of the whole subtree, None when stale
+        self.top = None
+
+def _common_prefix_length(a, b):
+    length = min(len(a), len(b))
+    for i in range(length):
+        if a[i] != b[i]:
+            return i
+    return length
+
+class PrefixTrie:
+    """Radix trie mapping keys to weighted suggestions, with cached top-k per node"""
+
+    def __init__(self):
+        self.root = _TrieNode()
+        self.node_count = 1
+
+    def insert(self, key, suggestion, weight=1):
+        """Add weight to suggestion under key"""
+        node = self.root
+        node.top = None
+        i = 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None:
+                child = node.children[key[i]] = _TrieNode(key[i:])
+                self.node_count += 1
+            elif not key.startswith(child.label, i):
+                shared = _common_prefix_length(child.label, key[i:])
+                # Split the edge where the new key leaves it
+                middle = node.children[key[i]] = _TrieNode(child.label[:shared])
+                child.label = child.label[shared:]
+                middle.children[child.label[0]] = child
+                self.node_count += 1
+                child = middle
+            node = child
+            node.top = None
+            i += len(node.label)
+
+        if node.entries is None:
+            node.entries = {}
+        node.entries[suggestion] = node.entries.get(suggestion, 0) + weight
+
+    def remove(self, key, suggestion, weight=1):
+        """Take weight away from suggestion under key, compacting nodes left empty"""
+        path = [self.root]
+        i = 0
+        while i < len(key):
+            node = path[-1].children.get(key[i])
+            if node is None or not key.startswith(node.label, i):
+                return
+            path.append(node)
+            i += len(node.label)
+
+        node = path[-1]
+        if not node.entries or suggestion not in node.entries:
+            return
+
+        remaining = node.entries[suggestion] - weight
+        if remaining > 0:
+            node.entries[suggestion] = remaining
+        else:
+            del node.entries[suggestion]
+            if not node.entries:
+                node.entries = None
+
+        for node in path:
+            node.top = None
+
+        # An empty leaf goes away, and a node without entries and a single
+        # child is merged into that child, so the trie stays as compact as a fresh one
+        node = path[-1]
+        if node is not self.root and node.entries is None and not node.children:
+            del path[-2].children[node.label[0]]
+            self.node_count -= 1
+            path.pop()
+        node = path[-1]
+        if node is not self.root and node.entries is None and len(node.children) == 1:
+            (child,) = node.children.values()
+            child.label = node.label + child.label
+            path[-2].children[child.label[0]] = child
+            self.node_count -= 1
+
+    def find(self, prefix):
+        """Return the node whose subtree holds every key starting with prefix, or None"""
+        node = self.root
+        i = 0
+        while i < len(prefix):
+            child = node.children.get(prefix[i])
+            if child is None:
+                return None
+            if prefix.startswith(child.label, i):
+                i += len(child.label)
+            elif child.label.startswith(prefix[i:]):
+                # The prefix ends part-way along the edge
+                return child
+            else:
+                return None
+            node = child
+        return node
+
+    def _top(self, node):
+        """Return the cached best suggestions of a subtree, rebuilding it if stale"""
+        if node.top is None:
+            if not node.children:
+                # Leaves (most nodes) hold a single suggestion or a handful
+                node.top = sorted(node.entries.items(), key=_rank)[:TOP_CACHE_SIZE] if node.entries else []
+                return node.top
+            best = dict(node.entries) if node.entries else {}
+            for child in node.children.values():
+                for suggestion, weight in self._top(child):
+                    if weight > best.get(suggestion, 0):
+                        best[suggestion] = weight
+            node.top = heapq.nsmallest(TOP_CACHE_SIZE, best.items(), key=_rank)
+        return node.top
+
+    def _collect(self, node, best):
+        """Gather every suggestion of a subtree into best"""
+        if node.entries:
+            for suggestion, weight in node.entries.items():
+                if weight > best.get(suggestion, 0):
+                    best[suggestion] = weight
+        for child in node.children.values():
+            self._collect(child, best)
+
+    def top(self, prefix, k):
+        """Return the k best (suggestion, weight) pairs under prefix"""
+        node = self.find(prefix)
+        if node is None:
+            return []
+        if k <= TOP_CACHE_SIZE:
+            return self._top(node)[:k]
+
+        best = {}
+        self._collect(node, best)
+        return heapq.nsmallest(k, best.items(), key=_rank)
+
+def suggestion_keys(kind, text, aliases=()):
+    """Get the trie keys of a suggestion: every word start of its text, plus aliases"""
+    key = normalize_key(text)
+    if kind == 'email':
+        keys = [key]
+    else:
+        keys = [key[i:] for i in range(len(key)) if i == 0 or key[i - 1] == ' ']
+    keys.extend(normalize_key(alias) for alias in aliases)
+    return [key for key in dict.fromkeys(keys) if key]
+
+def professor_terms(professor):
+    """Get the (kind, text, aliases) terms a professor contributes"""
+    terms = [('professor', f"{professor['first_name']} {professor['last_name']}", ())]
+    if professor['email']:
+        terms.append(('email', professor['email'], ()))
+    if professor['subject_id']:
+        terms.append(('subject', professor['subject_id'], ()))
+    return terms
+
+def course_terms(course_code, course_name):
+    """Get the (kind, text, aliases) terms a course contributes; the code is an alias"""
+    return [('course', course_name, (course_code,))]
+
+class Autocomplete:
+    """
+    Search-as-you-type suggestions for professor names, emails, subjects and
+    course names, kept in memory and updated as professors and courses change
+    """
+
+    def __init__(self):
+        self.trie = PrefixTrie()
+        self._lock = threading.Lock()
+        self._professor_terms = {}
+        self._course_terms = {}
+        self._reload_pending = False
+
+    def load(self):
+        """Load every professor and course into an empty trie"""
+        professors = database.get_all_professors()
+        courses = database.get_all_courses()
+
+        with self._lock:
+            self.trie = PrefixTrie()
+            self._professor_terms = {}
+            self._course_terms = {}
+            
+            # Shared subjects and names are counted first and inserted once with their weight
+            weights = Counter()
+            for professor in professors:
+                terms = professor_terms(professor)
+                self._professor_terms[professor['faculty_id']] = terms
+                weights.update(terms)
+            for course in courses:
+                terms = course_terms(course['course_code'], course['course_name'])
+                self._course_terms[course['course_code']] = terms
+                weights.update(terms)
+            
+            for (kind, text, aliases), weight in weights.items():
+                for key in suggestion_keys(kind, text, aliases):
+                    self.trie.insert(key, (kind, text), weight)
+            
+            # Fill the per-node caches now rather than on the first keystroke
+            self.trie.top('', 1)
+
+    def suggest(self, prefix, limit=SUGGESTION_LIMIT):
+        """Return up to limit (kind, text) suggestions for prefix, most common first"""
+        prefix = normalize_key(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            return [suggestion for suggestion, weight in self.trie.top(prefix, limit)]
+
+    def _add_terms(self, terms):
+        for kind, text, aliases in terms:
+            for key in suggestion_keys(kind, text, aliases):
+                self.trie.insert(key, (kind, text))
+
+    def _remove_terms(self, terms):
+        for kind, text, aliases in terms:
+            for key in suggestion_keys(kind, text, aliases):
+                self.trie.remove(key, (kind, text))
+
+    def _add_professor(self, professor):
+        terms = professor_terms(professor)
+        self._add_terms(terms)
+        self._professor_terms[professor['faculty_id']] = terms
+
+    def _add_course(self, course_code, course_name):
+        terms = course_terms(course_code, course_name)
+        self._add_terms(terms)
+        self._course_terms[course_code] = terms
+
+    def reload_later(self):
+        """Rebuild the trie on a background thread; requests made meanwhile share one rebuild"""
+        with self._lock:
+            if self._reload_pending:
+                return
+            self._reload_pending = True
+
+        def reload():
+            # Cleared before reading, so a change announced during the read gets a rebuild of its own
+            self._reload_pending = False
+            self.load()
+
+        threading.Thread(target=reload, daemon=True).start()
+
+    def on_change(self, entity, entity_id, operation):
+        """Apply one professor or course change to the trie instead of rebuilding it"""
+        if operation == 'reload':
+            # Bulk or another kiosk's changes: which rows changed is unknown
+            if entity in ('professor', 'course'):
+                self.reload_later()
+        elif entity == 'professor':
+            professor = database.get_professor_by_id(entity_id) if operation != 'delete' else None
+            with self._lock:
+                self._remove_terms(self._professor_terms.pop(entity_id, []))
+                if professor:
+                    self._add_professor(professor)
+        elif entity == 'course':
+            course = database.get_course_by_code(entity_id) if operation != 'delete' else None
+            with self._lock:
+                self._remove_terms(self._course_terms.pop(entity_id, []))
+                if course:
+                    self._add_course(entity_id, course['course_name'])
+
+_autocomplete = None
+_autocomplete_lock = threading.Lock()
+
+def get_autocomplete():
+    """Get the shared autocomplete service, loading it on first use"""
+    global _autocomplete
+    with _autocomplete_lock:
+        if _autocomplete is None:
+            _autocomplete = Autocomplete()
+            _autocomplete.load()
+            database.add_change_listener(_autocomplete.on_change)
+        return _autocomplete
+
+def suggest(prefix, limit=SUGGESTION_LIMIT):
+    """Return autocomplete suggestions for prefix from the shared service"""
+    return get_autocomplete().suggest(prefix, limit)
@@ -1,11 +1,1108 @@
 import sqlite3
 import os
+import gc
+import re
+import unicodedata
+import queue
+import threading
+import functools
+import traceback
+from datetime import datetime
+from collections import OrderedDict
+from contextlib import contextmanager
+from schedule_conflicts import ScheduleConflictEngine, room_key, sweep_conflicts
+
+DB_PATH = 'faculty_db.sqlite'
+
+# Number of idle connections kept open for reuse
+POOL_SIZE = 4
+
+# Number of read-query results kept in memory; 0 turns the cache off
+QUERY_CACHE_SIZE = 256
+
+# Storage profile applied to every new connection. WAL lets kiosks keep reading
+# while the admin station writes; it needs all processes on the same host, so
+# use journal_mode 'DELETE' if the database lives on a network share.
+STORAGE_PROFILE = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,              # milliseconds to wait on a locked database
+    'mmap_size': 64 * 1024 * 1024,     # bytes of the file mapped into memory
+    'cache_size': -16000,              # negative means KiB, i.e. ~16 MB page cache
+    'temp_store': 'MEMORY',
+}
+
+def apply_storage_profile(conn, profile=None):
+    """Apply the storage PRAGMAs of a profile to a connection"""
+    profile = STORAGE_PROFILE if profile is None else profile
+    for pragma in ('busy_timeout', 'journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'temp_store'):
+        if profile.get(pragma) is not None:
+            conn.execute(f"PRAGMA {pragma} = {profile[pragma]}")
+
+class ConnectionPool:
+    """A small process-wide pool of reusable SQLite connections"""
+    def __init__(self, db_path, size=POOL_SIZE, profile=None, on_connect=None):
+        self.db_path = db_path
+        self.size = size
+        self.profile = profile
+        self.on_connect = on_connect
+        self._idle = queue.LifoQueue(maxsize=size) if size > 0 else None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _create_connection(self):
+        """Open and configure a new connection (done once per connection)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        apply_storage_profile(conn, self.profile)
+        if self.on_connect is not None:
+            self.on_connect(conn)
+        return conn
+
+    def acquire(self):
+        """Take an idle connection, or open a new one if none is available"""
+        if self._idle is not None:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+        return self._create_connection()
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding any unfinished transaction"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            return
+
+        with self._lock:
+            if self._idle is None or self._closed:
+                conn.close()
+                return
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                # Pool already holds enough idle connections
+                conn.close()
+
+    def close(self):
+        """Close every idle connection and stop accepting returned ones"""
+        with self._lock:
+            self._closed = True
+            while self._idle is not None and not self._idle.empty():
+                self._idle.get_nowait().close()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Get the shared connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+    return _pool
+
+def configure_pool(db_path=None, size=None, profile=None, on_connect=None):
+    """Replace the shared pool, e.g. to point at another database file or storage profile"""
+    global _pool, DB_PATH
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        if db_path is not None:
+            DB_PATH = db_path
+        _pool = ConnectionPool(DB_PATH, POOL_SIZE if size is None else size, profile, on_connect)
+    _query_cache.reset()
+    _reset_change_watcher()
+    return _pool
+
+def close_all_connections():
+    """Close all pooled connections (e.g. on application shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+    _query_cache.reset()
+    _reset_change_watcher()
+
+def get_connection():
+    """Get a connection from the shared pool"""
+    return get_pool().acquire()
+
+def release_connection(conn):
+    """Give a connection back to the shared pool"""
+    get_pool().release(conn)
+
+@contextmanager
+def pooled_connection():
+    """Context manager that borrows a pooled connection for the block"""
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        release_connection(conn)
+
+class QueryCache:
+    """
+    LRU cache of read-query results, emptied whenever the database changes.
+    Changes are detected with PRAGMA data_version on a connection of its own,
+    which moves on every commit made by any other connection, whether from
+    this process or another kiosk sharing the file.
+    """
+
+    def __init__(self, size=QUERY_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.stats = {}
+        self.version = None
+        self._watcher = None
+        self._lock = threading.Lock()
+
+    def _data_version(self):
+        # Never used for writes, so its data_version only moves for other connections' commits
+        if self._watcher is None:
+            self._watcher = sqlite3.connect(DB_PATH, check_same_thread=False)
+        return self._watcher.execute('PRAGMA data_version').fetchone()[0]
+
+    def _validate(self):
+        """Drop every entry if the database changed since they were read; return the version"""
+        version = self._data_version()
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+        return version
+
+    def _count(self, name, hit):
+        counts = self.stats.get(name)
+        if counts is None:
+            counts = self.stats[name] = {'hits': 0, 'misses': 0}
+        counts['hits' if hit else 'misses'] += 1
+
+    def call(self, func, args, kwargs):
+        """Return func(*args, **kwargs), from the cache when the database has not changed"""
+        try:
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        with self._lock:
+            version = self._validate()
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self._count(func.__name__, True)
+                return _copy_result(self.entries[key])
+            self._count(func.__name__, False)
+
+        result = func(*args, **kwargs)
+
+        with self._lock:
+            # A commit during the query may make the result stale, so only keep it
+            # if the version it was read under is still current
+            if version == self.version and self.size > 0:
+                self.entries[key] = result
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.size:
+                    self.entries.popitem(last=False)
+        return _copy_result(result)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def reset(self):
+        """Forget entries, counters and the watcher connection (e.g. when DB_PATH changes)"""
+        with self._lock:
+            self.entries.clear()
+            self.stats = {}
+            self.version = None
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+
+def _copy_result(result):
+    """Copy a cached result so callers can modify what they get back"""
+    if isinstance(result, list):
+        return [dict(row) if isinstance(row, dict) else row for row in result]
+    if isinstance(result, dict):
+        return dict(result)
+    return result
+
+_query_cache = QueryCache()
+
+def cached_query(func):
+    """Decorator serving a read function's results from the shared query cache"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return _query_cache.call(func, args, kwargs)
+    wrapper.uncached = func
+    return wrapper
+
+def get_query_cache_stats():
+    """Get {function name: {'hits': n, 'misses': n}} for the read-query cache"""
+    with _query_cache._lock:
+        return {name: dict(counts) for name, counts in _query_cache.stats.items()}
+
+def clear_query_cache():
+    """Empty the read-query cache (the hit and miss counters are kept)"""
+    _query_cache.clear()
+
+# Callbacks run after a write commits, as callback(entity, entity_id, operation)
+# with entity one of CHANGE_ENTITIES and operation one of 'insert', 'update' or
+# 'delete'. Rows removed along with another (a professor's schedules, say) get
+# their own 'delete'. Bulk writes and other processes' commits are announced as
+# (entity, None, 'reload'): any row of that entity may have changed.
+CHANGE_ENTITIES = ('professor', 'department', 'course', 'schedule')
+_change_listeners = []
+
+def add_change_listener(callback):
+    """Register a callback for committed changes"""
+    if callback not in _change_listeners:
+        _change_listeners.append(callback)
+
+def remove_change_listener(callback):
+    """Unregister a change callback"""
+    if callback in _change_listeners:
+        _change_listeners.remove(callback)
+
+# Connection of poll_external_changes, and the data_version and change_log
+# sequence it last saw; like the query cache's watcher it is never used for writes
+_change_watcher = None
+_change_version = None
+_change_seq = None
+_change_watcher_lock = threading.Lock()
+
+def _watched_data_version():
+    global _change_watcher
+    if _change_watcher is None:
+        _change_watcher = sqlite3.connect(DB_PATH, check_same_thread=False)
+    return _change_watcher.execute('PRAGMA data_version').fetchone()[0]
+
+def _watched_change_seq():
+    """
+    The last change_log sequence number handed out, or None before the change
+    log exists. It only moves for writes to SYNCED_TABLES, and never backwards,
+    even when log entries are deleted.
+    """
+    try:
+        row = _change_watcher.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else 0
+
+def _reset_change_watcher():
+    """Forget the poller's connection (e.g. when DB_PATH changes)"""
+    global _change_watcher, _change_version, _change_seq
+    with _change_watcher_lock:
+        if _change_watcher is not None:
+            _change_watcher.close()
+        _change_watcher = None
+        _change_version = None
+        _change_seq = None
+
+def notify_change(entity, entity_id, operation):
+    """Tell every listener about a committed change; a failing listener never fails the write"""
+    global _change_version, _change_seq
+    # This process's commits are announced here, so the poller need not report them
+    # again (a commit from elsewhere in the same instant waits for the next change)
+    if _change_version is not None and operation != 'reload':
+        with _change_watcher_lock:
+            if _change_watcher is not None:
+                _change_version = _watched_data_version()
+                _change_seq = _watched_change_seq()
+    for callback in list(_change_listeners):
+        try:
+            callback(entity, entity_id, operation)
+        except Exception as e:
+            print(f"Change listener failed for {entity} {entity_id}: {e}")
+            traceback.print_exc()
+
+def notify_deleted(entity, entity_ids):
+    """notify_change a 'delete' for each of entity_ids"""
+    for entity_id in entity_ids:
+        notify_change(entity, entity_id, 'delete')
+
+def poll_external_changes():
+    """
+    Check whether another process (another kiosk sharing the file, an import
+    script) changed the directory since the last call, and if so announce a
+    'reload' of each entity it changed. Commits that leave SYNCED_TABLES
+    alone, like an admin login, are passed over. Usually one PRAGMA read,
+    cheap enough to call every second or two. Returns True if there were such
+    changes.
+    """
+    global _change_version, _change_seq
+    with _change_watcher_lock:
+        version = _watched_data_version()
+        if version == _change_version:
+            return False
+        seq = _watched_change_seq()
+        entities = []
+        if _change_version is not None and (seq is None or seq != _change_seq):
+            entities = _changed_entities(_change_seq, seq)
+        _change_version, _change_seq = version, seq
+    for entity in entities:
+        notify_change(entity, None, 'reload')
+    return bool(entities)
+
+def _changed_entities(after_seq, seq):
+    """
+    The entities with change_log entries after after_seq, or all of them when
+    that cannot be told (no change log yet, or its entries already deleted)
+    """
+    if seq is None or after_seq is None:
+        return list(CHANGE_ENTITIES)
+    counts = dict(_change_watcher.execute('''
+    SELECT table_name, COUNT(*) FROM change_log
+    WHERE seq > ? AND seq <= ?
+    GROUP BY table_name
+    ''', (after_seq, seq)).fetchall())
+    # Fewer entries than numbers handed out: some were deleted, so assume the worst
+    if sum(counts.values()) != seq - after_seq:
+        return list(CHANGE_ENTITIES)
+    return [entity for table, _, entity in SYNCED_TABLES if table in counts]
+
+# Teaching days in week order, and the semesters a schedule can belong to
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+SEMESTERS = ['1st', '2nd', 'Summer']
+
+MINUTES_PER_DAY = 24 * 60
+
+def parse_schedule_time(value):
+    """Convert an 'H:MM' or 'HH:MM' time to minutes after midnight, raising ValueError if invalid"""
+    match = re.fullmatch(r'(\d{1,2}):(\d{2})', str(value).strip())
+    if not match or int(match.group(1)) > 24 or int(match.group(2)) > 59:
+        raise ValueError(f"Invalid time '{value}'. Use HH:MM")
+    minutes = int(match.group(1)) * 60 + int(match.group(2))
+    if minutes > MINUTES_PER_DAY:
+        raise ValueError(f"Invalid time '{value}'. Use HH:MM")
+    return minutes
+
+def format_schedule_time(minutes):
+    """Convert minutes after midnight to the 'HH:MM' form stored in professor_sched"""
+    return f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+def minute_of_week(day_of_week, minutes):
+    """Get the minute-of-week of a time on a teaching day (Monday 00:00 is 0)"""
+    return DAYS_OF_WEEK.index(day_of_week) * MINUTES_PER_DAY + minutes
+
+def _minute_of_week_sql(time_column):
+    """SQL expression computing the minute-of-week of an 'HH:MM' column of professor_sched"""
+    day_ordinal = ' '.join(f"WHEN '{day}' THEN {i}" for i, day in enumerate(DAYS_OF_WEEK))
+    return (f"(CASE day_of_week {day_ordinal} END) * {MINUTES_PER_DAY}"
+            f" + CAST(substr({time_column}, 1, 2) AS INTEGER) * 60"
+            f" + CAST(substr({time_column}, 4, 2) AS INTEGER)")
+
+# Integer minute-of-week columns derived from day_of_week/start_time/end_time.
+# They are VIRTUAL generated columns, so every write path keeps them in sync
+# and ALTER TABLE can add them to existing databases.
+SCHEDULE_MINUTE_COLUMNS = [
+    ('start_minute', f"INTEGER GENERATED ALWAYS AS ({_minute_of_week_sql('start_time')}) VIRTUAL"),
+    ('end_minute', f"INTEGER GENERATED ALWAYS AS ({_minute_of_week_sql('end_time')}) VIRTUAL"),
+]
+
+def validate_schedule_fields(day_of_week, start_time, end_time, semester_num):
+    """
+    Check a schedule's day, times and semester.
+    Returns (start_minute, end_minute, start_time, end_time) with the times in
+    'HH:MM' form, or raises ValueError with a message for the user.
+    """
+    if day_of_week not in DAYS_OF_WEEK:
+        raise ValueError(f"Invalid day of week. Must be one of: {', '.join(DAYS_OF_WEEK)}")
+    if semester_num not in SEMESTERS:
+        raise ValueError(f"Invalid semester. Must be one of: {', '.join(SEMESTERS)}")
+    
+    start = parse_schedule_time(start_time)
+    end = parse_schedule_time(end_time)
+    if end <= start:
+        raise ValueError("End time must be after start time")
+    
+    return (minute_of_week(day_of_week, start), minute_of_week(day_of_week, end),
+            format_schedule_time(start), format_schedule_time(end))
+
+# Per-professor and per-room interval trees over every schedule, kept in step
+# with professor_sched through the trigger-maintained schedule_revision counter
+_conflict_engine = ScheduleConflictEngine()
+
+def create_schedule_revision(cursor):
+    """Create the professor_sched revision counter, bumped by triggers on every change"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS schedule_revision (
+        id INTEGER PRIMARY KEY CHECK(id = 1),
+        revision INTEGER NOT NULL
+    )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO schedule_revision (id, revision) VALUES (1, 0)')
+    
+    for operation in ('INSERT', 'UPDATE', 'DELETE'):
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS professor_sched_revision_{operation.lower()}
+        AFTER {operation} ON professor_sched BEGIN
+            UPDATE schedule_revision SET revision = revision + 1 WHERE id = 1;
+        END
+        ''')
+
+def read_schedule_revision(cursor):
+    """Get the professor_sched revision (read it under the write lock to pair it with a write)"""
+    cursor.execute('SELECT revision FROM schedule_revision WHERE id = 1')
+    return cursor.fetchone()[0]
+
+def sync_conflict_engine(cursor):
+    """Reload the conflict engine if professor_sched changed behind its back; returns the revision"""
+    revision = read_schedule_revision(cursor)
+    
+    with _conflict_engine.lock:
+        if _conflict_engine.revision != revision:
+            cursor.execute('''
+            SELECT schedule_id, faculty_id, room_location, academic_year, semester_num,
+                   start_minute, end_minute
+            FROM professor_sched
+            ''')
+            _conflict_engine.clear()
+            for row in cursor.fetchall():
+                _conflict_engine.add(*row)
+            _conflict_engine.revision = revision
+    
+    return revision
+
+def check_schedule_conflicts(cursor, professor_message, faculty_id, day_of_week, room_location,
+                             academic_year, semester_num, start_minute, end_minute, exclude_schedule_id=None):
+    """
+    Check a proposed class for professor and room double-bookings in the same
+    academic year and semester. Call inside the write transaction (BEGIN IMMEDIATE).
+    Returns (error message or None, revision to pass to apply_schedule_change).
+    """
+    revision = sync_conflict_engine(cursor)
+    
+    with _conflict_engine.lock:
+        conflicts = _conflict_engine.find_conflicts(faculty_id, room_location, academic_year, semester_num,
+                                                    start_minute, end_minute, exclude_schedule_id)
+    
+    messages = []
+    for kind, schedule_id in conflicts:
+        if kind == 'professor':
+            messages.append(professor_message)
+        else:
+            messages.append(f"Room conflict: {room_location} is already booked during this time on {day_of_week}")
+    
+    return ('\n'.join(messages) or None), revision
+
+def apply_schedule_change(revision, schedule_id, faculty_id, room_location, academic_year, semester_num,
+                          start_minute, end_minute):
+    """After committing one schedule insert/update checked at revision, update the engine in place"""
+    with _conflict_engine.lock:
+        # Otherwise someone else got in between, and the next check reloads
+        if _conflict_engine.revision == revision:
+            _conflict_engine.add(schedule_id, faculty_id, room_location, academic_year, semester_num,
+                                 start_minute, end_minute)
+            _conflict_engine.revision = revision + 1
+
+def apply_schedule_delete(revision, schedule_ids):
+    """After committing the deletion of schedule_ids at revision, drop them from the engine in place"""
+    with _conflict_engine.lock:
+        # Otherwise someone else got in between, and the next check reloads
+        if _conflict_engine.revision == revision:
+            for schedule_id in schedule_ids:
+                _conflict_engine.remove(schedule_id)
+            _conflict_engine.revision = revision + len(schedule_ids)
+
+def find_batch_schedule_conflicts(schedules):
+    """
+    Enumerate every professor and room conflict of a batch of proposed classes,
+    given as (faculty_id, room_location, academic_year, semester_num,
+    start_minute, end_minute) tuples; see ScheduleConflictEngine.find_batch_conflicts
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    sync_conflict_engine(cursor)
+    with _conflict_engine.lock:
+        conflicts = _conflict_engine.find_batch_conflicts(schedules)
+    
+    release_connection(conn)
+    return conflicts
+
+def audit_schedule_conflicts():
+    """
+    Find every professor and room double-booking in professor_sched with one
+    read of the table, then one sort and sweep per (resource, term, day).
+    Returns a JSON-serializable report; rows whose day, times or semester fail
+    the add_schedule validation are listed under invalid_rows instead.
+    """
+    # The audit builds millions of small acyclic tuples and lists; pausing the
+    # cycle collector meanwhile saves repeated scans of the growing heap
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _audit_schedule_conflicts()
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+def _audit_schedule_conflicts():
+    conn = get_connection()
+    cursor = conn.cursor()
+    # Plain tuples: this reads every row of the table
+    cursor.row_factory = None
+    
+    cursor.execute('''
+    SELECT schedule_id, faculty_id, day_of_week, start_time, end_time,
+           room_location, academic_year, semester_num, course_code
+    FROM professor_sched
+    ''')
+    
+    # Timetables reuse a small set of (day, start, end, semester) combinations and rooms
+    validated = {}
+    rooms = {}
+    schedules = {}
+    groups = {}
+    invalid_rows = []
+    checked = 0
+    for schedule_id, faculty_id, day_of_week, start_time, end_time, room_location, academic_year, semester_num, course_code in cursor:
+        checked += 1
+        fields = (day_of_week, start_time, end_time, semester_num)
+        if fields not in validated:
+            try:
+                validated[fields] = validate_schedule_fields(*fields)[:2]
+            except ValueError as e:
+                validated[fields] = str(e)
+        minutes = validated[fields]
+        if faculty_id is None:
+            minutes = "Schedule has no professor"
+        if isinstance(minutes, str):
+            invalid_rows.append({'schedule_id': schedule_id, 'error': minutes})
+            continue
+        
+        start_minute, end_minute = minutes
+        schedules[schedule_id] = (day_of_week, room_location, course_code)
+        interval = (start_minute, end_minute, schedule_id)
+        day = start_minute // MINUTES_PER_DAY
+        groups.setdefault(('professor', faculty_id, academic_year, semester_num, day), []).append(interval)
+        room = rooms.get(room_location)
+        if room is None:
+            room = rooms[room_location] = room_key(room_location)
+        if room:
+            groups.setdefault(('room', room, academic_year, semester_num, day), []).append(interval)
+    
+    release_connection(conn)
+    
+    conflicts = []
+    summary = {'professor': 0, 'room': 0}
+    for (kind, key, academic_year, semester_num, day), intervals in groups.items():
+        if len(intervals) < 2:
+            continue
+        day_start = day * MINUTES_PER_DAY
+        for first_id, second_id, overlap_start, overlap_end in sweep_conflicts(intervals):
+            conflict = {'type': kind}
+            if kind == 'professor':
+                conflict['faculty_id'] = key
+            else:
+                conflict['room'] = schedules[first_id][1]
+            conflict.update({
+                'academic_year': academic_year,
+                'semester_num': semester_num,
+                'day_of_week': DAYS_OF_WEEK[day],
+                'overlap_start': format_schedule_time(overlap_start - day_start),
+                'overlap_end': format_schedule_time(overlap_end - day_start),
+                'schedule_ids': [first_id, second_id],
+                'course_codes': [schedules[first_id][2], schedules[second_id][2]],
+            })
+            conflicts.append(conflict)
+            summary[kind] += 1
+    
+    return {
+        'schedules_checked': checked,
+        'conflict_count': len(conflicts),
+        'summary': summary,
+        'conflicts': conflicts,
+        'invalid_rows': invalid_rows,
+    }
+
+def ensure_schedule_minute_columns(cursor):
+    """Add the minute-of-week columns to an existing professor_sched table"""
+    # Generated columns only show up in table_xinfo
+    cursor.execute('PRAGMA table_xinfo(professor_sched)')
+    column_names = [column[1] for column in cursor.fetchall()]
+    
+    # The generated columns expect zero-padded 'HH:MM' times
+    cursor.execute('''
+    SELECT schedule_id, start_time, end_time FROM professor_sched
+    WHERE length(start_time) != 5 OR length(end_time) != 5
+    ''')
+    for schedule_id, start_time, end_time in cursor.fetchall():
+        try:
+            cursor.execute('''
+            UPDATE professor_sched SET start_time = ?, end_time = ? WHERE schedule_id = ?
+            ''', (format_schedule_time(parse_schedule_time(start_time)),
+                  format_schedule_time(parse_schedule_time(end_time)), schedule_id))
+        except ValueError as e:
+            print(f"Schedule {schedule_id} has an unreadable time: {e}")
+    
+    for column_name, definition in SCHEDULE_MINUTE_COLUMNS:
+        if column_name not in column_names:
+            cursor.execute(f'ALTER TABLE professor_sched ADD COLUMN {column_name} {definition}')
+    
+    # Superseded by idx_professor_sched_faculty_minutes
+    cursor.execute('DROP INDEX IF EXISTS idx_professor_sched_faculty_day_start')
+
+def ensure_professor_phone_column(cursor):
+    """Add the phone column to professors tables created before it existed"""
+    cursor.execute('PRAGMA table_info(professors)')
+    if 'phone' not in [column[1] for column in cursor.fetchall()]:
+        # Numbers used to be made up on every read, so existing professors start without one
+        cursor.execute('ALTER TABLE professors ADD COLUMN phone VARCHAR(20)')
+
+def ensure_photo_url_column(cursor):
+    """Add the photo_url column to professors tables created before it existed"""
+    cursor.execute('PRAGMA table_info(professors)')
+    if 'photo_url' not in [column[1] for column in cursor.fetchall()]:
+        cursor.execute('ALTER TABLE professors ADD COLUMN photo_url TEXT')
+        print("Added photo_url column to professors table")
+
+def ensure_admin_table(cursor):
+    """Create the admin_users table with a default admin user if it does not exist"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='admin_users'")
+    if cursor.fetchone():
+        return
+    
+    cursor.execute('''
+    CREATE TABLE admin_users (
+        admin_id INTEGER PRIMARY KEY,
+        username VARCHAR(50) UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        full_name VARCHAR(100),
+        email VARCHAR(100),
+        last_login TIMESTAMP,
+        is_active BOOLEAN DEFAULT 1
+    )
+    ''')
+    
+    # Add default admin user
+    import hashlib
+    default_username = 'admin'
+    default_password = 'admin123'
+    password_hash = hashlib.sha256(default_password.encode()).hexdigest()
+    
+    cursor.execute('''
+    INSERT INTO admin_users (username, password_hash, full_name, email, is_active)
+    VALUES (?, ?, ?, ?, 1)
+    ''', (default_username, password_hash, 'Administrator', 'admin@university.edu'))
+    print("Created admin_users table and added default admin user")
+
+# Secondary indexes for the hot lookup paths, as (name, table, columns).
+# Add a step to SCHEMA_MIGRATIONS whenever the index set changes so existing
+# databases pick it up.
+SCHEMA_INDEXES = [
+    # get_professor_schedule ordering and the schedule conflict checks (covering)
+    ('idx_professor_sched_faculty_minutes', 'professor_sched', 'faculty_id, start_minute, end_minute'),
+    # filter_professors_by_course and delete_course
+    ('idx_professor_sched_course', 'professor_sched', 'course_code'),
+    # get_professors_by_department, get_all_departments and delete_department
+    ('idx_professors_office', 'professors', 'office_id'),
+    # get_all_professors ordering
+    ('idx_professors_name', 'professors', 'l_name, f_name'),
+    # department lookups by name
+    ('idx_faculty_office_name', 'faculty', 'office_name'),
+    # filter_professors_by_course
+    ('idx_courses_name', 'courses', 'course_name'),
+]
+
+def create_indexes(cursor):
+    """Create every index in SCHEMA_INDEXES that does not exist yet"""
+    for index_name, table, columns in SCHEMA_INDEXES:
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})')
+
+# bm25 column weights for search ranking: names first, then email, subject, department
+SEARCH_RANK_WEIGHTS = (10.0, 10.0, 4.0, 3.0, 2.0)
+
+# Maximum number of professors returned by search_professors
+SEARCH_RESULT_LIMIT = 200
+
+# bm25 costs a few microseconds per matching row, so searches matching more
+# professors than this (e.g. a two-letter prefix) return name-ordered matches
+# instead of ranking every match
+SEARCH_RANK_CANDIDATES = 250
+
+def create_search_index(cursor):
+    """Create the FTS5 search index over professors and keep it in sync with triggers"""
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS professors_fts USING fts5(
+        f_name, l_name, email, subject_id, office_name,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    ''')
+    
+    weights = ', '.join(str(weight) for weight in SEARCH_RANK_WEIGHTS)
+    cursor.execute(f"INSERT INTO professors_fts(professors_fts, rank) VALUES('rank', 'bm25({weights})')")
+    
+    # The FTS rowid is the professor's faculty_id
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS professors_fts_insert AFTER INSERT ON professors BEGIN
+        INSERT INTO professors_fts (rowid, f_name, l_name, email, subject_id, office_name)
+        VALUES (new.faculty_id, new.f_name, new.l_name, new.email, new.subject_id,
+                (SELECT office_name FROM faculty WHERE office_id = new.office_id));
+    END
+    ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS professors_fts_update AFTER UPDATE ON professors BEGIN
+        DELETE FROM professors_fts WHERE rowid = old.faculty_id;
+        INSERT INTO professors_fts (rowid, f_name, l_name, email, subject_id, office_name)
+        VALUES (new.faculty_id, new.f_name, new.l_name, new.email, new.subject_id,
+                (SELECT office_name FROM faculty WHERE office_id = new.office_id));
+    END
+    ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS professors_fts_delete AFTER DELETE ON professors BEGIN
+        DELETE FROM professors_fts WHERE rowid = old.faculty_id;
+    END
+    ''')
+    
+    # Department renames and deletions change the indexed department name
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS professors_fts_faculty_update AFTER UPDATE OF office_name ON faculty BEGIN
+        UPDATE professors_fts SET office_name = new.office_name
+        WHERE rowid IN (SELECT faculty_id FROM professors WHERE office_id = new.office_id);
+    END
+    ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS professors_fts_faculty_delete AFTER DELETE ON faculty BEGIN
+        UPDATE professors_fts SET office_name = NULL
+        WHERE rowid IN (SELECT faculty_id FROM professors WHERE office_id = old.office_id);
+    END
+    ''')
+    
+    # (Re)build the index from the current data
+    cursor.execute('DELETE FROM professors_fts')
+    cursor.execute('''
+    INSERT INTO professors_fts (rowid, f_name, l_name, email, subject_id, office_name)
+    SELECT p.faculty_id, p.f_name, p.l_name, p.email, p.subject_id, f.office_name
+    FROM professors p
+    LEFT JOIN faculty f ON p.office_id = f.office_id
+    ''')
+
+def build_search_query(search_term):
+    """Turn user input into an FTS5 query where every word must match as a prefix"""
+    words = re.findall(r'\w+', search_term.lower())
+    return ' '.join(f'"{word}"*' for word in words)
+
+# Minimum trigram similarity (0..1) between a search word and a name
+FUZZY_SIMILARITY_THRESHOLD = 0.3
+
+def normalize_name(name):
+    """Lower-case a name and strip accents and punctuation, e.g. 'Dela Cruz' -> 'dela cruz'"""
+    normalized = unicodedata.normalize('NFKD', name or '')
+    normalized = ''.join(ch for ch in normalized if not unicodedata.combining(ch)).lower()
+    return ' '.join(re.findall(r'[^\W_]+', normalized))
+
+def name_trigrams(name):
+    """Get the set of trigrams of a name, padding each word like pg_trgm does"""
+    trigrams = set()
+    for word in normalize_name(name).split():
+        padded = f'  {word} '
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+def name_initials(name):
+    """Get the first letter of each word of a normalized name"""
+    return ''.join(word[0] for word in name.split())
+
+def indexed_trigrams(trigrams):
+    """Drop the leading '  x' trigrams, which are kept as initials instead of as (huge) posting lists"""
+    return [trigram for trigram in trigrams if not trigram.startswith('  ')]
+
+def index_professor_name(cursor, faculty_id, first_name, last_name):
+    """(Re)link one professor to the trigram-indexed name vocabulary"""
+    cursor.execute('DELETE FROM professor_name_links WHERE faculty_id = ?', (faculty_id,))
+    for name_part, name in (('f', first_name), ('l', last_name)):
+        name = normalize_name(name)
+        if not name:
+            continue
+        
+        # Each distinct name is indexed once, however many professors share it
+        cursor.execute('SELECT name_id FROM professor_names WHERE name = ?', (name,))
+        row = cursor.fetchone()
+        if row:
+            name_id = row[0]
+        else:
+            trigrams = name_trigrams(name)
+            cursor.execute('''
+            INSERT INTO professor_names (name, trigram_count, initials) VALUES (?, ?, ?)
+            ''', (name, len(trigrams), name_initials(name)))
+            name_id = cursor.lastrowid
+            cursor.executemany('''
+            INSERT INTO name_trigrams (trigram, trigram_count, name_id) VALUES (?, ?, ?)
+            ''', [(trigram, len(trigrams), name_id) for trigram in indexed_trigrams(trigrams)])
+        
+        cursor.execute('''
+        INSERT OR IGNORE INTO professor_name_links (name_id, faculty_id, name_part) VALUES (?, ?, ?)
+        ''', (name_id, faculty_id, name_part))
+
+def rebuild_fuzzy_index(cursor):
+    """Rebuild the name vocabulary and its trigrams from every professor"""
+    cursor.execute('DELETE FROM professor_name_links')
+    cursor.execute('DELETE FROM name_trigrams')
+    cursor.execute('DELETE FROM professor_names')
+    
+    cursor.execute('SELECT faculty_id, f_name, l_name FROM professors')
+    name_ids = {}
+    links = []
+    for faculty_id, first_name, last_name in cursor.fetchall():
+        for name_part, name in (('f', first_name), ('l', last_name)):
+            name = normalize_name(name)
+            if name:
+                name_id = name_ids.setdefault(name, len(name_ids) + 1)
+                links.append((name_id, faculty_id, name_part))
+    
+    names = []
+    trigram_rows = []
+    for name, name_id in name_ids.items():
+        trigrams = name_trigrams(name)
+        names.append((name_id, name, len(trigrams), name_initials(name)))
+        trigram_rows.extend((trigram, len(trigrams), name_id) for trigram in indexed_trigrams(trigrams))
+    
+    cursor.executemany('''
+    INSERT INTO professor_names (name_id, name, trigram_count, initials) VALUES (?, ?, ?, ?)
+    ''', names)
+    cursor.executemany('INSERT INTO name_trigrams (trigram, trigram_count, name_id) VALUES (?, ?, ?)', trigram_rows)
+    cursor.executemany('''
+    INSERT OR IGNORE INTO professor_name_links (name_id, faculty_id, name_part) VALUES (?, ?, ?)
+    ''', links)
+
+def create_fuzzy_index(cursor):
+    """Create and fill the trigram index used for typo-tolerant name search"""
+    # Distinct normalized first and last names; trigram_count includes the
+    # leading '  x' trigrams, which are represented by initials
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS professor_names (
+        name_id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL,
+        trigram_count INTEGER NOT NULL,
+        initials TEXT NOT NULL
+    )
+    ''')
+    
+    # trigram_count is in the key so a search only visits names of a compatible length
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS name_trigrams (
+        trigram TEXT NOT NULL,
+        trigram_count INTEGER NOT NULL,
+        name_id INTEGER NOT NULL,
+        PRIMARY KEY (trigram, trigram_count, name_id)
+    ) WITHOUT ROWID
+    ''')
+    
+    # Which professors have which name as first ('f') or last ('l') name
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS professor_name_links (
+        name_id INTEGER NOT NULL,
+        faculty_id INTEGER NOT NULL,
+        name_part TEXT NOT NULL CHECK(name_part IN ('f', 'l')),
+        PRIMARY KEY (name_id, faculty_id, name_part)
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_professor_name_links_faculty
+    ON professor_name_links (faculty_id)
+    ''')
+    
+    # Names are linked by add_professor/update_professor; deletions from any path are handled here
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS professor_name_links_delete AFTER DELETE ON professors BEGIN
+        DELETE FROM professor_name_links WHERE faculty_id = old.faculty_id;
+    END
+    ''')
+    
+    # (Re)build the index from the current data
+    rebuild_fuzzy_index(cursor)
+
+# Row counts shown on the admin dashboard, as (name, table). create_dashboard_counts
+# keeps them in dashboard_counts with triggers, next to one 'schedules:<semester>'
+# count per semester.
+DASHBOARD_COUNTED_TABLES = [
+    ('professors', 'professors'),
+    ('departments', 'faculty'),
+    ('courses', 'courses'),
+    ('schedules', 'professor_sched'),
+]
+
+def create_dashboard_counts(cursor):
+    """Create the trigger-maintained dashboard_counts table and fill it from the current data"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS dashboard_counts (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+    ''')
+    
+    for name, table in DASHBOARD_COUNTED_TABLES:
+        cursor.execute(f'''
+        INSERT OR REPLACE INTO dashboard_counts (name, value) SELECT ?, COUNT(*) FROM {table}
+        ''', (name,))
+        if table == 'professor_sched':
+            continue
+        for operation, step in (('INSERT', '+ 1'), ('DELETE', '- 1')):
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_count_{operation.lower()}
+            AFTER {operation} ON {table} BEGIN
+                UPDATE dashboard_counts SET value = value {step} WHERE name = '{name}';
+            END
+            ''')
+    
+    for semester in SEMESTERS:
+        cursor.execute('''
+        INSERT OR REPLACE INTO dashboard_counts (name, value)
+        SELECT ?, COUNT(*) FROM professor_sched WHERE semester_num = ?
+        ''', (f'schedules:{semester}', semester))
+    
+    # Schedules are also counted per semester, so moving one between semesters counts too
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS professor_sched_count_insert AFTER INSERT ON professor_sched BEGIN
+        UPDATE dashboard_counts SET value = value + 1
+        WHERE name IN ('schedules', 'schedules:' || new.semester_num);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS professor_sched_count_delete AFTER DELETE ON professor_sched BEGIN
+        UPDATE dashboard_counts SET value = value - 1
+        WHERE name IN ('schedules', 'schedules:' || old.semester_num);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS professor_sched_count_semester
+    AFTER UPDATE OF semester_num ON professor_sched
+    WHEN old.semester_num IS NOT new.semester_num BEGIN
+        UPDATE dashboard_counts SET value = value - 1 WHERE name = 'schedules:' || old.semester_num;
+        UPDATE dashboard_counts SET value = value + 1 WHERE name = 'schedules:' || new.semester_num;
+    END
+    ''')
+
+# Tables replicated to the kiosks, as (table, primary key, change entity), in
+# foreign key order: parents before the rows that refer to them
+SYNCED_TABLES = [
+    ('faculty', 'office_id', 'department'),
+    ('courses', 'course_code', 'course'),
+    ('professors', 'faculty_id', 'professor'),
+    ('professor_sched', 'schedule_id', 'schedule'),
+]
+
+def create_change_log(cursor):
+    """
+    Create the append-only change_log, filled by triggers with the key of every
+    row inserted, updated or deleted in SYNCED_TABLES, and the sync_state table
+    where a replica records how far into its source's log it has applied
+    """
+    # row_key has no type, so integer keys stay integers and course codes text
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        row_key NOT NULL,
+        operation TEXT NOT NULL CHECK(operation IN ('upsert', 'delete'))
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS sync_state (
+        source TEXT PRIMARY KEY,
+        last_seq INTEGER NOT NULL
+    )
+    ''')
+    
+    for table, key, _ in SYNCED_TABLES:
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_log_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO change_log (table_name, row_key, operation) VALUES ('{table}', new.{key}, 'upsert');
+        END
+        ''')
+        # A changed key is the old row deleted and the new one added
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_log_update AFTER UPDATE ON {table} BEGIN
+            INSERT INTO change_log (table_name, row_key, operation)
+            SELECT '{table}', old.{key}, 'delete' WHERE old.{key} IS NOT new.{key};
+            INSERT INTO change_log (table_name, row_key, operation) VALUES ('{table}', new.{key}, 'upsert');
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_log_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO change_log (table_name, row_key, operation) VALUES ('{table}', old.{key}, 'delete');
+        END
+        ''')
+
+def create_replica_acks(cursor):
+    """
+    Create sync_replicas, where the primary records how far into its
+    change_log each kiosk has applied, so entries every kiosk has can be pruned
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS sync_replicas (
+        replica TEXT PRIMARY KEY,
+        last_seq INTEGER NOT NULL,
+        synced_at TEXT NOT NULL
+    )
+    ''')
+
+# Schema changes in the order they were made, as (user_version, description, step).
+# A database at user_version N has had every step up to N applied. Append new
+# steps with the next version; never renumber or edit old ones. Every step is
+# idempotent, so databases that never had a version simply run all of them.
+SCHEMA_MIGRATIONS = [
+    (1, 'photo_url column on professors', ensure_photo_url_column),
+    (2, 'admin_users table with a default admin', ensure_admin_table),
+    (3, 'integer minute-of-week columns on professor_sched', ensure_schedule_minute_columns),
+    (4, 'phone column on professors', ensure_professor_phone_column),
+    (5, 'schedule revision counter and triggers', create_schedule_revision),
+    (6, 'secondary indexes', create_indexes),
+    (7, 'full-text search index', create_search_index),
+    (8, 'fuzzy name index', create_fuzzy_index),
+    (9, 'trigger-maintained dashboard counts', create_dashboard_counts),
+    (10, 'change log and sync state for kiosk replicas', create_change_log),
+    (11, 'kiosk acknowledgements for change log pruning', create_replica_acks),
+]
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+def apply_migrations(cursor, from_version):
+    """Run every migration step newer than from_version and record the new version"""
+    for version, description, step in SCHEMA_MIGRATIONS:
+        if version > from_version:
+            step(cursor)
+    cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+def migrate_database():
+    """Bring the schema up to SCHEMA_VERSION (a single PRAGMA read when it already is)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] >= SCHEMA_VERSION:
+            return
+        
+        # Take the write lock, then check again in case another kiosk migrated meanwhile
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.execute('PRAGMA user_version')
+        version = cursor.fetchone()[0]
+        if version < SCHEMA_VERSION:
+            apply_migrations(cursor, version)
+            print(f"Migrated database schema from version {version} to {SCHEMA_VERSION}")
+        conn.commit()
+    finally:
+        release_connection(conn)
 
 def create_database():
     """Create the database schema based on the ERD"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
+    # Switch the new file to the configured journal mode (persistent for WAL)
+    apply_storage_profile(conn, get_pool().profile)
+    
     # Create Faculty table
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS faculty (
@@ -23,6 +1120,7 @@ def create_database():
         f_name VARCHAR(100) NOT NULL,
         l_name VARCHAR(100) NOT NULL,
         email VARCHAR(50) UNIQUE NOT NULL,
+        phone VARCHAR(20),
         office_id INTEGER,
         subject_id VARCHAR(50),
         photo_url TEXT,
@@ -39,7 +1137,8 @@ def create_database():
     ''')
     
     # Create Professor Schedule table
-    cursor.execute('''
+    minute_columns = ''.join(f'\n        {name} {definition},' for name, definition in SCHEDULE_MINUTE_COLUMNS)
+    cursor.execute(f'''
     CREATE TABLE IF NOT EXISTS professor_sched (
         schedule_id INTEGER PRIMARY KEY,
         faculty_id INTEGER,
@@ -49,34 +1148,24 @@ def create_database():
         room_location VARCHAR(20),
         academic_year TEXT NOT NULL,
         semester_num TEXT CHECK(semester_num IN ('1st', '2nd', 'Summer')),
-        course_code VARCHAR(20),
+        course_code VARCHAR(20),{minute_columns}
         FOREIGN KEY (faculty_id) REFERENCES professors(faculty_id),
         FOREIGN KEY (course_code) REFERENCES courses(course_code)
     )
     ''')
     
-    # Create Admin Users table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS admin_users (
-        admin_id INTEGER PRIMARY KEY,
-        username VARCHAR(50) UNIQUE NOT NULL,
-        password_hash TEXT NOT NULL,
-        full_name VARCHAR(100),
-        email VARCHAR(100),
-        last_login TIMESTAMP,
-        is_active BOOLEAN DEFAULT 1
-    )
-    ''')
+    # Create the admin users table and the secondary and search indexes
+    apply_migrations(cursor, 0)
     
     conn.commit()
-    conn.close()
+    release_connection(conn)
     
     # Ensure photos directory exists
     ensure_photos_directory_exists()
 
 def populate_sample_data():
     """Populate the database with sample data"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Insert sample faculty offices
@@ -95,17 +1184,18 @@ def populate_sample_data():
     
     # Insert sample professors
     professors = [
-        (1, 'John', 'Smith', 'john.smith@university.edu', 1, 'Programming'),
-        (2, 'Emily', 'Johnson', 'emily.johnson@university.edu', 2, 'Software Design'),
-        (3, 'Michael', 'Williams', 'michael.williams@university.edu', 3, 'Networking'),
-        (4, 'Sarah', 'Brown', 'sarah.brown@university.edu', 4, 'Hardware'),
-        (5, 'David', 'Jones', 'david.jones@university.edu', 5, 'Systems')
+        (1, 'John', 'Smith', 'john.smith@university.edu', '+63 917 123 4567', 1, 'Programming'),
+        (2, 'Emily', 'Johnson', 'emily.johnson@university.edu', '0918 234 5678', 2, 'Software Design'),
+        (3, 'Michael', 'Williams', 'michael.williams@university.edu', '+63 919 345 6789', 3, 'Networking'),
+        (4, 'Sarah', 'Brown', 'sarah.brown@university.edu', '0920 456 7890', 4, 'Hardware'),
+        (5, 'David', 'Jones', 'david.jones@university.edu', '+63 921 567 8901', 5, 'Systems')
     ]
     
     cursor.executemany('''
-    INSERT OR IGNORE INTO professors (faculty_id, f_name, l_name, email, office_id, subject_id)
-    VALUES (?, ?, ?, ?, ?, ?)
+    INSERT OR IGNORE INTO professors (faculty_id, f_name, l_name, email, phone, office_id, subject_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
     ''', professors)
+    rebuild_fuzzy_index(cursor)
     
     # Insert sample courses
     courses = [
@@ -149,16 +1239,96 @@ def populate_sample_data():
     ''', (default_username, password_hash, 'Administrator', 'admin@university.edu'))
     
     conn.commit()
-    conn.close()
+    release_connection(conn)
+
+# Rows per page for the paginated reads behind the admin tables
+PAGE_SIZE = 200
+
+def keyset_condition(columns, after):
+    """
+    WHERE condition and parameters selecting the rows that sort after the
+    cursor `after` on columns, or ('1', ()) for the first page
+    """
+    if after is None:
+        return '1', ()
+    return f"({', '.join(columns)}) > ({', '.join('?' * len(columns))})", tuple(after)
+
+def professor_page_key(row):
+    """Keyset cursor of a professor row: its position in get_all_professors order"""
+    return (row['last_name'], row['first_name'], row['faculty_id'])
+
+def course_page_key(row):
+    """Keyset cursor of a course row"""
+    return (row['course_code'],)
+
+def schedule_page_key(row):
+    """Keyset cursor of a schedule row: professor name, then start and end time"""
+    return (row['last_name'], row['first_name'], row['faculty_id'],
+            row['start_minute'], row['end_minute'], row['schedule_id'])
+
+def split_page(rows, limit, key):
+    """Turn limit + 1 fetched rows into (page as dicts, cursor of the next page or None)"""
+    page = [dict(row) for row in rows[:limit]]
+    next_cursor = key(page[-1]) if len(rows) > limit else None
+    return page, next_cursor
+
+# Columns of a professor row as the admin reads return it, from professors p
+# LEFT JOIN faculty f
+PROFESSOR_ROW_COLUMNS = '''p.faculty_id, p.f_name as first_name, p.l_name as last_name, p.email, p.phone,
+           p.subject_id, f.office_name as department_name, f.building_num, f.room_num, p.photo_url'''
+
+# Columns of a schedule row, from professor_sched s JOIN professors p
+SCHEDULE_ROW_COLUMNS = '''s.schedule_id, s.faculty_id, p.f_name as first_name, p.l_name as last_name,
+           s.day_of_week, s.start_time, s.end_time, s.room_location,
+           s.academic_year, s.semester_num, s.course_code, s.start_minute, s.end_minute'''
+
+def fetch_professor_row(cursor, faculty_id):
+    """Get one professor row as a dict, or None"""
+    cursor.execute(f'''
+    SELECT {PROFESSOR_ROW_COLUMNS}
+    FROM professors p
+    LEFT JOIN faculty f ON p.office_id = f.office_id
+    WHERE p.faculty_id = ?
+    ''', (faculty_id,))
+    row = cursor.fetchone()
+    return dict(row) if row else None
+
+def fetch_department_row(cursor, office_id):
+    """Get one department row as get_all_departments returns them, or None"""
+    cursor.execute('''
+    SELECT f.office_id, f.office_name, f.building_num, f.room_num,
+           (SELECT COUNT(*) FROM professors p WHERE p.office_id = f.office_id) as faculty_count
+    FROM faculty f
+    WHERE f.office_id = ?
+    ''', (office_id,))
+    row = cursor.fetchone()
+    return dict(row) if row else None
+
+def fetch_course_row(cursor, course_code):
+    """Get one course row as a dict, or None"""
+    cursor.execute('SELECT * FROM courses WHERE course_code = ?', (course_code,))
+    row = cursor.fetchone()
+    return dict(row) if row else None
+
+def fetch_schedule_row(cursor, schedule_id):
+    """Get one schedule row as get_schedules_page returns them, or None"""
+    cursor.execute(f'''
+    SELECT {SCHEDULE_ROW_COLUMNS}
+    FROM professor_sched s
+    JOIN professors p ON s.faculty_id = p.faculty_id
+    WHERE s.schedule_id = ?
+    ''', (schedule_id,))
+    row = cursor.fetchone()
+    return dict(row) if row else None
 
+@cached_query
 def get_all_professors():
     """Get all professors from the database"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute('''
-    SELECT p.faculty_id, p.f_name as first_name, p.l_name as last_name, p.email, p.subject_id,
+    SELECT p.faculty_id, p.f_name as first_name, p.l_name as last_name, p.email, p.phone, p.subject_id,
            f.office_name as department_name, f.building_num, f.room_num, p.photo_url
     FROM professors p
     LEFT JOIN faculty f ON p.office_id = f.office_id
@@ -166,56 +1336,51 @@ def get_all_professors():
     ''')
     
     rows = cursor.fetchall()
-    conn.close()
-    
-    # Convert sqlite3.Row objects to dictionaries and add phone numbers
-    professors = []
-    phil_prefixes = ["+63", "09"]
-    import random
-    
-    for row in rows:
-        prof_dict = dict(row)
-        # Generate a random Philippine phone number
-        prefix = random.choice(phil_prefixes)
-        if prefix == "+63":
-            # Format: +63 XXX XXX XXXX
-            phone_number = f"{prefix} {random.randint(900, 999)} {random.randint(100, 999)} {random.randint(1000, 9999)}"
-        else:
-            # Format: 09XX XXX XXXX
-            phone_number = f"{prefix}{random.randint(10, 99)} {random.randint(100, 999)} {random.randint(1000, 9999)}"
-        
-        prof_dict['phone'] = phone_number
-        professors.append(prof_dict)
+    release_connection(conn)
     
+    # Convert to dictionaries
+    professors = [dict(row) for row in rows]
     return professors
 
-def get_professor_by_id(faculty_id):
-    """Get professor details by ID"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+@cached_query
+def get_professors_page(after=None, limit=PAGE_SIZE):
+    """
+    Get up to limit get_all_professors rows, in the same order, that come after
+    the cursor `after` (None for the first page); returns (rows, next cursor),
+    with None as the cursor after the last page
+    """
+    conn = get_connection()
     cursor = conn.cursor()
     
-    cursor.execute('''
-    SELECT p.faculty_id, p.f_name as first_name, p.l_name as last_name, p.email, p.subject_id,
-           f.office_name as department_name, f.building_num, f.room_num, p.photo_url
+    # faculty_id breaks ties between namesakes; idx_professors_name already ends in it
+    condition, params = keyset_condition(('p.l_name', 'p.f_name', 'p.faculty_id'), after)
+    cursor.execute(f'''
+    SELECT {PROFESSOR_ROW_COLUMNS}
     FROM professors p
     LEFT JOIN faculty f ON p.office_id = f.office_id
-    WHERE p.faculty_id = ?
-    ''', (faculty_id,))
+    WHERE {condition}
+    ORDER BY p.l_name, p.f_name, p.faculty_id
+    LIMIT ?
+    ''', params + (limit + 1,))
+    
+    rows = cursor.fetchall()
+    release_connection(conn)
     
-    professor = cursor.fetchone()
-    conn.close()
+    return split_page(rows, limit, professor_page_key)
+
+@cached_query
+def get_professor_by_id(faculty_id):
+    """Get professor details by ID"""
+    conn = get_connection()
+    professor = fetch_professor_row(conn.cursor(), faculty_id)
+    release_connection(conn)
     
-    # Convert to dictionary to make it easier to work with
-    if professor:
-        professor_dict = dict(professor)
-        return professor_dict
-    return None
+    return professor
 
+@cached_query
 def get_professor_schedule(faculty_id):
     """Get schedule for a professor"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -225,70 +1390,153 @@ def get_professor_schedule(faculty_id):
     FROM professor_sched ps
     LEFT JOIN courses c ON ps.course_code = c.course_code
     WHERE ps.faculty_id = ?
-    ORDER BY 
-        CASE ps.day_of_week
-            WHEN 'Monday' THEN 1
-            WHEN 'Tuesday' THEN 2
-            WHEN 'Wednesday' THEN 3
-            WHEN 'Thursday' THEN 4
-            WHEN 'Friday' THEN 5
-            WHEN 'Saturday' THEN 6
-        END,
-        ps.start_time
+    ORDER BY ps.start_minute
     ''', (faculty_id,))
     
     rows = cursor.fetchall()
-    conn.close()
+    release_connection(conn)
     
     # Convert to dictionaries
     schedule = [dict(row) for row in rows]
     return schedule
 
-def search_professors(search_term):
-    """Search professors by name, email, or subject"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+@cached_query
+def search_professors(search_term, limit=SEARCH_RESULT_LIMIT, fuzzy=False):
+    """Search professors by name, email, subject, or department (prefix match, best matches first)"""
+    if fuzzy:
+        return fuzzy_search_professors(search_term, limit)
+    
+    conn = get_connection()
     cursor = conn.cursor()
     
-    search_pattern = f'%{search_term}%'
+    match_query = build_search_query(search_term)
     
-    # Check if search term contains a space (might be a full name)
-    if ' ' in search_term:
-        # Split the search term into parts (assuming first and last name)
-        name_parts = search_term.split()
-        if len(name_parts) >= 2:
-            first_name_pattern = f'%{name_parts[0]}%'
-            last_name_pattern = f'%{name_parts[1]}%'
-            
-            # Search for both first and last name match
-            cursor.execute('''
-            SELECT p.faculty_id, p.f_name, p.l_name, p.email, p.subject_id,
-                   f.office_name, f.building_num, f.room_num
-            FROM professors p
-            LEFT JOIN faculty f ON p.office_id = f.office_id
-            WHERE (p.f_name LIKE ? AND p.l_name LIKE ?) OR p.email LIKE ? OR p.subject_id LIKE ?
-            ORDER BY p.l_name, p.f_name
-            ''', (first_name_pattern, last_name_pattern, search_pattern, search_pattern))
+    if match_query:
+        # Probe how many rows match, stopping as soon as there are too many to rank
+        cursor.execute('''
+        SELECT COUNT(*) FROM (
+            SELECT rowid FROM professors_fts WHERE professors_fts MATCH ? LIMIT ?
+        )
+        ''', (match_query, SEARCH_RANK_CANDIDATES + 1))
+        ranked = cursor.fetchone()[0] <= SEARCH_RANK_CANDIDATES
+    
+    if match_query and ranked:
+        cursor.execute('''
+        SELECT p.faculty_id, p.f_name, p.l_name, p.email, p.subject_id,
+               f.office_name, f.building_num, f.room_num
+        FROM professors_fts
+        JOIN professors p ON p.faculty_id = professors_fts.rowid
+        LEFT JOIN faculty f ON p.office_id = f.office_id
+        WHERE professors_fts MATCH ?
+        ORDER BY professors_fts.rank, p.l_name, p.f_name
+        LIMIT ?
+        ''', (match_query, limit))
+    elif match_query:
+        # Too broad to rank: return the first matches in name order
+        cursor.execute('''
+        SELECT p.faculty_id, p.f_name, p.l_name, p.email, p.subject_id,
+               f.office_name, f.building_num, f.room_num
+        FROM professors p
+        LEFT JOIN faculty f ON p.office_id = f.office_id
+        WHERE p.faculty_id IN (
+            SELECT rowid FROM professors_fts WHERE professors_fts MATCH ? LIMIT ?
+        )
+        ORDER BY p.l_name, p.f_name
+        ''', (match_query, limit))
     else:
-        # Regular search for single terms
+        # Nothing searchable in the input, so every professor matches
         cursor.execute('''
         SELECT p.faculty_id, p.f_name, p.l_name, p.email, p.subject_id,
                f.office_name, f.building_num, f.room_num
         FROM professors p
         LEFT JOIN faculty f ON p.office_id = f.office_id
-        WHERE p.f_name LIKE ? OR p.l_name LIKE ? OR p.email LIKE ? OR p.subject_id LIKE ?
         ORDER BY p.l_name, p.f_name
-        ''', (search_pattern, search_pattern, search_pattern, search_pattern))
+        LIMIT ?
+        ''', (limit,))
     
     professors = cursor.fetchall()
-    conn.close()
+    release_connection(conn)
     
     return professors
 
+@cached_query
+def fuzzy_search_professors(search_term, limit=SEARCH_RESULT_LIMIT, threshold=FUZZY_SIMILARITY_THRESHOLD):
+    """Search professors by first/last name allowing typos, most similar names first"""
+    words = normalize_name(search_term).split()
+    if not words:
+        return []
+    
+    # One row per (query word, indexed trigram), plus the bounds on name size that
+    # can still reach the threshold: |A n B| / |A u B| >= t needs t*|A| <= |B| <= |A|/t
+    query_rows = []
+    for word_index, word in enumerate(words):
+        trigrams = name_trigrams(word)
+        min_size = int(threshold * len(trigrams))
+        max_size = int(len(trigrams) / threshold) + 1
+        for trigram in indexed_trigrams(trigrams):
+            query_rows.extend((word_index, trigram, len(trigrams), word[0], min_size, max_size))
+    
+    if not query_rows:
+        return []
+    
+    values = ', '.join('(?, ?, ?, ?, ?, ?)' for _ in range(len(query_rows) // 6))
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    # Every query word must be similar to the professor's first or last name;
+    # the professor's score is the average similarity of their best-matching names.
+    # A shared initial counts as the shared leading '  x' trigram.
+    cursor.execute(f'''
+    WITH query (word_index, trigram, word_size, initial, min_size, max_size) AS (VALUES {values}),
+    shared AS (
+        SELECT q.word_index, t.name_id, q.word_size, q.initial, COUNT(*) AS shared_count
+        FROM query q
+        JOIN name_trigrams t
+          ON t.trigram = q.trigram AND t.trigram_count BETWEEN q.min_size AND q.max_size
+        GROUP BY q.word_index, t.name_id
+    ),
+    name_matches AS (
+        SELECT word_index, name_id, CAST(overlap AS REAL) / (word_size + trigram_count - overlap) AS similarity
+        FROM (
+            SELECT s.word_index, s.name_id, s.word_size, n.trigram_count,
+                   s.shared_count + (instr(n.initials, s.initial) > 0) AS overlap
+            FROM shared s
+            JOIN professor_names n ON n.name_id = s.name_id
+        )
+        WHERE CAST(overlap AS REAL) / (word_size + trigram_count - overlap) >= ?
+    ),
+    word_matches AS (
+        SELECT m.word_index, l.faculty_id, MAX(m.similarity) AS similarity
+        FROM name_matches m
+        JOIN professor_name_links l ON l.name_id = m.name_id
+        GROUP BY m.word_index, l.faculty_id
+    ),
+    scored AS (
+        SELECT faculty_id, SUM(similarity) / ? AS similarity
+        FROM word_matches
+        GROUP BY faculty_id
+        HAVING COUNT(*) = ?
+        ORDER BY similarity DESC
+        LIMIT ?
+    )
+    SELECT p.faculty_id, p.f_name, p.l_name, p.email, p.subject_id,
+           f.office_name, f.building_num, f.room_num, s.similarity
+    FROM scored s
+    JOIN professors p ON p.faculty_id = s.faculty_id
+    LEFT JOIN faculty f ON p.office_id = f.office_id
+    ORDER BY s.similarity DESC, p.l_name, p.f_name
+    ''', query_rows + [threshold, len(words), len(words), limit])
+    
+    professors = cursor.fetchall()
+    release_connection(conn)
+    
+    return professors
+
+@cached_query
 def filter_professors_by_faculty(office_name):
     """Filter professors by faculty office"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -301,14 +1549,14 @@ def filter_professors_by_faculty(office_name):
     ''', (office_name,))
     
     professors = cursor.fetchall()
-    conn.close()
+    release_connection(conn)
     
     return professors
 
+@cached_query
 def filter_professors_by_course(course_name):
     """Filter professors by course they teach"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -323,40 +1571,89 @@ def filter_professors_by_course(course_name):
     ''', (course_name,))
     
     professors = cursor.fetchall()
-    conn.close()
+    release_connection(conn)
     
     return professors
 
+def search_directory(search_term, kind=None):
+    """
+    Find the professors for what was typed or picked in the kiosk search box.
+    kind is the autocomplete suggestion kind when one was picked: a course
+    lists the professors teaching it, since course names and codes are not in
+    the search index. Typed text that is exactly a course code does the same.
+    Typed text that matches nothing is tried again as a misspelled name.
+    """
+    if kind == 'course':
+        return filter_professors_by_course(search_term)
+    
+    if kind is None:
+        course = get_course_by_code(search_term.strip().upper())
+        if course:
+            return filter_professors_by_course(course['course_name'])
+    
+    professors = search_professors(search_term)
+    if not professors and kind is None:
+        professors = search_professors(search_term, fuzzy=True)
+    return professors
+
+@cached_query
 def get_all_faculties():
     """Get all faculty offices"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute('SELECT * FROM faculty ORDER BY office_name')
     
     rows = cursor.fetchall()
-    conn.close()
+    release_connection(conn)
     
     # Convert to dictionaries
     faculties = [dict(row) for row in rows]
     return faculties
 
+@cached_query
 def get_all_courses():
     """Get all courses"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute('SELECT * FROM courses ORDER BY course_code')
     
     rows = cursor.fetchall()
-    conn.close()
+    release_connection(conn)
     
     # Convert to dictionaries
     courses = [dict(row) for row in rows]
     return courses
 
+@cached_query
+def get_courses_page(after=None, limit=PAGE_SIZE):
+    """Get up to limit courses after the cursor `after`, by course code; returns (rows, next cursor)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    condition, params = keyset_condition(('course_code',), after)
+    cursor.execute(f'''
+    SELECT * FROM courses
+    WHERE {condition}
+    ORDER BY course_code
+    LIMIT ?
+    ''', params + (limit + 1,))
+    
+    rows = cursor.fetchall()
+    release_connection(conn)
+    
+    return split_page(rows, limit, course_page_key)
+
+@cached_query
+def get_course_by_code(course_code):
+    """Get one course by its code, or None"""
+    conn = get_connection()
+    course = fetch_course_row(conn.cursor(), course_code)
+    release_connection(conn)
+    
+    return course
+
 def ensure_photos_directory_exists():
     """Ensure the photos directory exists for faculty photos"""
     photos_dir = "assets/photos"
@@ -365,8 +1662,8 @@ def ensure_photos_directory_exists():
     return photos_dir
 
 def add_professor(first_name, last_name, email, phone, department_name, specialty=None, photo_url=None):
-    """Add a new professor"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    """Add a new professor and return their row; raises ValueError when it cannot be added"""
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -384,14 +1681,17 @@ def add_professor(first_name, last_name, email, phone, department_name, specialt
         
         # Insert the new professor
         cursor.execute('''
-        INSERT INTO professors (f_name, l_name, email, office_id, subject_id, photo_url)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ''', (first_name, last_name, email, office_id, specialty, photo_url))
+        INSERT INTO professors (f_name, l_name, email, phone, office_id, subject_id, photo_url)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (first_name, last_name, email, phone or None, office_id, specialty, photo_url))
         
         faculty_id = cursor.lastrowid
+        index_professor_name(cursor, faculty_id, first_name, last_name)
         conn.commit()
+        professor = fetch_professor_row(cursor, faculty_id)
+        notify_change('professor', faculty_id, 'insert')
         
-        return faculty_id
+        return professor
     
     except sqlite3.IntegrityError as e:
         conn.rollback()
@@ -403,12 +1703,12 @@ def add_professor(first_name, last_name, email, phone, department_name, specialt
         conn.rollback()
         raise e
     finally:
-        conn.close()
+        release_connection(conn)
 
+@cached_query
 def get_all_departments():
     """Get all departments"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -421,20 +1721,29 @@ def get_all_departments():
     ''')
     
     rows = cursor.fetchall()
-    conn.close()
+    release_connection(conn)
     
     # Convert to dictionaries
     departments = [dict(row) for row in rows]
     return departments
 
+@cached_query
+def get_department_by_id(office_id):
+    """Get one department as get_all_departments returns them, or None"""
+    conn = get_connection()
+    department = fetch_department_row(conn.cursor(), office_id)
+    release_connection(conn)
+    
+    return department
+
+@cached_query
 def get_professors_by_department(department_name):
     """Get all professors in a specific department"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute('''
-    SELECT p.faculty_id, p.f_name as first_name, p.l_name as last_name, p.email, p.subject_id,
+    SELECT p.faculty_id, p.f_name as first_name, p.l_name as last_name, p.email, p.phone, p.subject_id,
            f.office_name as department_name, f.building_num, f.room_num, p.photo_url
     FROM professors p
     JOIN faculty f ON p.office_id = f.office_id
@@ -443,7 +1752,7 @@ def get_professors_by_department(department_name):
     ''', (department_name,))
     
     rows = cursor.fetchall()
-    conn.close()
+    release_connection(conn)
     
     # Convert to dictionaries
     professors = [dict(row) for row in rows]
@@ -452,7 +1761,7 @@ def get_professors_by_department(department_name):
 # Admin authentication functions
 def authenticate_admin(username, password):
     """Authenticate an admin user"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Hash the provided password
@@ -476,12 +1785,12 @@ def authenticate_admin(username, password):
         ''', (current_time, admin[0]))
         conn.commit()
     
-    conn.close()
+    release_connection(conn)
     return admin
 
 def update_admin_password(admin_id, current_password, new_password):
     """Update an admin user's password"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Verify current password
@@ -496,7 +1805,7 @@ def update_admin_password(admin_id, current_password, new_password):
     admin = cursor.fetchone()
     
     if not admin:
-        conn.close()
+        release_connection(conn)
         return False, "Current password is incorrect"
     
     # Update to new password
@@ -507,14 +1816,13 @@ def update_admin_password(admin_id, current_password, new_password):
     ''', (new_hash, admin_id))
     
     conn.commit()
-    conn.close()
+    release_connection(conn)
     
     return True, "Password updated successfully"
 
 def get_all_admin_users():
     """Get all admin users"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -524,13 +1832,13 @@ def get_all_admin_users():
     ''')
     
     admins = cursor.fetchall()
-    conn.close()
+    release_connection(conn)
     
     return admins
 
 def create_admin_user(username, password, full_name, email):
     """Create a new admin user"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -544,18 +1852,18 @@ def create_admin_user(username, password, full_name, email):
         ''', (username, password_hash, full_name, email))
         
         conn.commit()
-        conn.close()
+        release_connection(conn)
         return True, "Admin user created successfully"
     except sqlite3.IntegrityError:
-        conn.close()
+        release_connection(conn)
         return False, "Username already exists"
     except Exception as e:
-        conn.close()
+        release_connection(conn)
         return False, f"Error: {str(e)}"
 
 def update_professor(faculty_id, first_name, last_name, email, phone, department_name, specialty=None, photo_url=None):
-    """Update an existing professor"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    """Update an existing professor and return their new row; raises ValueError when it cannot be updated"""
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -579,12 +1887,15 @@ def update_professor(faculty_id, first_name, last_name, email, phone, department
         # Update the professor
         cursor.execute('''
         UPDATE professors 
-        SET f_name = ?, l_name = ?, email = ?, office_id = ?, subject_id = ?, photo_url = ?
+        SET f_name = ?, l_name = ?, email = ?, phone = ?, office_id = ?, subject_id = ?, photo_url = ?
         WHERE faculty_id = ?
-        ''', (first_name, last_name, email, office_id, specialty, photo_url, faculty_id))
+        ''', (first_name, last_name, email, phone or None, office_id, specialty, photo_url, faculty_id))
         
+        index_professor_name(cursor, faculty_id, first_name, last_name)
         conn.commit()
-        return True
+        professor = fetch_professor_row(cursor, faculty_id)
+        notify_change('professor', faculty_id, 'update')
+        return professor
     
     except sqlite3.IntegrityError as e:
         conn.rollback()
@@ -596,104 +1907,50 @@ def update_professor(faculty_id, first_name, last_name, email, phone, department
         conn.rollback()
         raise e
     finally:
-        conn.close()
+        release_connection(conn)
 
+# The write functions from here on return (success, message, row), where row is
+# the affected row as the admin reads return it (for deletes, as it was before)
+# or None when nothing was written
 def delete_professor(faculty_id):
     """Delete a professor"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
         # Check if professor exists
-        cursor.execute('SELECT faculty_id FROM professors WHERE faculty_id = ?', (faculty_id,))
-        professor = cursor.fetchone()
+        professor = fetch_professor_row(cursor, faculty_id)
         if not professor:
-            conn.close()
-            return False, "Professor does not exist"
-        
-        # Delete professor's schedules first
+            release_connection(conn)
+            return False, "Professor does not exist", None
+        
+        # Delete professor's schedules first, under the write lock so the revision matches them
+        cursor.execute('BEGIN IMMEDIATE')
+        revision = read_schedule_revision(cursor)
+        cursor.execute('SELECT schedule_id FROM professor_sched WHERE faculty_id = ?', (faculty_id,))
+        schedule_ids = [row[0] for row in cursor.fetchall()]
         cursor.execute('DELETE FROM professor_sched WHERE faculty_id = ?', (faculty_id,))
         
         # Delete the professor
         cursor.execute('DELETE FROM professors WHERE faculty_id = ?', (faculty_id,))
         
         conn.commit()
-        conn.close()
-        return True, "Professor deleted successfully"
+        release_connection(conn)
+        apply_schedule_delete(revision, schedule_ids)
+        notify_deleted('schedule', schedule_ids)
+        notify_change('professor', faculty_id, 'delete')
+        return True, "Professor deleted successfully", professor
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
-
-def ensure_photo_url_column():
-    """Ensure that the professors table has a photo_url column"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    cursor = conn.cursor()
-    
-    # Check if photo_url column exists in professors table
-    cursor.execute("PRAGMA table_info(professors)")
-    columns = cursor.fetchall()
-    column_names = [column[1] for column in columns]
-    
-    if 'photo_url' not in column_names:
-        try:
-            # Add photo_url column
-            cursor.execute("ALTER TABLE professors ADD COLUMN photo_url TEXT")
-            conn.commit()
-            print("Added photo_url column to professors table")
-        except sqlite3.Error as e:
-            print(f"Error adding photo_url column: {e}")
-    
-    conn.close()
-
-def ensure_admin_table_exists():
-    """Ensure that the admin_users table exists and has a default admin user"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    cursor = conn.cursor()
-    
-    # Check if admin_users table exists
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='admin_users'")
-    table_exists = cursor.fetchone()
-    
-    if not table_exists:
-        # Create Admin Users table
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS admin_users (
-            admin_id INTEGER PRIMARY KEY,
-            username VARCHAR(50) UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            full_name VARCHAR(100),
-            email VARCHAR(100),
-            last_login TIMESTAMP,
-            is_active BOOLEAN DEFAULT 1
-        )
-        ''')
-        
-        # Add default admin user
-        import hashlib
-        default_username = 'admin'
-        default_password = 'admin123'
-        password_hash = hashlib.sha256(default_password.encode()).hexdigest()
-        
-        cursor.execute('''
-        INSERT INTO admin_users (username, password_hash, full_name, email, is_active)
-        VALUES (?, ?, ?, ?, 1)
-        ''', (default_username, password_hash, 'Administrator', 'admin@university.edu'))
-        
-        conn.commit()
-        print("Created admin_users table and added default admin user")
-    
-    conn.close()
-    
-    # Also ensure photo_url column exists
-    ensure_photo_url_column()
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
 # Department management functions
 def add_department(office_name, building_num, room_num):
     """Add a new department"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -701,28 +1958,31 @@ def add_department(office_name, building_num, room_num):
         cursor.execute('SELECT office_id FROM faculty WHERE office_name = ?', (office_name,))
         existing = cursor.fetchone()
         if existing:
-            conn.close()
-            return False, f"Department '{office_name}' already exists"
+            release_connection(conn)
+            return False, f"Department '{office_name}' already exists", None
         
         # Insert the new department
         cursor.execute('''
         INSERT INTO faculty (office_name, building_num, room_num)
         VALUES (?, ?, ?)
         ''', (office_name, building_num, room_num))
+        office_id = cursor.lastrowid
         
         conn.commit()
-        conn.close()
-        return True, "Department added successfully"
+        row = fetch_department_row(cursor, office_id)
+        release_connection(conn)
+        notify_change('department', office_id, 'insert')
+        return True, "Department added successfully", row
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
 def update_department(office_id, office_name, building_num, room_num):
     """Update an existing department"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -730,16 +1990,16 @@ def update_department(office_id, office_name, building_num, room_num):
         cursor.execute('SELECT office_id FROM faculty WHERE office_id = ?', (office_id,))
         department = cursor.fetchone()
         if not department:
-            conn.close()
-            return False, "Department does not exist"
+            release_connection(conn)
+            return False, "Department does not exist", None
         
         # Check if new name already exists for another department
         cursor.execute('SELECT office_id FROM faculty WHERE office_name = ? AND office_id != ?', 
                        (office_name, office_id))
         existing = cursor.fetchone()
         if existing:
-            conn.close()
-            return False, f"Department name '{office_name}' is already in use"
+            release_connection(conn)
+            return False, f"Department name '{office_name}' is already in use", None
         
         # Update the department
         cursor.execute('''
@@ -749,31 +2009,38 @@ def update_department(office_id, office_name, building_num, room_num):
         ''', (office_name, building_num, room_num, office_id))
         
         conn.commit()
-        conn.close()
-        return True, "Department updated successfully"
+        row = fetch_department_row(cursor, office_id)
+        release_connection(conn)
+        notify_change('department', office_id, 'update')
+        return True, "Department updated successfully", row
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
 def delete_department(office_id):
     """Delete a department"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
         # Check if department exists
-        cursor.execute('SELECT office_id FROM faculty WHERE office_id = ?', (office_id,))
-        department = cursor.fetchone()
+        department = fetch_department_row(cursor, office_id)
         if not department:
-            conn.close()
-            return False, "Department does not exist"
+            release_connection(conn)
+            return False, "Department does not exist", None
+        
+        # Take the write lock first so the schedule revision matches the deletes
+        cursor.execute('BEGIN IMMEDIATE')
+        revision = read_schedule_revision(cursor)
         
         # Check if there are professors in this department
         cursor.execute('SELECT COUNT(*) FROM professors WHERE office_id = ?', (office_id,))
         count = cursor.fetchone()[0]
+        faculty_ids = []
+        schedule_ids = []
         if count > 0:
             # This implementation deletes professors in the department
             
@@ -783,6 +2050,8 @@ def delete_department(office_id):
             
             # Delete schedules for these faculty
             for faculty_id in faculty_ids:
+                cursor.execute('SELECT schedule_id FROM professor_sched WHERE faculty_id = ?', (faculty_id,))
+                schedule_ids.extend(row[0] for row in cursor.fetchall())
                 cursor.execute('DELETE FROM professor_sched WHERE faculty_id = ?', (faculty_id,))
             
             # Delete professors in this department
@@ -792,19 +2061,23 @@ def delete_department(office_id):
         cursor.execute('DELETE FROM faculty WHERE office_id = ?', (office_id,))
         
         conn.commit()
-        conn.close()
-        return True, "Department deleted successfully"
+        release_connection(conn)
+        apply_schedule_delete(revision, schedule_ids)
+        notify_deleted('schedule', schedule_ids)
+        notify_deleted('professor', faculty_ids)
+        notify_change('department', office_id, 'delete')
+        return True, "Department deleted successfully", department
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
 # Course management functions
 def add_course(course_code, course_name):
     """Add a new course"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -812,8 +2085,8 @@ def add_course(course_code, course_name):
         cursor.execute('SELECT course_code FROM courses WHERE course_code = ?', (course_code,))
         existing = cursor.fetchone()
         if existing:
-            conn.close()
-            return False, f"Course code '{course_code}' already exists"
+            release_connection(conn)
+            return False, f"Course code '{course_code}' already exists", None
         
         # Insert the new course
         cursor.execute('''
@@ -822,18 +2095,20 @@ def add_course(course_code, course_name):
         ''', (course_code, course_name))
         
         conn.commit()
-        conn.close()
-        return True, "Course added successfully"
+        row = fetch_course_row(cursor, course_code)
+        release_connection(conn)
+        notify_change('course', course_code, 'insert')
+        return True, "Course added successfully", row
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
 def update_course(course_code, course_name):
     """Update an existing course"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -841,8 +2116,8 @@ def update_course(course_code, course_name):
         cursor.execute('SELECT course_code FROM courses WHERE course_code = ?', (course_code,))
         course = cursor.fetchone()
         if not course:
-            conn.close()
-            return False, f"Course '{course_code}' does not exist"
+            release_connection(conn)
+            return False, f"Course '{course_code}' does not exist", None
         
         # Update the course
         cursor.execute('''
@@ -852,52 +2127,63 @@ def update_course(course_code, course_name):
         ''', (course_name, course_code))
         
         conn.commit()
-        conn.close()
-        return True, "Course updated successfully"
+        row = fetch_course_row(cursor, course_code)
+        release_connection(conn)
+        notify_change('course', course_code, 'update')
+        return True, "Course updated successfully", row
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
 def delete_course(course_code):
     """Delete a course"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
         # Check if course exists
-        cursor.execute('SELECT course_code FROM courses WHERE course_code = ?', (course_code,))
-        course = cursor.fetchone()
+        course = fetch_course_row(cursor, course_code)
         if not course:
-            conn.close()
-            return False, f"Course '{course_code}' does not exist"
+            release_connection(conn)
+            return False, f"Course '{course_code}' does not exist", None
+        
+        # Take the write lock first so the schedule revision matches the deletes
+        cursor.execute('BEGIN IMMEDIATE')
+        revision = read_schedule_revision(cursor)
         
         # Check if there are schedules using this course
         cursor.execute('SELECT COUNT(*) FROM professor_sched WHERE course_code = ?', (course_code,))
         count = cursor.fetchone()[0]
+        schedule_ids = []
         if count > 0:
             # Delete schedules using this course
+            cursor.execute('SELECT schedule_id FROM professor_sched WHERE course_code = ?', (course_code,))
+            schedule_ids = [row[0] for row in cursor.fetchall()]
             cursor.execute('DELETE FROM professor_sched WHERE course_code = ?', (course_code,))
         
         # Delete the course
         cursor.execute('DELETE FROM courses WHERE course_code = ?', (course_code,))
         
         conn.commit()
-        conn.close()
-        return True, "Course deleted successfully"
+        release_connection(conn)
+        apply_schedule_delete(revision, schedule_ids)
+        notify_deleted('schedule', schedule_ids)
+        notify_change('course', course_code, 'delete')
+        return True, "Course deleted successfully", course
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
 # Schedule management functions
 def add_schedule_item(faculty_id, day_of_week, start_time, end_time, room_location, academic_year, semester_num, course_code):
     """Add a new schedule item for a professor"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -905,41 +2191,34 @@ def add_schedule_item(faculty_id, day_of_week, start_time, end_time, room_locati
         cursor.execute('SELECT faculty_id FROM professors WHERE faculty_id = ?', (faculty_id,))
         existing_prof = cursor.fetchone()
         if not existing_prof:
-            conn.close()
-            return False, "Professor not found"
+            release_connection(conn)
+            return False, "Professor not found", None
         
         # Check if course exists
         cursor.execute('SELECT course_code FROM courses WHERE course_code = ?', (course_code,))
         existing_course = cursor.fetchone()
         if not existing_course:
-            conn.close()
-            return False, "Course not found"
+            release_connection(conn)
+            return False, "Course not found", None
         
-        # Check for schedule conflicts
-        cursor.execute('''
-        SELECT schedule_id FROM professor_sched 
-        WHERE faculty_id = ? AND day_of_week = ? AND 
-        ((start_time <= ? AND end_time > ?) OR 
-         (start_time < ? AND end_time >= ?) OR
-         (start_time >= ? AND end_time <= ?))
-        ''', (faculty_id, day_of_week, start_time, start_time, end_time, end_time, start_time, end_time))
-        
-        conflict = cursor.fetchone()
+        # Validate day of week, times and semester
+        try:
+            start_minute, end_minute, start_time, end_time = validate_schedule_fields(
+                day_of_week, start_time, end_time, semester_num)
+        except ValueError as e:
+            release_connection(conn)
+            return False, str(e), None
+        
+        # Check for schedule conflicts (professor and room, same year and semester);
+        # the write lock keeps the check and the write atomic
+        cursor.execute('BEGIN IMMEDIATE')
+        conflict, revision = check_schedule_conflicts(
+            cursor, f"Schedule conflict: Professor already has a class during this time on {day_of_week}",
+            faculty_id, day_of_week, room_location, academic_year, semester_num,
+            start_minute, end_minute)
         if conflict:
-            conn.close()
-            return False, f"Schedule conflict: Professor already has a class during this time on {day_of_week}"
-        
-        # Validate day of week
-        valid_days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-        if day_of_week not in valid_days:
-            conn.close()
-            return False, f"Invalid day of week. Must be one of: {', '.join(valid_days)}"
-        
-        # Validate semester
-        valid_semesters = ['1st', '2nd', 'Summer']
-        if semester_num not in valid_semesters:
-            conn.close()
-            return False, f"Invalid semester. Must be one of: {', '.join(valid_semesters)}"
+            release_connection(conn)
+            return False, conflict, None
         
         # Insert the new schedule item
         cursor.execute('''
@@ -948,20 +2227,25 @@ def add_schedule_item(faculty_id, day_of_week, start_time, end_time, room_locati
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         ''', (faculty_id, day_of_week, start_time, end_time, room_location, 
              academic_year, semester_num, course_code))
+        schedule_id = cursor.lastrowid
         
         conn.commit()
-        conn.close()
-        return True, "Schedule item added successfully"
+        row = fetch_schedule_row(cursor, schedule_id)
+        release_connection(conn)
+        apply_schedule_change(revision, schedule_id, faculty_id, room_location, academic_year, semester_num,
+                              start_minute, end_minute)
+        notify_change('schedule', schedule_id, 'insert')
+        return True, "Schedule item added successfully", row
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
 def update_schedule_item(schedule_id, faculty_id, day_of_week, start_time, end_time, room_location, academic_year, semester_num, course_code):
     """Update an existing schedule item"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -969,48 +2253,41 @@ def update_schedule_item(schedule_id, faculty_id, day_of_week, start_time, end_t
         cursor.execute('SELECT schedule_id FROM professor_sched WHERE schedule_id = ?', (schedule_id,))
         existing = cursor.fetchone()
         if not existing:
-            conn.close()
-            return False, "Schedule item not found"
+            release_connection(conn)
+            return False, "Schedule item not found", None
         
         # Check if professor exists
         cursor.execute('SELECT faculty_id FROM professors WHERE faculty_id = ?', (faculty_id,))
         existing_prof = cursor.fetchone()
         if not existing_prof:
-            conn.close()
-            return False, "Professor not found"
+            release_connection(conn)
+            return False, "Professor not found", None
         
         # Check if course exists
         cursor.execute('SELECT course_code FROM courses WHERE course_code = ?', (course_code,))
         existing_course = cursor.fetchone()
         if not existing_course:
-            conn.close()
-            return False, "Course not found"
+            release_connection(conn)
+            return False, "Course not found", None
         
-        # Check for schedule conflicts with other schedule items
-        cursor.execute('''
-        SELECT schedule_id FROM professor_sched 
-        WHERE faculty_id = ? AND day_of_week = ? AND schedule_id != ? AND 
-        ((start_time <= ? AND end_time > ?) OR 
-         (start_time < ? AND end_time >= ?) OR
-         (start_time >= ? AND end_time <= ?))
-        ''', (faculty_id, day_of_week, schedule_id, start_time, start_time, end_time, end_time, start_time, end_time))
-        
-        conflict = cursor.fetchone()
+        # Validate day of week, times and semester
+        try:
+            start_minute, end_minute, start_time, end_time = validate_schedule_fields(
+                day_of_week, start_time, end_time, semester_num)
+        except ValueError as e:
+            release_connection(conn)
+            return False, str(e), None
+        
+        # Check for schedule conflicts with other schedule items (professor and room, same year and semester);
+        # the write lock keeps the check and the write atomic
+        cursor.execute('BEGIN IMMEDIATE')
+        conflict, revision = check_schedule_conflicts(
+            cursor, f"Schedule conflict: Professor already has a class during this time on {day_of_week}",
+            faculty_id, day_of_week, room_location, academic_year, semester_num,
+            start_minute, end_minute, schedule_id)
         if conflict:
-            conn.close()
-            return False, f"Schedule conflict: Professor already has a class during this time on {day_of_week}"
-        
-        # Validate day of week
-        valid_days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-        if day_of_week not in valid_days:
-            conn.close()
-            return False, f"Invalid day of week. Must be one of: {', '.join(valid_days)}"
-        
-        # Validate semester
-        valid_semesters = ['1st', '2nd', 'Summer']
-        if semester_num not in valid_semesters:
-            conn.close()
-            return False, f"Invalid semester. Must be one of: {', '.join(valid_semesters)}"
+            release_connection(conn)
+            return False, conflict, None
         
         # Update the schedule item
         cursor.execute('''
@@ -1022,45 +2299,54 @@ def update_schedule_item(schedule_id, faculty_id, day_of_week, start_time, end_t
              academic_year, semester_num, course_code, schedule_id))
         
         conn.commit()
-        conn.close()
-        return True, "Schedule item updated successfully"
+        row = fetch_schedule_row(cursor, schedule_id)
+        release_connection(conn)
+        apply_schedule_change(revision, schedule_id, faculty_id, room_location, academic_year, semester_num,
+                              start_minute, end_minute)
+        notify_change('schedule', schedule_id, 'update')
+        return True, "Schedule item updated successfully", row
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
 def delete_schedule_item(schedule_id):
     """Delete a schedule item"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
-        # Check if schedule item exists
+        # Check if schedule item exists, under the write lock so the revision matches the delete
+        cursor.execute('BEGIN IMMEDIATE')
+        revision = read_schedule_revision(cursor)
         cursor.execute('SELECT schedule_id FROM professor_sched WHERE schedule_id = ?', (schedule_id,))
-        existing = cursor.fetchone()
-        if not existing:
-            conn.close()
-            return False, "Schedule item not found"
+        if not cursor.fetchone():
+            release_connection(conn)
+            return False, "Schedule item not found", None
+        # The row as the tables show it; None if its professor is missing
+        existing = fetch_schedule_row(cursor, schedule_id)
         
         # Delete the schedule item
         cursor.execute('DELETE FROM professor_sched WHERE schedule_id = ?', (schedule_id,))
         
         conn.commit()
-        conn.close()
-        return True, "Schedule item deleted successfully"
+        release_connection(conn)
+        apply_schedule_delete(revision, [schedule_id])
+        notify_change('schedule', schedule_id, 'delete')
+        return True, "Schedule item deleted successfully", existing
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
+@cached_query
 def get_all_schedules():
     """Get all professor schedules"""
-    conn = sqlite3.connect('faculty_db.sqlite')
-    conn.row_factory = sqlite3.Row
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -1069,20 +2355,109 @@ def get_all_schedules():
            s.academic_year, s.semester_num, s.course_code
     FROM professor_sched s
     JOIN professors p ON s.faculty_id = p.faculty_id
-    ORDER BY p.l_name, p.f_name, s.day_of_week, s.start_time
+    ORDER BY p.l_name, p.f_name, s.start_minute
     ''')
     
     rows = cursor.fetchall()
-    conn.close()
+    release_connection(conn)
     
     # Convert to dictionaries
     schedules = [dict(row) for row in rows]
     return schedules
 
+@cached_query
+def get_schedules_page(after=None, limit=PAGE_SIZE):
+    """
+    Get up to limit get_all_schedules rows after the cursor `after`, ordered by
+    professor name, then start and end time; returns (rows, next cursor)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    key_columns = ('p.l_name', 'p.f_name', 'p.faculty_id', 's.start_minute', 's.end_minute', 's.schedule_id')
+    condition, params = keyset_condition(key_columns, after)
+    if after is not None:
+        # The same bound on the professor alone lets SQLite start at the cursor in
+        # idx_professors_name; the schedules then come in index order, so nothing is sorted
+        condition += ' AND (p.l_name, p.f_name, p.faculty_id) >= (?, ?, ?)'
+        params += tuple(after[:3])
+    cursor.execute(f'''
+    SELECT {SCHEDULE_ROW_COLUMNS}
+    FROM professors p
+    JOIN professor_sched s ON s.faculty_id = p.faculty_id
+    WHERE {condition}
+    ORDER BY p.l_name, p.f_name, p.faculty_id, s.start_minute, s.end_minute, s.schedule_id
+    LIMIT ?
+    ''', params + (limit + 1,))
+    
+    rows = cursor.fetchall()
+    release_connection(conn)
+    
+    return split_page(rows, limit, schedule_page_key)
+
+@cached_query
+def get_schedule_by_id(schedule_id):
+    """Get one schedule as get_schedules_page returns them, or None"""
+    conn = get_connection()
+    schedule = fetch_schedule_row(conn.cursor(), schedule_id)
+    release_connection(conn)
+    
+    return schedule
+
+@cached_query
+def get_dashboard_stats(use_summary=True):
+    """
+    Get the admin dashboard's statistics: the professors, departments, courses
+    and schedules counts, schedules_by_semester, faculty_by_department as
+    (office_name, count) pairs, largest first, and unscheduled_faculty.
+    With use_summary the counts come from the trigger-maintained
+    dashboard_counts table instead of being counted.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        if use_summary:
+            cursor.execute('SELECT name, value FROM dashboard_counts')
+            counts = dict(cursor.fetchall())
+        else:
+            # Every count in one pass over professor_sched plus a COUNT(*) per table
+            columns = [f'(SELECT COUNT(*) FROM {table}) AS "{name}"'
+                       for name, table in DASHBOARD_COUNTED_TABLES if table != 'professor_sched']
+            columns.append('COUNT(*) AS schedules')
+            columns += [f'COUNT(CASE WHEN semester_num = \'{semester}\' THEN 1 END) AS "schedules:{semester}"'
+                        for semester in SEMESTERS]
+            cursor.execute(f'SELECT {", ".join(columns)} FROM professor_sched')
+            counts = dict(cursor.fetchone())
+        
+        stats = {name: counts.get(name, 0) for name, table in DASHBOARD_COUNTED_TABLES}
+        stats['schedules_by_semester'] = {semester: counts.get(f'schedules:{semester}', 0)
+                                          for semester in SEMESTERS}
+        
+        # Both read only indexes: idx_professors_office and idx_professor_sched_faculty_minutes
+        cursor.execute('''
+        SELECT f.office_name, COUNT(p.faculty_id) as faculty_count
+        FROM faculty f
+        LEFT JOIN professors p ON f.office_id = p.office_id
+        GROUP BY f.office_id
+        ORDER BY faculty_count DESC, f.office_name
+        ''')
+        stats['faculty_by_department'] = [tuple(row) for row in cursor.fetchall()]
+        
+        cursor.execute('''
+        SELECT COUNT(*) FROM professors p
+        WHERE NOT EXISTS (SELECT 1 FROM professor_sched s WHERE s.faculty_id = p.faculty_id)
+        ''')
+        stats['unscheduled_faculty'] = cursor.fetchone()[0]
+        
+        return stats
+    finally:
+        release_connection(conn)
+
 def add_schedule(faculty_id, day_of_week, start_time, end_time, room_location, 
                 academic_year, semester_num, course_code):
     """Add a new schedule for a professor"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -1090,30 +2465,34 @@ def add_schedule(faculty_id, day_of_week, start_time, end_time, room_location,
         cursor.execute('SELECT faculty_id FROM professors WHERE faculty_id = ?', (faculty_id,))
         professor = cursor.fetchone()
         if not professor:
-            conn.close()
-            return False, "Professor does not exist"
+            release_connection(conn)
+            return False, "Professor does not exist", None
         
         # Check if course exists
         cursor.execute('SELECT course_code FROM courses WHERE course_code = ?', (course_code,))
         course = cursor.fetchone()
         if not course:
-            conn.close()
-            return False, f"Course '{course_code}' does not exist"
+            release_connection(conn)
+            return False, f"Course '{course_code}' does not exist", None
         
-        # Check for scheduling conflicts
-        cursor.execute('''
-        SELECT COUNT(*) FROM professor_sched
-        WHERE faculty_id = ? AND day_of_week = ? AND 
-              ((start_time <= ? AND end_time > ?) OR 
-               (start_time < ? AND end_time >= ?) OR
-               (start_time >= ? AND end_time <= ?))
-        ''', (faculty_id, day_of_week, start_time, start_time, 
-              end_time, end_time, start_time, end_time))
-        
-        conflicts = cursor.fetchone()[0]
-        if conflicts > 0:
-            conn.close()
-            return False, "Schedule conflicts with an existing schedule for this professor"
+        # Validate day of week, times and semester
+        try:
+            start_minute, end_minute, start_time, end_time = validate_schedule_fields(
+                day_of_week, start_time, end_time, semester_num)
+        except ValueError as e:
+            release_connection(conn)
+            return False, str(e), None
+        
+        # Check for scheduling conflicts (professor and room, same year and semester);
+        # the write lock keeps the check and the write atomic
+        cursor.execute('BEGIN IMMEDIATE')
+        conflict, revision = check_schedule_conflicts(
+            cursor, "Schedule conflicts with an existing schedule for this professor",
+            faculty_id, day_of_week, room_location, academic_year, semester_num,
+            start_minute, end_minute)
+        if conflict:
+            release_connection(conn)
+            return False, conflict, None
         
         # Insert the new schedule
         cursor.execute('''
@@ -1122,21 +2501,26 @@ def add_schedule(faculty_id, day_of_week, start_time, end_time, room_location,
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         ''', (faculty_id, day_of_week, start_time, end_time, 
              room_location, academic_year, semester_num, course_code))
+        schedule_id = cursor.lastrowid
         
         conn.commit()
-        conn.close()
-        return True, "Schedule added successfully"
+        row = fetch_schedule_row(cursor, schedule_id)
+        release_connection(conn)
+        apply_schedule_change(revision, schedule_id, faculty_id, room_location, academic_year, semester_num,
+                              start_minute, end_minute)
+        notify_change('schedule', schedule_id, 'insert')
+        return True, "Schedule added successfully", row
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
 def update_schedule(schedule_id, faculty_id, day_of_week, start_time, end_time, 
                    room_location, academic_year, semester_num, course_code):
     """Update an existing schedule"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -1144,37 +2528,41 @@ def update_schedule(schedule_id, faculty_id, day_of_week, start_time, end_time,
         cursor.execute('SELECT schedule_id FROM professor_sched WHERE schedule_id = ?', (schedule_id,))
         schedule = cursor.fetchone()
         if not schedule:
-            conn.close()
-            return False, "Schedule does not exist"
+            release_connection(conn)
+            return False, "Schedule does not exist", None
         
         # Check if professor exists
         cursor.execute('SELECT faculty_id FROM professors WHERE faculty_id = ?', (faculty_id,))
         professor = cursor.fetchone()
         if not professor:
-            conn.close()
-            return False, "Professor does not exist"
+            release_connection(conn)
+            return False, "Professor does not exist", None
         
         # Check if course exists
         cursor.execute('SELECT course_code FROM courses WHERE course_code = ?', (course_code,))
         course = cursor.fetchone()
         if not course:
-            conn.close()
-            return False, f"Course '{course_code}' does not exist"
+            release_connection(conn)
+            return False, f"Course '{course_code}' does not exist", None
         
-        # Check for scheduling conflicts (excluding this schedule)
-        cursor.execute('''
-        SELECT COUNT(*) FROM professor_sched
-        WHERE faculty_id = ? AND day_of_week = ? AND schedule_id != ? AND
-              ((start_time <= ? AND end_time > ?) OR 
-               (start_time < ? AND end_time >= ?) OR
-               (start_time >= ? AND end_time <= ?))
-        ''', (faculty_id, day_of_week, schedule_id, start_time, start_time, 
-              end_time, end_time, start_time, end_time))
-        
-        conflicts = cursor.fetchone()[0]
-        if conflicts > 0:
-            conn.close()
-            return False, "Schedule conflicts with an existing schedule for this professor"
+        # Validate day of week, times and semester
+        try:
+            start_minute, end_minute, start_time, end_time = validate_schedule_fields(
+                day_of_week, start_time, end_time, semester_num)
+        except ValueError as e:
+            release_connection(conn)
+            return False, str(e), None
+        
+        # Check for scheduling conflicts (excluding this schedule) (professor and room, same year and semester);
+        # the write lock keeps the check and the write atomic
+        cursor.execute('BEGIN IMMEDIATE')
+        conflict, revision = check_schedule_conflicts(
+            cursor, "Schedule conflicts with an existing schedule for this professor",
+            faculty_id, day_of_week, room_location, academic_year, semester_num,
+            start_minute, end_minute, schedule_id)
+        if conflict:
+            release_connection(conn)
+            return False, conflict, None
         
         # Update the schedule
         cursor.execute('''
@@ -1186,38 +2574,532 @@ def update_schedule(schedule_id, faculty_id, day_of_week, start_time, end_time,
              academic_year, semester_num, course_code, schedule_id))
         
         conn.commit()
-        conn.close()
-        return True, "Schedule updated successfully"
+        row = fetch_schedule_row(cursor, schedule_id)
+        release_connection(conn)
+        apply_schedule_change(revision, schedule_id, faculty_id, room_location, academic_year, semester_num,
+                              start_minute, end_minute)
+        notify_change('schedule', schedule_id, 'update')
+        return True, "Schedule updated successfully", row
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
 
 def delete_schedule(schedule_id):
     """Delete a schedule"""
-    conn = sqlite3.connect('faculty_db.sqlite')
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
-        # Check if schedule exists
+        # Check if schedule exists, under the write lock so the revision matches the delete
+        cursor.execute('BEGIN IMMEDIATE')
+        revision = read_schedule_revision(cursor)
         cursor.execute('SELECT schedule_id FROM professor_sched WHERE schedule_id = ?', (schedule_id,))
-        schedule = cursor.fetchone()
-        if not schedule:
-            conn.close()
-            return False, "Schedule does not exist"
+        if not cursor.fetchone():
+            release_connection(conn)
+            return False, "Schedule does not exist", None
+        # The row as the tables show it; None if its professor is missing
+        schedule = fetch_schedule_row(cursor, schedule_id)
         
         # Delete the schedule
         cursor.execute('DELETE FROM professor_sched WHERE schedule_id = ?', (schedule_id,))
         
         conn.commit()
-        conn.close()
-        return True, "Schedule deleted successfully"
+        release_connection(conn)
+        apply_schedule_delete(revision, [schedule_id])
+        notify_change('schedule', schedule_id, 'delete')
+        return True, "Schedule deleted successfully", schedule
     except sqlite3.Error as e:
-        conn.close()
-        return False, f"Database error: {str(e)}"
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", None
     except Exception as e:
-        conn.close()
-        return False, f"An unexpected error occurred: {str(e)}"
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", None
+
+
+# Columns of one imported schedule row, in professor_sched order
+SCHEDULE_IMPORT_FIELDS = ['faculty_id', 'day_of_week', 'start_time', 'end_time', 'room_location',
+                          'academic_year', 'semester_num', 'course_code']
+
+# Keys per IN (...) lookup, well under SQLite's bound-parameter limit
+IMPORT_LOOKUP_CHUNK = 500
+
+def find_existing_keys(cursor, table, column, keys):
+    """Return which of keys exist in table.column, with one IN lookup per chunk"""
+    keys = list(keys)
+    found = set()
+    for i in range(0, len(keys), IMPORT_LOOKUP_CHUNK):
+        chunk = keys[i:i + IMPORT_LOOKUP_CHUNK]
+        placeholders = ', '.join('?' for _ in chunk)
+        cursor.execute(f'SELECT {column} FROM {table} WHERE {column} IN ({placeholders})', chunk)
+        found.update(row[0] for row in cursor.fetchall())
+    return found
 
+def import_schedules(rows, dry_run=False):
+    """
+    Import many schedules at once (e.g. a registrar's export), all or nothing.
+    rows are dicts with the SCHEDULE_IMPORT_FIELDS keys. Every row is validated
+    like add_schedule, professors and courses are looked up as sets, and
+    professor/room conflicts with the database and within the batch are found
+    in one O(n log n) pass. Nothing is written if any row fails, or when dry_run.
+    Returns (success, message, row_errors) where row_errors is a list of
+    {'row': 1-based row number, 'error': message}.
+    """
+    row_errors = []
+    schedules = []
+    checked = []
+    
+    for row_number, row in enumerate(rows, start=1):
+        missing = [field for field in SCHEDULE_IMPORT_FIELDS
+                   if field != 'room_location' and not str(row.get(field) or '').strip()]
+        if missing:
+            row_errors.append({'row': row_number, 'error': f"Missing {', '.join(missing)}"})
+            continue
+        try:
+            faculty_id = int(row['faculty_id'])
+        except (TypeError, ValueError):
+            row_errors.append({'row': row_number, 'error': f"Invalid faculty_id '{row['faculty_id']}'"})
+            continue
+        try:
+            start_minute, end_minute, start_time, end_time = validate_schedule_fields(
+                row['day_of_week'], row['start_time'], row['end_time'], row['semester_num'])
+        except ValueError as e:
+            row_errors.append({'row': row_number, 'error': str(e)})
+            continue
+        
+        room_location = str(row.get('room_location') or '').strip()
+        academic_year = str(row['academic_year']).strip()
+        course_code = str(row['course_code']).strip()
+        schedules.append((faculty_id, row['day_of_week'], start_time, end_time, room_location,
+                          academic_year, row['semester_num'], course_code))
+        checked.append((row_number, faculty_id, room_location, academic_year, row['semester_num'],
+                        start_minute, end_minute, course_code))
+    
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        # The write lock keeps the checks valid until the insert commits
+        cursor.execute('BEGIN IMMEDIATE')
+        
+        # Foreign keys, one set lookup per table
+        professors = find_existing_keys(cursor, 'professors', 'faculty_id', {entry[1] for entry in checked})
+        courses = find_existing_keys(cursor, 'courses', 'course_code', {entry[7] for entry in checked})
+        valid = []
+        for entry in checked:
+            row_number, faculty_id, _, _, _, _, _, course_code = entry
+            if faculty_id not in professors:
+                row_errors.append({'row': row_number, 'error': f"Professor {faculty_id} does not exist"})
+            if course_code not in courses:
+                row_errors.append({'row': row_number, 'error': f"Course '{course_code}' does not exist"})
+            if faculty_id in professors and course_code in courses:
+                valid.append(entry)
+        
+        # Conflicts against the database and within the batch
+        sync_conflict_engine(cursor)
+        with _conflict_engine.lock:
+            conflicts = _conflict_engine.find_batch_conflicts([entry[1:7] for entry in valid])
+        for index, kind, other in conflicts:
+            row_number = valid[index][0]
+            what = "Professor already has a class" if kind == 'professor' else "Room is already booked"
+            if isinstance(other, tuple):
+                where = f"row {valid[other[1]][0]}"
+            else:
+                where = f"schedule {other}"
+            row_errors.append({'row': row_number, 'error': f"{what} during this time ({where})"})
+        
+        row_errors.sort(key=lambda error: error['row'])
+        if row_errors:
+            release_connection(conn)
+            failed_rows = len({error['row'] for error in row_errors})
+            return False, f"{failed_rows} of {len(rows)} rows have errors; nothing was imported", row_errors
+        
+        if dry_run:
+            release_connection(conn)
+            return True, f"All {len(schedules)} rows are valid (dry run, nothing was imported)", []
+        
+        cursor.executemany('''
+        INSERT INTO professor_sched (faculty_id, day_of_week, start_time, end_time,
+                                   room_location, academic_year, semester_num, course_code)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', schedules)
+        
+        conn.commit()
+        release_connection(conn)
+        notify_change('schedule', None, 'reload')
+        return True, f"Imported {len(schedules)} schedules", []
+    except sqlite3.Error as e:
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", row_errors
+    except Exception as e:
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", row_errors
+
+# Name a replica records its source's progress under in sync_state
+SYNC_SOURCE = 'primary'
+
+def table_columns(cursor, table):
+    """Stored columns of a table (generated columns are computed, never copied)"""
+    cursor.execute(f'PRAGMA table_info({table})')
+    return [row[1] for row in cursor.fetchall()]
+
+def get_sync_seq(source=SYNC_SOURCE):
+    """
+    The last change_log seq of source applied to this database. A replica that
+    never synced began as a copy of its source's file, so it is as far as the
+    log it was copied with.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute('SELECT last_seq FROM sync_state WHERE source = ?', (source,))
+        row = cursor.fetchone()
+        if row is None:
+            cursor.execute('SELECT COALESCE(MAX(seq), 0) FROM change_log')
+            row = cursor.fetchone()
+        return row[0]
+    finally:
+        release_connection(conn)
+
+def export_changes(after_seq):
+    """
+    Get what changed since change_log entry after_seq, for a replica to apply
+    with apply_changes. Each changed row appears once, as it is now (None if
+    it no longer exists), in the order of its last change, so the delta stays
+    as small as the set of rows touched however often they were edited.
+    Returns {'since': after_seq, 'last_seq': n, 'changes': [{'table', 'key', 'row'}]}.
+    Raises ValueError if entries after after_seq were already pruned (see
+    prune_change_log); that replica has to start again from a copy of the file.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        # One read transaction, so the rows match the log up to last_seq
+        cursor.execute('BEGIN')
+        cursor.execute('SELECT MIN(seq), COALESCE(MAX(seq), 0) FROM change_log')
+        first_seq, last_seq = cursor.fetchone()
+        if first_seq is not None and after_seq < first_seq - 1:
+            raise ValueError(f"Changes {after_seq + 1} to {first_seq - 1} were pruned from the change log; "
+                             f"copy the primary database file to the replica again")
+        last_seq = max(last_seq, after_seq)
+        cursor.execute('''
+        SELECT table_name, row_key, MAX(seq) as last_change
+        FROM change_log
+        WHERE seq > ?
+        GROUP BY table_name, row_key
+        ORDER BY last_change
+        ''', (after_seq,))
+        changed = cursor.fetchall()
+        
+        # Current rows, one IN lookup per table and chunk
+        rows = {}
+        for table, key, _ in SYNCED_TABLES:
+            keys = [row_key for table_name, row_key, _ in changed if table_name == table]
+            columns = table_columns(cursor, table)
+            for i in range(0, len(keys), IMPORT_LOOKUP_CHUNK):
+                chunk = keys[i:i + IMPORT_LOOKUP_CHUNK]
+                placeholders = ', '.join('?' for _ in chunk)
+                cursor.execute(f'SELECT {", ".join(columns)} FROM {table} WHERE {key} IN ({placeholders})', chunk)
+                for row in cursor.fetchall():
+                    rows[(table, row[key])] = dict(row)
+        conn.rollback()
+        
+        changes = [{'table': table, 'key': row_key, 'row': rows.get((table, row_key))}
+                   for table, row_key, _ in changed]
+        return {'since': after_seq, 'last_seq': last_seq, 'changes': changes}
+    finally:
+        release_connection(conn)
+
+def apply_changes(delta, source=SYNC_SOURCE):
+    """
+    Apply a delta from export_changes to this replica in one transaction.
+    Deleted rows are removed first, then the others are upserted, so applying
+    a delta twice, or one overlapping what was already applied, changes
+    nothing. Refuses a delta that starts past the replica's last applied seq,
+    since the changes in between would be missing.
+    Returns (success, message, number of rows changed).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.execute('SELECT last_seq FROM sync_state WHERE source = ?', (source,))
+        row = cursor.fetchone()
+        cursor.execute('SELECT COALESCE(MAX(seq), 0) FROM change_log')
+        local_seq = cursor.fetchone()[0]
+        last_seq = row[0] if row else local_seq
+        
+        if delta['since'] > last_seq:
+            conn.rollback()
+            release_connection(conn)
+            return False, (f"Replica is at change {last_seq} but the delta starts after change "
+                           f"{delta['since']}; export from {last_seq} instead"), 0
+        if delta['last_seq'] <= last_seq:
+            conn.rollback()
+            release_connection(conn)
+            return True, f"Already up to date (change {last_seq})", 0
+        
+        keys = {table: key for table, key, _ in SYNCED_TABLES}
+        changes = [change for change in delta['changes'] if change['table'] in keys]
+        
+        # Children before parents, and before any upsert that may reuse a deleted row's email
+        table_order = [table for table, _, _ in SYNCED_TABLES]
+        deletes = sorted((change for change in changes if change['row'] is None),
+                         key=lambda change: -table_order.index(change['table']))
+        for change in deletes:
+            table = change['table']
+            cursor.execute(f'DELETE FROM {table} WHERE {keys[table]} = ?', (change['key'],))
+        
+        # Emails can move between professors within one delta, and rows are replayed one
+        # at a time, so park the changed professors' emails where they cannot collide
+        professor_keys = [change['key'] for change in changes
+                          if change['table'] == 'professors' and change['row'] is not None]
+        for i in range(0, len(professor_keys), IMPORT_LOOKUP_CHUNK):
+            chunk = professor_keys[i:i + IMPORT_LOOKUP_CHUNK]
+            cursor.execute(f'''
+            UPDATE professors SET email = '#sync#' || faculty_id
+            WHERE faculty_id IN ({', '.join('?' for _ in chunk)})
+            ''', chunk)
+        
+        # Upserts fire the update triggers (search and count upkeep) where REPLACE would not;
+        # only columns this replica has are written
+        stored_columns = {table: set(table_columns(cursor, table)) for table in keys}
+        for change in changes:
+            if change['row'] is None:
+                continue
+            table, row = change['table'], change['row']
+            columns = [column for column in row if column in stored_columns[table]]
+            updates = ', '.join(f'{column} = excluded.{column}' for column in columns if column != keys[table])
+            cursor.execute(f'''
+            INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})
+            ON CONFLICT({keys[table]}) DO UPDATE SET {updates}
+            ''', [row[column] for column in columns])
+            if table == 'professors':
+                index_professor_name(cursor, row['faculty_id'], row['f_name'], row['l_name'])
+        
+        # The replica's own log would only echo what it was sent
+        cursor.execute('DELETE FROM change_log WHERE seq > ?', (local_seq,))
+        cursor.execute('''
+        INSERT INTO sync_state (source, last_seq) VALUES (?, ?)
+        ON CONFLICT(source) DO UPDATE SET last_seq = excluded.last_seq
+        ''', (source, delta['last_seq']))
+        
+        conn.commit()
+        release_connection(conn)
+        for table, _, entity in SYNCED_TABLES:
+            if any(change['table'] == table for change in changes):
+                notify_change(entity, None, 'reload')
+        return True, f"Applied {len(changes)} changed rows (now at change {delta['last_seq']})", len(changes)
+    except sqlite3.Error as e:
+        conn.rollback()
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", 0
+    except Exception as e:
+        conn.rollback()
+        release_connection(conn)
+        return False, f"An unexpected error occurred: {str(e)}", 0
+
+def acknowledge_replica(replica, last_seq):
+    """On the primary, record that replica has applied its change_log up to last_seq"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('''
+        INSERT INTO sync_replicas (replica, last_seq, synced_at) VALUES (?, ?, ?)
+        ON CONFLICT(replica) DO UPDATE SET last_seq = MAX(last_seq, excluded.last_seq),
+                                           synced_at = excluded.synced_at
+        ''', (replica, last_seq, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        conn.commit()
+        release_connection(conn)
+        return True, f"Kiosk '{replica}' is at change {last_seq}"
+    except sqlite3.Error as e:
+        release_connection(conn)
+        return False, f"Database error: {str(e)}"
+
+def get_replicas():
+    """The kiosks known to this primary, as dicts of replica, last_seq and synced_at"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute('SELECT replica, last_seq, synced_at FROM sync_replicas ORDER BY replica')
+    replicas = [dict(row) for row in cursor.fetchall()]
+    
+    release_connection(conn)
+    return replicas
+
+def forget_replica(replica):
+    """Stop holding change_log entries for a kiosk that was retired"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('DELETE FROM sync_replicas WHERE replica = ?', (replica,))
+        if not cursor.rowcount:
+            release_connection(conn)
+            return False, f"Kiosk '{replica}' is not known"
+        conn.commit()
+        release_connection(conn)
+        return True, f"Kiosk '{replica}' forgotten"
+    except sqlite3.Error as e:
+        release_connection(conn)
+        return False, f"Database error: {str(e)}"
+
+def prune_change_log(max_entries=None):
+    """
+    Delete the change_log entries every kiosk in sync_replicas has applied;
+    none while no kiosk is known. With max_entries, also delete the oldest
+    entries beyond that many, even if a kiosk is still behind: such a kiosk
+    has to start again from a copy of the file (export_changes refuses it).
+    The newest entry is always kept, so a pruned log can be told from an empty one.
+    Returns (success, message, number of entries deleted).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.execute('SELECT MIN(last_seq) FROM sync_replicas')
+        bound = cursor.fetchone()[0] or 0
+        cursor.execute('SELECT COALESCE(MAX(seq), 0) FROM change_log')
+        last_seq = cursor.fetchone()[0]
+        if max_entries is not None:
+            bound = max(bound, last_seq - max_entries)
+        bound = min(bound, last_seq - 1)
+        
+        cursor.execute('DELETE FROM change_log WHERE seq <= ?', (bound,))
+        deleted = cursor.rowcount
+        conn.commit()
+        release_connection(conn)
+        return True, f"Pruned {deleted} change log entries (up to change {max(bound, 0)})", deleted
+    except sqlite3.Error as e:
+        release_connection(conn)
+        return False, f"Database error: {str(e)}", 0
+
+# Online backups copy this many pages per step; between steps the database is
+# free for writers, so a large backup never holds them up for long
+BACKUP_PAGES_PER_STEP = 1024
+
+# Snapshots are faculty_db-<YYYYmmdd-HHMMSS>.sqlite files in a backups folder
+# next to the database; rotation keeps the newest SNAPSHOT_KEEP of them
+SNAPSHOT_PREFIX = 'faculty_db-'
+SNAPSHOT_KEEP = 14
+
+def backup_database(target_path, pages=BACKUP_PAGES_PER_STEP, progress=None):
+    """
+    Copy the live database, as of the moment the backup starts, to target_path
+    with SQLite's online backup API while it keeps being written to.
+    progress(copied, total), in pages, is called after every step. The copy is
+    written beside target_path and renamed into place, so target_path is only
+    ever a complete copy. Returns target_path.
+    """
+    def report(status, remaining, total):
+        if progress is not None:
+            progress(total - remaining, total)
+    
+    temp_path = f"{target_path}.partial"
+    # Own connections, so a long backup does not tie up the pool
+    source = sqlite3.connect(DB_PATH, isolation_level=None)
+    target = sqlite3.connect(temp_path)
+    try:
+        # Any other connection's commit restarts a backup from the first page. In WAL
+        # mode one read transaction across all the steps pins a point in time instead,
+        # and readers never block writers there
+        if source.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+            source.execute('BEGIN')
+            source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+        source.backup(target, pages=pages, progress=report)
+        if source.in_transaction:
+            source.execute('COMMIT')
+        # A standalone file: no -wal/-shm beside the snapshot
+        target.execute('PRAGMA journal_mode = DELETE')
+    except Exception:
+        target.close()
+        os.remove(temp_path)
+        raise
+    finally:
+        target.close()
+        source.close()
+    os.replace(temp_path, target_path)
+    return target_path
+
+def verify_backup(path):
+    """Check a backup with PRAGMA quick_check; returns (ok, message)"""
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            problems = [row[0] for row in conn.execute('PRAGMA quick_check')]
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return False, f"Could not check {path}: {str(e)}"
+    if problems == ['ok']:
+        return True, "ok"
+    return False, "; ".join(problems)
+
+def get_backup_directory():
+    """The backups folder next to the database"""
+    return os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), 'backups')
+
+def list_snapshots(directory=None):
+    """Paths of the snapshots in directory, oldest first"""
+    directory = directory or get_backup_directory()
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(name for name in os.listdir(directory)
+                   if name.startswith(SNAPSHOT_PREFIX) and name.endswith('.sqlite'))
+    return [os.path.join(directory, name) for name in names]
+
+def rotate_snapshots(directory=None, keep=SNAPSHOT_KEEP):
+    """Delete all but the newest keep snapshots; returns the deleted paths"""
+    if keep < 1:
+        raise ValueError(f"keep must be at least 1, got {keep}")
+    snapshots = list_snapshots(directory)
+    removed = snapshots[:max(len(snapshots) - keep, 0)]
+    for path in removed:
+        os.remove(path)
+    return removed
+
+def take_snapshot(directory=None, keep=SNAPSHOT_KEEP, pages=BACKUP_PAGES_PER_STEP, progress=None):
+    """
+    Back the database up into a new timestamped snapshot, verify it and rotate
+    out the oldest beyond keep. A snapshot failing its check is deleted and
+    nothing is rotated. Returns (success, message, snapshot path or None).
+    """
+    # Rotating to fewer than one would delete the snapshot just taken
+    if keep < 1:
+        return False, f"Snapshots to keep must be at least 1, got {keep}", None
+    directory = directory or get_backup_directory()
+    os.makedirs(directory, exist_ok=True)
+    
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(directory, f"{SNAPSHOT_PREFIX}{stamp}.sqlite")
+    # Two snapshots within a second keep their order: '_' sorts after the bare
+    # name's '.', and the suffix is zero-padded so that _010 sorts after _002.
+    # It follows the newest of the second's snapshots, not the first free name,
+    # since rotation may already have removed the older ones
+    same_second = [os.path.basename(snapshot) for snapshot in list_snapshots(directory)
+                   if os.path.basename(snapshot).startswith(f"{SNAPSHOT_PREFIX}{stamp}")]
+    if same_second:
+        newest = same_second[-1][len(SNAPSHOT_PREFIX) + len(stamp):-len('.sqlite')]
+        suffix = int(newest.lstrip('_') or 0) + 1
+        path = os.path.join(directory, f"{SNAPSHOT_PREFIX}{stamp}_{suffix:03d}.sqlite")
+    
+    try:
+        backup_database(path, pages, progress)
+    except (sqlite3.Error, OSError) as e:
+        return False, f"Backup failed: {str(e)}", None
+    
+    ok, message = verify_backup(path)
+    if not ok:
+        os.remove(path)
+        return False, f"Backup failed its integrity check: {message}", None
+    
+    removed = rotate_snapshots(directory, keep)
+    size_mb = os.path.getsize(path) / 1e6
+    return True, (f"Saved {os.path.basename(path)} ({size_mb:.1f} MB, verified)"
+                  + (f"; removed {len(removed)} old snapshots" if removed else "")), path
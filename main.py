@@ -2,7 +2,7 @@ import sys
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QLabel, QPushButton, 
                            QVBoxLayout, QHBoxLayout, QFrame, QStackedWidget, QSplitter,
                            QScrollArea, QSizePolicy, QSpacerItem, QMessageBox)
-from PyQt5.QtCore import Qt, QSize, pyqtSignal, QEvent, QObject
+from PyQt5.QtCore import Qt, QSize, pyqtSignal, QEvent, QObject, QTimer
 from PyQt5.QtGui import QFont, QColor, QCursor
 import sqlite3
 import os
@@ -17,9 +17,12 @@ from database import (
     filter_professors_by_course,
     get_all_faculties,
     get_all_courses,
-    ensure_admin_table_exists,
-    ensure_photo_url_column
+    migrate_database,
+    close_all_connections
 )
+from autocomplete import get_autocomplete
+from ui.data_worker import get_data_worker, shutdown_data_worker
+from ui.change_bus import shutdown_change_bus
 from ui.faculty_list import FacultyListFrame
 from ui.faculty_detail import FacultyDetailFrame
 from ui.schedule_view import ScheduleViewFrame
@@ -133,6 +136,9 @@ class NavButton(QWidget):
         else:
             self.label.setStyleSheet(f"color: white; background-color: {self.default_bg}; padding: 10px 15px;")
 
+# Milliseconds without further resizing before frames are laid out again
+RESIZE_DEBOUNCE_MS = 60
+
 class FacultyManagementSystem(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -145,6 +151,13 @@ class FacultyManagementSystem(QMainWindow):
         self.admin_mode = False
         self.admin_info = None
         
+        # Window size each frame was last laid out for; hidden frames catch up when shown
+        self.frame_sizes = {}
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self.resize_timer.timeout.connect(self.reflow_current_frame)
+        
         # Initialize database if it doesn't exist
         db_path = "faculty_db.sqlite"
         db_exists = os.path.exists(db_path)
@@ -153,9 +166,8 @@ class FacultyManagementSystem(QMainWindow):
             create_database()
             populate_sample_data()
         
-        # Always ensure admin table exists and photo_url column exists
-        ensure_admin_table_exists()
-        ensure_photo_url_column()
+        # Bring older databases up to the current schema (one PRAGMA read when current)
+        migrate_database()
         
         # Create central widget
         central_widget = QWidget()
@@ -243,28 +255,19 @@ class FacultyManagementSystem(QMainWindow):
         content_layout.setContentsMargins(0, 0, 0, 0)
         content_layout.addWidget(self.stacked_widget)
         
-        # Initialize frames
-        self.frames = {}
-        
-        # About frame
-        about_frame = AboutFrame(self.stacked_widget, self)
-        self.stacked_widget.addWidget(about_frame)
-        self.frames["aboutframe"] = about_frame
-        
-        # Create other frames
+        # Frames are built the first time they are shown (see get_frame)
         frames_classes = [
-            FacultyListFrame, DepartmentsListFrame, DepartmentDetailFrame, 
+            AboutFrame, FacultyListFrame, DepartmentsListFrame, DepartmentDetailFrame, 
             FacultyDetailFrame, ScheduleViewFrame, AdminFrame,
             AdminLoginFrame, AdminDashboardFrame, FacultyManagementFrame,
             DepartmentManagementFrame, CourseManagementFrame, ScheduleManagementFrame
         ]
+        self.frame_classes = {FrameClass.__name__.lower(): FrameClass for FrameClass in frames_classes}
+        self.frames = {}
         
-        for FrameClass in frames_classes:
-            frame_name = FrameClass.__name__.lower()
-            if frame_name != "aboutframe":  # Already created above
-                frame = FrameClass(self.stacked_widget, self)
-                self.stacked_widget.addWidget(frame)
-                self.frames[frame_name] = frame
+        # Data for the first frame is loaded once the window has painted
+        self.first_paint_done = False
+        self.pending_frame = None
         
         # Show default frame - Departments list
         self.show_frame("departmentslistframe")
@@ -272,12 +275,46 @@ class FacultyManagementSystem(QMainWindow):
         # Track active button
         self.active_button = None
     
+    def get_frame(self, frame_name):
+        """Get a frame by name, building it on first use"""
+        frame = self.frames.get(frame_name)
+        if frame is None:
+            frame = self.frame_classes[frame_name](self.stacked_widget, self)
+            self.stacked_widget.addWidget(frame)
+            self.frames[frame_name] = frame
+        return frame
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            # Return to the event loop first so the rest of the window paints too
+            QTimer.singleShot(0, self.finish_startup)
+    
+    def finish_startup(self):
+        """Load what startup deferred until the window was on screen"""
+        if self.pending_frame is not None:
+            frame_name, self.pending_frame = self.pending_frame, None
+            self.load_frame_data(frame_name)
+        
+        # Load search-as-you-type suggestions once in the background; writes keep them current
+        get_data_worker().submit("autocomplete", get_autocomplete)
+    
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        # Propagate resize event to frames that need special handling
-        for frame_name, frame in self.frames.items():
-            if hasattr(frame, 'on_resize'):
-                frame.on_resize(self.width(), self.height())
+        # Lay out once the window has stopped changing size, not on every step of a drag
+        self.resize_timer.start()
+    
+    def reflow_current_frame(self):
+        """Lay out the visible frame for the current window size"""
+        self.reflow_frame(self.stacked_widget.currentWidget())
+    
+    def reflow_frame(self, frame):
+        """Let a frame adapt to the window size, unless it already has"""
+        size = (self.width(), self.height())
+        if hasattr(frame, 'on_resize') and self.frame_sizes.get(frame) != size:
+            self.frame_sizes[frame] = size
+            frame.on_resize(*size)
     
     def deactivate_all_buttons(self):
         """Deactivate all navigation buttons"""
@@ -288,13 +325,11 @@ class FacultyManagementSystem(QMainWindow):
     def show_frame(self, frame_name):
         """Show the specified frame"""
         frame_name = frame_name.lower()
-        if frame_name in self.frames:
-            # Show the requested frame
-            self.stacked_widget.setCurrentWidget(self.frames[frame_name])
-            
-            # Special handling for certain frames
-            if hasattr(self.frames[frame_name], 'on_show'):
-                self.frames[frame_name].on_show()
+        if frame_name in self.frame_classes:
+            # Show the requested frame, laid out for the current size if it was resized while hidden
+            frame = self.get_frame(frame_name)
+            self.stacked_widget.setCurrentWidget(frame)
+            self.reflow_frame(frame)
             
             # Activate the corresponding button
             self.deactivate_all_buttons()
@@ -331,25 +366,23 @@ class FacultyManagementSystem(QMainWindow):
                 # Show navigation buttons container
                 self.nav_buttons_container.show()
             
-            # Reload faculty list if returning to it from admin frame after adding a professor
-            if frame_name in ["facultylistframe", "departmentslistframe"] and hasattr(self.frames[frame_name], 'load_faculty_list'):
-                try:
-                    # Refresh the faculty list
-                    self.frames[frame_name].load_faculty_list()
-                except Exception as e:
-                    print(f"Error refreshing faculty list: {e}")  # Log error, don't crash
-            
-            # Reload faculties in admin frame if needed
-            if frame_name == "adminframe" and hasattr(self.frames["adminframe"], 'load_faculties'):
-                try:
-                    self.frames["adminframe"].load_faculties()
-                except Exception as e:
-                    print(f"Error reloading faculties in admin frame: {e}")
+            # Before the first paint, only the latest frame's data is loaded, after it
+            if self.first_paint_done:
+                self.load_frame_data(frame_name)
+            else:
+                self.pending_frame = frame_name
+    
+    def load_frame_data(self, frame_name):
+        """Let a frame that was just shown load its data; frames follow changes through the change bus"""
+        frame = self.frames[frame_name]
+        
+        if hasattr(frame, 'on_show'):
+            frame.on_show()
     
     def show_faculty_detail(self, faculty_id):
         """Show faculty detail for the specified faculty ID"""
         try:
-            self.frames["facultydetailframe"].load_faculty(faculty_id)
+            self.get_frame("facultydetailframe").load_faculty(faculty_id)
             self.show_frame("facultydetailframe")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load faculty details: {str(e)}")
@@ -357,7 +390,7 @@ class FacultyManagementSystem(QMainWindow):
     def show_schedule(self, faculty_id):
         """Show schedule for the specified faculty ID"""
         try:
-            self.frames["scheduleviewframe"].load_schedule(faculty_id)
+            self.get_frame("scheduleviewframe").load_schedule(faculty_id)
             self.show_frame("scheduleviewframe")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load schedule: {str(e)}")
@@ -365,7 +398,7 @@ class FacultyManagementSystem(QMainWindow):
     def show_department_detail(self, department_name):
         """Show department detail for the specified department"""
         try:
-            self.frames["departmentdetailframe"].set_department(department_name)
+            self.get_frame("departmentdetailframe").set_department(department_name)
             self.show_frame("departmentdetailframe")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load department details: {str(e)}")
@@ -380,7 +413,7 @@ class FacultyManagementSystem(QMainWindow):
         self.admin_info = admin_info
         
         # Update admin dashboard with user info
-        self.frames["admindashboardframe"].set_admin_info(admin_info)
+        self.get_frame("admindashboardframe").set_admin_info(admin_info)
         
         # Show admin dashboard
         self.show_frame("admindashboardframe")
@@ -412,7 +445,11 @@ if __name__ == "__main__":
         app = QApplication(sys.argv)
         window = FacultyManagementSystem()
         window.show()
-        sys.exit(app.exec_())
+        exit_code = app.exec_()
+        shutdown_change_bus()
+        shutdown_data_worker()
+        close_all_connections()
+        sys.exit(exit_code)
     except Exception as e:
         # Fallback error display if QApplication fails early
         print(f"Fatal error starting application: {str(e)}")
@@ -0,0 +1,235 @@
+import heapq
+import random
+import threading
+
+class _IntervalNode:
+    __slots__ = ('start', 'end', 'key', 'priority', 'left', 'right', 'max_end')
+
+    def __init__(self, start, end, key, priority):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.max_end = end
+
+def _update(node):
+    """Recompute the largest end time in node's subtree"""
+    node.max_end = node.end
+    if node.left is not None and node.left.max_end > node.max_end:
+        node.max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > node.max_end:
+        node.max_end = node.right.max_end
+
+def _merge(left, right):
+    """Join two treaps where every interval in left sorts before every interval in right"""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+def _split(node, order):
+    """Split a treap into the intervals sorting before order and the rest"""
+    if node is None:
+        return None, None
+    if (node.start, node.key) < order:
+        node.right, rest = _split(node.right, order)
+        _update(node)
+        return node, rest
+    before, node.left = _split(node.left, order)
+    _update(node)
+    return before, node
+
+class IntervalTree:
+    """
+    Half-open [start, end) intervals in a treap ordered by start and augmented
+    with the largest end of each subtree: O(log n) insert, delete and
+    "does anything overlap" queries
+    """
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+        self._random = random.Random()
+
+    def add(self, start, end, key):
+        """Add the interval [start, end) identified by key"""
+        node = _IntervalNode(start, end, key, self._random.random())
+        before, after = _split(self.root, (start, key))
+        self.root = _merge(_merge(before, node), after)
+        self.size += 1
+
+    def remove(self, start, end, key):
+        """Remove the interval [start, end) identified by key, if present"""
+        path = []
+        node = self.root
+        while node is not None and (node.start, node.key) != (start, key):
+            path.append(node)
+            node = node.left if (start, key) < (node.start, node.key) else node.right
+        if node is None:
+            return False
+
+        replacement = _merge(node.left, node.right)
+        if not path:
+            self.root = replacement
+        elif path[-1].left is node:
+            path[-1].left = replacement
+        else:
+            path[-1].right = replacement
+        for ancestor in reversed(path):
+            _update(ancestor)
+        self.size -= 1
+        return True
+
+    def find_any(self, start, end, exclude=()):
+        """Return the key of an interval overlapping [start, end), or None"""
+        if not exclude:
+            node = self.root
+            while node is not None:
+                if node.start < end and node.end > start:
+                    return node.key
+                # If nothing on the left overlaps, its largest end starts too late for the right too
+                if node.left is not None and node.left.max_end > start:
+                    node = node.left
+                else:
+                    node = node.right
+            return None
+
+        for key in self.find_all(start, end):
+            if key not in exclude:
+                return key
+        return None
+
+    def find_all(self, start, end):
+        """Return the keys of every interval overlapping [start, end), in start order"""
+        keys = []
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            # Skip subtrees that end before the query starts
+            while node is not None and node.max_end > start:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            if node.start >= end:
+                break
+            if node.end > start:
+                keys.append(node.key)
+            node = node.right
+        return keys
+
+def room_key(room_location):
+    """Normalize a room name so 'Room 101' and 'room  101' are the same room"""
+    return ' '.join(str(room_location or '').casefold().split())
+
+class ScheduleConflictEngine:
+    """
+    Per-professor and per-room interval trees for each academic year and
+    semester, answering whether a class overlaps an existing one
+    """
+
+    def __init__(self):
+        self.trees = {}
+        self.schedules = {}
+        # Revision of professor_sched these trees reflect, None until loaded
+        self.revision = None
+        self.lock = threading.RLock()
+
+    def _tree_keys(self, faculty_id, room_location, academic_year, semester_num):
+        keys = [('professor', faculty_id, academic_year, semester_num)]
+        room = room_key(room_location)
+        if room:
+            keys.append(('room', room, academic_year, semester_num))
+        return keys
+
+    def clear(self):
+        self.trees = {}
+        self.schedules = {}
+        self.revision = None
+
+    def add(self, schedule_id, faculty_id, room_location, academic_year, semester_num, start_minute, end_minute):
+        """Add (or replace) one schedule"""
+        self.remove(schedule_id)
+        entry = (faculty_id, room_location, academic_year, semester_num, start_minute, end_minute)
+        self.schedules[schedule_id] = entry
+        for tree_key in self._tree_keys(faculty_id, room_location, academic_year, semester_num):
+            tree = self.trees.get(tree_key)
+            if tree is None:
+                tree = self.trees[tree_key] = IntervalTree()
+            tree.add(start_minute, end_minute, schedule_id)
+
+    def remove(self, schedule_id):
+        """Remove one schedule, if present"""
+        entry = self.schedules.pop(schedule_id, None)
+        if entry is None:
+            return
+        faculty_id, room_location, academic_year, semester_num, start_minute, end_minute = entry
+        for tree_key in self._tree_keys(faculty_id, room_location, academic_year, semester_num):
+            tree = self.trees.get(tree_key)
+            if tree is not None:
+                tree.remove(start_minute, end_minute, schedule_id)
+                if not tree.size:
+                    del self.trees[tree_key]
+
+    def find_conflicts(self, faculty_id, room_location, academic_year, semester_num, start_minute, end_minute,
+                       exclude_schedule_id=None, all_conflicts=False):
+        """
+        Return the conflicts of a proposed class as a list of
+        ('professor' | 'room', schedule_id); only the first of each kind unless all_conflicts
+        """
+        exclude = (exclude_schedule_id,) if exclude_schedule_id is not None else ()
+        conflicts = []
+        for tree_key in self._tree_keys(faculty_id, room_location, academic_year, semester_num):
+            tree = self.trees.get(tree_key)
+            if tree is None:
+                continue
+            if all_conflicts:
+                conflicts.extend((tree_key[0], key) for key in tree.find_all(start_minute, end_minute)
+                                 if key not in exclude)
+            else:
+                key = tree.find_any(start_minute, end_minute, exclude)
+                if key is not None:
+                    conflicts.append((tree_key[0], key))
+        return conflicts
+
+    def find_batch_conflicts(self, schedules):
+        """
+        Enumerate every conflict of a batch of proposed classes, given as
+        (faculty_id, room_location, academic_year, semester_num, start_minute,
+        end_minute) tuples, against the existing schedules and each other.
+        Returns (batch index, 'professor' | 'room', schedule_id or ('batch', index)) tuples.
+        """
+        batch = ScheduleConflictEngine()
+        conflicts = []
+        for index, schedule in enumerate(schedules):
+            for kind, other in self.find_conflicts(*schedule, all_conflicts=True):
+                conflicts.append((index, kind, other))
+            for kind, other in batch.find_conflicts(*schedule, all_conflicts=True):
+                conflicts.append((index, kind, ('batch', other)))
+            batch.add(index, *schedule)
+        return conflicts
+
+def sweep_conflicts(intervals):
+    """
+    Yield every overlapping pair among one resource's (start, end, key)
+    intervals, as (earlier key, later key, overlap start, overlap end): one
+    sort and one sweep, O(n log n + conflicts)
+    """
+    active = []
+    for start, end, key in sorted(intervals):
+        # Classes that ended by now can no longer overlap anything later
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for other_end, other_key in active:
+            yield other_key, key, start, min(end, other_end)
+        heapq.heappush(active, (end, key))
@@ -0,0 +1,43 @@
+import os
+import sys
+import json
+import argparse
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+
+def main(argv=None):
+    """Audit the whole timetable for double-bookings and print a JSON report"""
+    default_db = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), database.DB_PATH)
+
+    parser = argparse.ArgumentParser(description="Report every professor and room double-booking in professor_sched")
+    parser.add_argument("--db", default=default_db, help="database file to audit (default: the app database)")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Database not found: {args.db}", file=sys.stderr)
+        return 2
+
+    database.configure_pool(args.db)
+    try:
+        report = database.audit_schedule_conflicts()
+    finally:
+        database.close_all_connections()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    print(f"{report['schedules_checked']} schedules checked: {report['summary']['professor']} professor conflicts, "
+          f"{report['summary']['room']} room conflicts, {len(report['invalid_rows'])} invalid rows", file=sys.stderr)
+
+    # Non-zero exit status so scheduled audits can alert on problems
+    return 1 if report['conflict_count'] or report['invalid_rows'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
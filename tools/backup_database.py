@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import argparse
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+
+def report_progress(copied, total):
+    print(f"\rCopied {copied}/{total} pages ({copied * 100 // max(total, 1)}%)",
+          end='' if copied < total else '\n', file=sys.stderr, flush=True)
+
+def snapshot_count(value):
+    """argparse type for --keep: rotating to fewer than one snapshot deletes them all"""
+    count = int(value)
+    if count < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {count}")
+    return count
+
+def snapshot(directory, keep, pages):
+    """Take one verified snapshot; returns True on success"""
+    start = time.perf_counter()
+    success, message, path = database.take_snapshot(directory, keep, pages, report_progress)
+    print(f"{message} ({time.perf_counter() - start:.2f}s)")
+    return success
+
+def verify_all(directory):
+    """Run quick_check on every snapshot in directory; returns True if all pass"""
+    snapshots = database.list_snapshots(directory)
+    failed = 0
+    for path in snapshots:
+        ok, message = database.verify_backup(path)
+        failed += not ok
+        print(f"{os.path.basename(path)}: {message}")
+    print(f"{len(snapshots)} snapshots checked, {failed} failed")
+    return not failed
+
+def main(argv=None):
+    """Back up the live database into rotating, verified snapshots"""
+    default_db = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), database.DB_PATH)
+
+    parser = argparse.ArgumentParser(
+        description="Online backup of the faculty database (safe while the app is writing to it)")
+    parser.add_argument("--db", default=default_db, help="database file (default: the app database)")
+    parser.add_argument("--dir", help="snapshot folder (default: backups/ next to the database)")
+    parser.add_argument("--keep", type=snapshot_count, default=database.SNAPSHOT_KEEP,
+                        help=f"snapshots to keep (default: {database.SNAPSHOT_KEEP})")
+    parser.add_argument("--pages", type=int, default=database.BACKUP_PAGES_PER_STEP,
+                        help=f"pages copied per step (default: {database.BACKUP_PAGES_PER_STEP})")
+    parser.add_argument("--every", type=float, metavar="MINUTES",
+                        help="keep running and take a snapshot every MINUTES (without cron)")
+    parser.add_argument("--verify-only", action="store_true", help="only check the existing snapshots")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Database not found: {args.db}", file=sys.stderr)
+        return 2
+    database.configure_pool(args.db)
+
+    try:
+        if args.verify_only:
+            return 0 if verify_all(args.dir) else 1
+        if args.every is None:
+            return 0 if snapshot(args.dir, args.keep, args.pages) else 1
+
+        while True:
+            snapshot(args.dir, args.keep, args.pages)
+            time.sleep(args.every * 60)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        database.close_all_connections()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import os
+import sys
+import random
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+import database
+from benchmark_search import populate_large_directory
+from benchmark_conflicts import random_class
+from ui.table_models import RecordTableModel, RecordTableView
+from ui.schedule_management import SCHEDULE_COLUMNS
+
+def load_all_rows(table):
+    """What ScheduleManagementFrame.load_schedules did before paging: every row at once"""
+    schedules = database.get_all_schedules.uncached()
+    table.setRowCount(len(schedules))
+    for i, sched in enumerate(schedules):
+        for column, (header, value) in enumerate(SCHEDULE_COLUMNS):
+            table.setItem(i, column, QTableWidgetItem(str(value(sched))))
+
+def make_view(view):
+    view.resize(1100, 600)
+    view.show()
+    return view
+
+def benchmark_admin_tables(counts=(1000, 10000, 100000), seed=5):
+    """
+    Time the schedule table's first paint with every row loaded and with keyset
+    pages, and refreshing it after an edit by reloading versus in place
+    """
+    app = QApplication.instance() or QApplication(sys.argv)
+    rng = random.Random(seed)
+    work_dir = tempfile.mkdtemp(prefix="faculty_tables_")
+    db_path = os.path.join(work_dir, "faculty_db.sqlite")
+
+    try:
+        database.configure_pool(db_path)
+        database.create_database()
+        database.populate_sample_data()
+        populate_large_directory(5000)
+
+        print(f"{'schedules':>10}{'all rows (ms)':>15}{'paged (ms)':>12}{'rows loaded':>13}"
+              f"{'reload after edit (ms)':>24}{'in place (ms)':>15}")
+        loaded = 0
+        for count in counts:
+            conn = database.get_connection()
+            conn.executemany('''
+            INSERT INTO professor_sched (faculty_id, day_of_week, start_time, end_time,
+                                         room_location, academic_year, semester_num, course_code)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 'CS101')
+            ''', [random_class(rng, 5000) for _ in range(count - loaded)])
+            conn.commit()
+            database.release_connection(conn)
+            loaded = count
+
+            table = make_view(QTableWidget(0, len(SCHEDULE_COLUMNS)))
+            start = time.perf_counter()
+            load_all_rows(table)
+            table.repaint()
+            legacy_ms = (time.perf_counter() - start) * 1e3
+
+            # The old frames reloaded the whole table after every save or delete
+            start = time.perf_counter()
+            table.setRowCount(0)
+            load_all_rows(table)
+            table.repaint()
+            legacy_edit_ms = (time.perf_counter() - start) * 1e3
+            table.deleteLater()
+
+            model = RecordTableModel(SCHEDULE_COLUMNS, lambda sched: sched['schedule_id'],
+                                     database.schedule_page_key, database.get_schedules_page.uncached)
+            view = make_view(RecordTableView(model))
+            start = time.perf_counter()
+            model.reload()
+            app.processEvents()
+            view.repaint()
+            paged_ms = (time.perf_counter() - start) * 1e3
+            first_rows = model.rowCount()
+
+            # Move the first loaded schedule to another room and show the change
+            sched = model.rows[0]
+            success, message, row = database.update_schedule(
+                sched['schedule_id'], sched['faculty_id'], sched['day_of_week'], sched['start_time'],
+                sched['end_time'], "Room 999", sched['academic_year'], sched['semester_num'], sched['course_code'])
+            start = time.perf_counter()
+            if success:
+                model.apply_change(row)
+            view.repaint()
+            in_place_ms = (time.perf_counter() - start) * 1e3
+
+            print(f"{count:>10}{legacy_ms:>15.0f}{paged_ms:>12.1f}{first_rows:>13}"
+                  f"{legacy_edit_ms:>24.0f}{in_place_ms:>15.2f}{'' if success else '  ' + message}")
+            view.deleteLater()
+            app.processEvents()
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    benchmark_admin_tables()
@@ -0,0 +1,68 @@
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+from autocomplete import Autocomplete
+from benchmark_search import populate_large_directory, time_call
+
+PREFIXES = ["j", "jo", "john", "ma", "maria s", "smi", "dela", "net", "data", "cs1", "zzz"]
+
+def benchmark_autocomplete(count=100000, iterations=2000):
+    """Measure trie load time, suggestion latency and incremental update cost"""
+    work_dir = tempfile.mkdtemp(prefix="faculty_autocomplete_")
+    db_path = os.path.join(work_dir, "faculty_db.sqlite")
+
+    try:
+        database.configure_pool(db_path)
+        database.create_database()
+        database.populate_sample_data()
+        populate_large_directory(count)
+
+        service = Autocomplete()
+        start = time.perf_counter()
+        service.load()
+        print(f"Loaded {count} professors into {service.trie.node_count} trie nodes "
+              f"in {time.perf_counter() - start:.2f}s")
+
+        print(f"{'prefix':<12}{'cold (us)':>12}{'warm (us)':>12}  suggestions")
+        for prefix in PREFIXES:
+            start = time.perf_counter()
+            suggestions = service.suggest(prefix)
+            cold = (time.perf_counter() - start) * 1e6
+            warm = time_call(lambda: service.suggest(prefix), iterations)
+            shown = ", ".join(text for kind, text in suggestions[:3])
+            print(f"{prefix:<12}{cold:>12.1f}{warm:>12.1f}  {shown}")
+
+        # Incremental updates go through the same listener the app registers
+        database.add_change_listener(service.on_change)
+        faculty_id = database.add_professor("Zebulon", "Quixote", "zebulon.quixote@faculty.university.edu",
+                                            None, "Computer Engineering", "Robotics")['faculty_id']
+        start = time.perf_counter()
+        rounds = 200
+        for i in range(rounds):
+            database.update_professor(faculty_id, "Zebulon", f"Quixote{i % 2}",
+                                      "zebulon.quixote@faculty.university.edu", None,
+                                      "Computer Engineering", "Robotics")
+        update_ms = (time.perf_counter() - start) / rounds * 1e3
+        found = service.suggest("quixote1")
+        database.delete_professor(faculty_id)
+        gone = service.suggest("zebulon")
+        database.remove_change_listener(service.on_change)
+
+        print(f"\nupdate_professor with trie update: {update_ms:.2f} ms per call")
+        print(f"after update: {found}; after delete: {gone}")
+
+        return bool(found) and not gone
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    if not benchmark_autocomplete(count):
+        sys.exit(1)
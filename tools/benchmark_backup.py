@@ -0,0 +1,88 @@
+import os
+import sys
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+from benchmark_search import populate_large_directory
+from benchmark_conflicts import random_class
+
+class Writer(threading.Thread):
+    """Commits a small change every few milliseconds, like a busy admin station"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.stopped = threading.Event()
+        self.commits = 0
+        self.worst = 0.0
+
+    def run(self):
+        rng = random.Random(4)
+        while not self.stopped.is_set():
+            start = time.perf_counter()
+            conn = database.get_connection()
+            conn.execute('UPDATE professors SET phone = ? WHERE faculty_id = ?',
+                         (f"555-{rng.randrange(10000):04d}", rng.randrange(1, 1000)))
+            conn.commit()
+            database.release_connection(conn)
+            self.worst = max(self.worst, time.perf_counter() - start)
+            self.commits += 1
+            time.sleep(0.005)
+
+def timed_backup(target, pages, writing):
+    """Back up to target, optionally while a Writer commits; returns (s, steps, commits, worst commit s)"""
+    steps = []
+    writer = Writer()
+    if writing:
+        writer.start()
+    start = time.perf_counter()
+    database.backup_database(target, pages, lambda copied, total: steps.append(copied))
+    elapsed = time.perf_counter() - start
+    writer.stopped.set()
+    if writing:
+        writer.join()
+    return elapsed, len(steps), writer.commits, writer.worst
+
+def benchmark_backup(schedules=150000, professors=3000, seed=6):
+    """Time online backups of a large database, idle and while it is being written to"""
+    rng = random.Random(seed)
+    work_dir = tempfile.mkdtemp(prefix="faculty_backup_")
+
+    try:
+        database.configure_pool(os.path.join(work_dir, "faculty_db.sqlite"))
+        database.create_database()
+        database.populate_sample_data()
+        populate_large_directory(professors)
+        conn = database.get_connection()
+        conn.executemany('''
+        INSERT INTO professor_sched (faculty_id, day_of_week, start_time, end_time,
+                                     room_location, academic_year, semester_num, course_code)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 'CS101')
+        ''', [random_class(rng, professors) for _ in range(schedules)])
+        conn.commit()
+        database.release_connection(conn)
+
+        target = os.path.join(work_dir, "backup.sqlite")
+        print(f"{'pages per step':>15}{'writing':>9}{'backup (ms)':>13}{'steps':>7}"
+              f"{'commits meanwhile':>19}{'worst commit (ms)':>19}")
+        for pages in (-1, database.BACKUP_PAGES_PER_STEP, 100):
+            for writing in (False, True):
+                elapsed, steps, commits, worst = timed_backup(target, pages, writing)
+                print(f"{pages:>15}{str(writing):>9}{elapsed * 1e3:>13.0f}{steps:>7}"
+                      f"{commits:>19}{worst * 1e3:>19.1f}")
+
+        start = time.perf_counter()
+        ok, message = database.verify_backup(target)
+        size_mb = os.path.getsize(target) / 1e6
+        print(f"quick_check of the {size_mb:.1f} MB backup: {message} ({(time.perf_counter() - start) * 1e3:.0f} ms)")
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    benchmark_backup()
@@ -0,0 +1,62 @@
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QSize
+import database
+from benchmark_search import populate_large_directory
+from ui.faculty_cards import FacultyCardView, FacultyCardDelegate
+
+class CountingDelegate(FacultyCardDelegate):
+    """Card delegate that counts how many cards it paints"""
+    painted = 0
+
+    def paint(self, painter, option, index):
+        CountingDelegate.painted += 1
+        super().paint(painter, option, index)
+
+def benchmark_card_grid(counts=(100, 1000, 10000, 50000)):
+    """Time loading, painting and scrolling the card grid for growing directories"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    work_dir = tempfile.mkdtemp(prefix="faculty_cards_")
+    db_path = os.path.join(work_dir, "faculty_db.sqlite")
+
+    try:
+        database.configure_pool(db_path)
+        database.create_database()
+        database.populate_sample_data()
+        populate_large_directory(max(counts))
+        professors = database.get_all_professors()
+
+        view = FacultyCardView(QSize(220, 140))
+        view.setItemDelegate(CountingDelegate(QSize(220, 140), parent=view))
+        view.resize(1140, 760)
+        view.show()
+        app.processEvents()
+
+        print(f"{'professors':>10}{'load+paint (ms)':>18}{'scroll (ms)':>14}{'cards painted':>16}")
+        for count in counts:
+            CountingDelegate.painted = 0
+            start = time.perf_counter()
+            view.set_professors(professors[:count])
+            view.repaint()
+            load_ms = (time.perf_counter() - start) * 1e3
+
+            scrollbar = view.verticalScrollBar()
+            start = time.perf_counter()
+            for step in range(20):
+                scrollbar.setValue(scrollbar.maximum() * step // 19)
+                view.viewport().repaint()
+            scroll_ms = (time.perf_counter() - start) * 1e3 / 20
+            print(f"{count:>10}{load_ms:>18.1f}{scroll_ms:>14.2f}{CountingDelegate.painted:>16}")
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    benchmark_card_grid()
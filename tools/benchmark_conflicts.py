@@ -0,0 +1,98 @@
+import os
+import sys
+import random
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+from benchmark_search import populate_large_directory, time_call
+
+TERMS = [(year, semester) for year in ("2022-2023", "2023-2024", "2024-2025") for semester in database.SEMESTERS]
+ROOMS = [f"Room {building}{room:02d}" for building in range(1, 9) for room in range(1, 41)]
+
+# The overlap test the schedule functions used before the conflict engine
+LEGACY_OVERLAP_QUERY = '''
+SELECT COUNT(*) FROM professor_sched
+WHERE faculty_id = ? AND day_of_week = ? AND
+      ((start_time <= ? AND end_time > ?) OR
+       (start_time < ? AND end_time >= ?) OR
+       (start_time >= ? AND end_time <= ?))
+'''
+
+def random_class(rng, professors):
+    """Return (faculty_id, day, start, end, room, year, semester) for a random 1-3 hour class"""
+    start = rng.randrange(7 * 60, 18 * 60, 30)
+    end = start + rng.choice((60, 90, 120, 180))
+    year, semester = rng.choice(TERMS)
+    return (rng.randint(1, professors), rng.choice(database.DAYS_OF_WEEK),
+            database.format_schedule_time(start), database.format_schedule_time(end),
+            rng.choice(ROOMS), year, semester)
+
+def benchmark_conflicts(count=50000, professors=2000, iterations=2000, seed=7):
+    """Compare the legacy SQL overlap test with the interval-tree conflict engine"""
+    rng = random.Random(seed)
+    work_dir = tempfile.mkdtemp(prefix="faculty_conflicts_")
+    db_path = os.path.join(work_dir, "faculty_db.sqlite")
+
+    try:
+        database.configure_pool(db_path)
+        database.create_database()
+        database.populate_sample_data()
+        populate_large_directory(professors)
+
+        conn = database.get_connection()
+        conn.executemany('''
+        INSERT INTO professor_sched (faculty_id, day_of_week, start_time, end_time,
+                                     room_location, academic_year, semester_num, course_code)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 'CS101')
+        ''', [random_class(rng, professors) for _ in range(count)])
+        conn.commit()
+
+        start = time.perf_counter()
+        database.sync_conflict_engine(conn.cursor())
+        print(f"Loaded {count} schedules into {len(database._conflict_engine.trees)} interval trees "
+              f"in {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+        probes = [random_class(rng, professors) for _ in range(iterations)]
+
+        def legacy():
+            for faculty_id, day, start_time, end_time, room, year, semester in probes:
+                conn.execute(LEGACY_OVERLAP_QUERY, (faculty_id, day, start_time, start_time,
+                                                    end_time, end_time, start_time, end_time)).fetchone()
+
+        def engine():
+            for faculty_id, day, start_time, end_time, room, year, semester in probes:
+                start_minute, end_minute, _, _ = database.validate_schedule_fields(day, start_time, end_time, semester)
+                database._conflict_engine.find_conflicts(faculty_id, room, year, semester, start_minute, end_minute)
+
+        legacy_us = time_call(legacy, 3) / iterations
+        engine_us = time_call(engine, 3) / iterations
+        print(f"{'legacy SQL (professor only)':<34}{legacy_us:>10.1f} us/check")
+        print(f"{'interval trees (professor + room)':<34}{engine_us:>10.1f} us/check")
+
+        batch = []
+        for faculty_id, day, start_time, end_time, room, year, semester in probes:
+            start_minute, end_minute, _, _ = database.validate_schedule_fields(day, start_time, end_time, semester)
+            batch.append((faculty_id, room, year, semester, start_minute, end_minute))
+        start = time.perf_counter()
+        conflicts = database.find_batch_schedule_conflicts(batch)
+        print(f"Batch of {len(batch)}: {len(conflicts)} conflicts enumerated in "
+              f"{(time.perf_counter() - start) * 1e3:.1f} ms")
+
+        faculty_id, day, start_time, end_time, room, year, semester = probes[0]
+        add_ms = time_call(lambda: database.add_schedule(faculty_id, day, start_time, end_time,
+                                                         room, year, semester, "CS101"), 200) / 1e3
+        result = database.add_schedule(faculty_id, day, start_time, end_time, room, year, semester, "CS101")
+        print(f"add_schedule end to end: {add_ms:.2f} ms ({result[1].splitlines()[0]})")
+
+        database.release_connection(conn)
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    benchmark_conflicts(count)
@@ -0,0 +1,53 @@
+import os
+import sys
+import random
+import shutil
+import tempfile
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+from benchmark_search import populate_large_directory, time_call
+from benchmark_conflicts import random_class
+
+def legacy_dashboard_counts():
+    """What the dashboard did before get_dashboard_stats: fetch every row and count it"""
+    return (len(database.get_all_professors.uncached()), len(database.get_all_departments.uncached()),
+            len(database.get_all_courses.uncached()), len(database.get_all_schedules.uncached()))
+
+def benchmark_dashboard_stats(counts=(1000, 10000, 50000), iterations=20, seed=11):
+    """Time the dashboard's counts for growing schedule tables, bypassing the query cache"""
+    rng = random.Random(seed)
+    work_dir = tempfile.mkdtemp(prefix="faculty_dashboard_")
+    db_path = os.path.join(work_dir, "faculty_db.sqlite")
+
+    try:
+        database.configure_pool(db_path)
+        database.create_database()
+        database.populate_sample_data()
+        populate_large_directory(2000)
+
+        print(f"{'schedules':>10}{'fetch all (ms)':>16}{'aggregate (ms)':>16}{'summary (ms)':>14}{'match':>7}")
+        loaded = 0
+        for count in counts:
+            conn = database.get_connection()
+            conn.executemany('''
+            INSERT INTO professor_sched (faculty_id, day_of_week, start_time, end_time,
+                                         room_location, academic_year, semester_num, course_code)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 'CS101')
+            ''', [random_class(rng, 2000) for _ in range(count - loaded)])
+            conn.commit()
+            database.release_connection(conn)
+            loaded = count
+
+            legacy_ms = time_call(legacy_dashboard_counts, iterations) / 1e3
+            aggregate_ms = time_call(lambda: database.get_dashboard_stats.uncached(False), iterations) / 1e3
+            summary_ms = time_call(lambda: database.get_dashboard_stats.uncached(True), iterations) / 1e3
+            match = database.get_dashboard_stats.uncached(True) == database.get_dashboard_stats.uncached(False)
+            print(f"{count:>10}{legacy_ms:>16.1f}{aggregate_ms:>16.2f}{summary_ms:>14.2f}{str(match):>7}")
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    benchmark_dashboard_stats()
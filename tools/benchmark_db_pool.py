@@ -0,0 +1,75 @@
+import os
+import sys
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+
+# Read functions exercised by the UI on every navigation. They are timed without
+# the query cache, which would otherwise answer both columns from memory.
+READ_FUNCTIONS = [
+    ("get_all_professors", lambda: database.get_all_professors.uncached()),
+    ("get_professor_by_id", lambda: database.get_professor_by_id.uncached(1)),
+    ("get_professor_schedule", lambda: database.get_professor_schedule.uncached(1)),
+    ("search_professors", lambda: database.search_professors.uncached("john")),
+    ("get_all_faculties", lambda: database.get_all_faculties.uncached()),
+    ("get_all_courses", lambda: database.get_all_courses.uncached()),
+    ("get_all_departments", lambda: database.get_all_departments.uncached()),
+    ("get_professors_by_department", lambda: database.get_professors_by_department.uncached("Computer Engineering")),
+    ("get_all_schedules", lambda: database.get_all_schedules.uncached()),
+]
+
+def time_per_call(func, iterations):
+    """Return the average latency of func in microseconds"""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def benchmark_db_pool(iterations=500):
+    """
+    Compare per-call latency of the read functions with connect-per-call
+    (pool size 0, the old behaviour) against the shared connection pool
+    """
+    work_dir = tempfile.mkdtemp(prefix="faculty_bench_")
+    db_path = os.path.join(work_dir, "faculty_db.sqlite")
+    source_db = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'faculty_db.sqlite')
+
+    try:
+        # Work on a copy so the real database is never touched
+        if os.path.exists(source_db):
+            shutil.copyfile(source_db, db_path)
+
+        database.configure_pool(db_path, size=0)
+        if os.path.exists(source_db):
+            database.migrate_database()
+        else:
+            database.create_database()
+            database.populate_sample_data()
+
+        results = []
+        for name, func in READ_FUNCTIONS:
+            database.configure_pool(db_path, size=0)
+            before = time_per_call(func, iterations)
+
+            database.configure_pool(db_path)
+            after = time_per_call(func, iterations)
+
+            results.append((name, before, after))
+
+        print(f"{'function':<30}{'connect/call (us)':>20}{'pooled (us)':>15}{'speedup':>10}")
+        for name, before, after in results:
+            print(f"{name:<30}{before:>20.1f}{after:>15.1f}{before / after:>9.1f}x")
+
+        return results
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    benchmark_db_pool(iterations)
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import random
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+from benchmark_search import populate_large_directory
+from benchmark_conflicts import random_class
+
+def make_edits(rng, count, professors):
+    """
+    A day of admin edits: rooms moved, phone numbers changed, classes added and
+    dropped, and two professors' emails swapped (through a temporary address)
+    """
+    conn = database.get_connection()
+    schedule_ids = [row[0] for row in conn.execute('SELECT schedule_id FROM professor_sched')]
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            conn.execute('UPDATE professor_sched SET room_location = ? WHERE schedule_id = ?',
+                         (f"Room {rng.randrange(1000)}", rng.choice(schedule_ids)))
+        elif kind == 1:
+            conn.execute('UPDATE professors SET phone = ? WHERE faculty_id = ?',
+                         (f"555-{rng.randrange(10000):04d}", rng.randrange(1, professors)))
+        elif kind == 2:
+            conn.execute('''
+            INSERT INTO professor_sched (faculty_id, day_of_week, start_time, end_time,
+                                         room_location, academic_year, semester_num, course_code)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 'CS101')
+            ''', random_class(rng, professors))
+        elif kind == 3:
+            conn.execute('DELETE FROM professor_sched WHERE schedule_id = ?', (schedule_ids.pop(),))
+        else:
+            first, second = rng.sample(range(1, professors), 2)
+            emails = [conn.execute('SELECT email FROM professors WHERE faculty_id = ?', (faculty_id,)).fetchone()[0]
+                      for faculty_id in (first, second)]
+            for faculty_id, email in ((first, f"swap-{i}@faculty.university.edu"), (second, emails[0]),
+                                      (first, emails[1])):
+                conn.execute('UPDATE professors SET email = ? WHERE faculty_id = ?', (email, faculty_id))
+                conn.commit()
+        conn.commit()
+    database.release_connection(conn)
+
+def benchmark_kiosk_sync(schedules=100000, professors=5000, edit_counts=(10, 100, 1000), seed=8):
+    """Compare copying the whole database file with shipping and applying the day's changes"""
+    rng = random.Random(seed)
+    work_dir = tempfile.mkdtemp(prefix="faculty_sync_")
+    primary = os.path.join(work_dir, "primary.sqlite")
+    replica = os.path.join(work_dir, "replica.sqlite")
+
+    try:
+        database.configure_pool(primary)
+        database.create_database()
+        database.populate_sample_data()
+        populate_large_directory(professors)
+        conn = database.get_connection()
+        conn.executemany('''
+        INSERT INTO professor_sched (faculty_id, day_of_week, start_time, end_time,
+                                     room_location, academic_year, semester_num, course_code)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 'CS101')
+        ''', [random_class(rng, professors) for _ in range(schedules)])
+        conn.commit()
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        database.release_connection(conn)
+        database.close_all_connections()
+        shutil.copy(primary, replica)
+
+        size_mb = os.path.getsize(primary) / 1e6
+        print(f"{schedules} schedules, {professors} professors, {size_mb:.1f} MB database")
+        # Kiosks sync over the network, where the bytes sent matter more than a local copy's time
+        print(f"{'edits':>7}{'file copy (ms)':>16}{'export (ms)':>13}{'apply (ms)':>12}{'rows sent':>11}"
+              f"{'delta (KB)':>12}{'in sync':>9}")
+        for count in edit_counts:
+            database.configure_pool(primary)
+            make_edits(rng, count, professors)
+            conn = database.get_connection()
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            database.release_connection(conn)
+            database.close_all_connections()
+
+            start = time.perf_counter()
+            shutil.copy(primary, os.path.join(work_dir, "copy.sqlite"))
+            copy_ms = (time.perf_counter() - start) * 1e3
+
+            database.configure_pool(replica)
+            since = database.get_sync_seq()
+            database.configure_pool(primary)
+            start = time.perf_counter()
+            delta = database.export_changes(since)
+            export_ms = (time.perf_counter() - start) * 1e3
+            primary_rows = (database.get_all_schedules.uncached(), database.get_all_professors.uncached())
+
+            database.configure_pool(replica)
+            start = time.perf_counter()
+            success, message, changed = database.apply_changes(delta)
+            apply_ms = (time.perf_counter() - start) * 1e3
+            in_sync = success and (database.get_all_schedules.uncached(),
+                                   database.get_all_professors.uncached()) == primary_rows
+            if not success:
+                print(message)
+            database.close_all_connections()
+
+            delta_kb = len(json.dumps(delta)) / 1e3
+            print(f"{count:>7}{copy_ms:>16.1f}{export_ms:>13.1f}{apply_ms:>12.1f}{changed:>11}"
+                  f"{delta_kb:>12.1f}{str(in_sync):>9}")
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    benchmark_kiosk_sync()
@@ -0,0 +1,80 @@
+import os
+import sys
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+from benchmark_search import populate_large_directory
+
+def browse(rng, professors, departments, steps):
+    """Replay kiosk navigation: department lists, department pages, profiles and schedules"""
+    for _ in range(steps):
+        page = rng.random()
+        if page < 0.2:
+            database.get_all_departments()
+        elif page < 0.5:
+            database.get_professors_by_department(rng.choice(departments))
+        elif page < 0.8:
+            database.get_professor_by_id(rng.randint(1, professors))
+        else:
+            database.get_professor_schedule(rng.randint(1, professors))
+
+def benchmark_query_cache(count=5000, steps=5000, seed=11):
+    """Time simulated navigation with and without the query cache and check invalidation"""
+    rng = random.Random(seed)
+    work_dir = tempfile.mkdtemp(prefix="faculty_query_cache_")
+    db_path = os.path.join(work_dir, "faculty_db.sqlite")
+    # Kiosk visitors keep coming back to a few hundred popular professors
+    popular = 300
+
+    try:
+        database.configure_pool(db_path)
+        database.create_database()
+        database.populate_sample_data()
+        populate_large_directory(count)
+        departments = [row['office_name'] for row in database.get_all_faculties()]
+
+        cache_size = database._query_cache.size
+        database._query_cache.size = 0
+        start = time.perf_counter()
+        browse(random.Random(seed), popular, departments, steps)
+        uncached_ms = (time.perf_counter() - start) * 1e3
+
+        database._query_cache.size = cache_size
+        database.configure_pool(db_path)
+        start = time.perf_counter()
+        browse(random.Random(seed), popular, departments, steps)
+        cached_ms = (time.perf_counter() - start) * 1e3
+
+        print(f"{steps} page loads: {uncached_ms:.0f} ms uncached, {cached_ms:.0f} ms cached")
+        print(f"{'function':<32}{'hits':>8}{'misses':>8}")
+        for name, counts in sorted(database.get_query_cache_stats().items()):
+            print(f"{name:<32}{counts['hits']:>8}{counts['misses']:>8}")
+
+        # A write through the app and a write from another process must both be seen
+        before = database.get_professor_by_id(1)
+        database.update_professor(1, before['first_name'], "Cachecheck", before['email'], None,
+                                  before['department_name'], before['subject_id'])
+        local_ok = database.get_professor_by_id(1)['last_name'] == "Cachecheck"
+
+        other = sqlite3.connect(db_path)
+        other.execute("UPDATE professors SET l_name = 'Elsewhere' WHERE faculty_id = 1")
+        other.commit()
+        other.close()
+        external_ok = database.get_professor_by_id(1)['last_name'] == "Elsewhere"
+
+        print(f"\ninvalidated by in-process write: {local_ok}; by another connection: {external_ok}")
+        return local_ok and external_ok
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    if not benchmark_query_cache(count):
+        sys.exit(1)
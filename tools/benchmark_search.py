@@ -0,0 +1,108 @@
+import os
+import sys
+import random
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+
+FIRST_NAMES = ["John", "Emily", "Michael", "Sarah", "David", "Maria", "Jose", "Angela", "Mark", "Kristine",
+               "Paolo", "Andrea", "Miguel", "Patricia", "Carlo", "Bea", "Rafael", "Camille", "Gabriel", "Nicole",
+               "Antonio", "Liza", "Ramon", "Teresa", "Manuel", "Grace", "Eduardo", "Joy", "Fernando", "Rosario",
+               "Vicente", "Cristina", "Alfredo", "Maricel", "Benjamin", "Isabel", "Renato", "Lourdes", "Rodel", "Jasmine"]
+SURNAME_ONSETS = ["b", "c", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "q", "r", "s", "t", "v", "w",
+                  "y", "z", "br", "ch", "cr", "dr", "gr", "pr", "st", "tr", "sh", "th", "bl", "fl", "gl", "pl"]
+SURNAME_VOWELS = ["a", "e", "i", "o", "u", "ai", "ea", "ie", "io", "ou", "au", "y"]
+SURNAME_CODAS = ["", "", "", "n", "r", "s", "l", "m", "t", "z", "ng", "rd", "ck", "ll", "ss", "nd", "rt", "x"]
+SUBJECTS = ["Programming", "Software Design", "Networking", "Hardware", "Systems", "Databases",
+            "Algorithms", "Security", "Graphics", "Machine Learning", "Operating Systems", "Compilers",
+            "Embedded Systems", "Signal Processing", "Robotics", "Web Development", "Data Science",
+            "Computer Vision", "Cloud Computing", "Human-Computer Interaction"]
+
+SEARCH_TERMS = ["john", "smi", "williams", "maria santos", "networking", "dela cruz", "jo", "zzz"]
+FUZZY_TERMS = ["Wiliams", "Jhonson", "Mria Sanots", "Villanuva", "Gabrial"]
+
+# Real surnames mix a few very common names with a long tail of rare ones
+COMMON_SURNAMES = ["Smith", "Johnson", "Williams", "Santos", "Reyes", "Cruz", "Bautista", "Garcia",
+                   "Mendoza", "Dela Cruz", "Villanueva", "Ramos", "Aquino", "Castillo", "Torres", "Flores"]
+
+def make_surname(rng):
+    """Pick a common surname, or build a plausible rare one from two or three syllables"""
+    if rng.random() < 0.2:
+        return rng.choice(COMMON_SURNAMES)
+    syllables = [rng.choice(SURNAME_ONSETS) + rng.choice(SURNAME_VOWELS) + rng.choice(SURNAME_CODAS)
+                 for _ in range(rng.randint(2, 3))]
+    return "".join(syllables).capitalize()
+
+def populate_large_directory(count, seed=42):
+    """Fill the current database with count synthetic professors"""
+    rng = random.Random(seed)
+    conn = database.get_connection()
+    cursor = conn.cursor()
+
+    professors = []
+    used_emails = set()
+    for _ in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = make_surname(rng)
+        # Like real mail systems, only add a number when first.last is taken
+        base = f"{first.lower()}.{last.lower().replace(' ', '')}"
+        email, suffix = f"{base}@faculty.university.edu", 1
+        while email in used_emails:
+            suffix += 1
+            email = f"{base}{suffix}@faculty.university.edu"
+        used_emails.add(email)
+        professors.append((first, last, email, rng.randint(1, 5), rng.choice(SUBJECTS)))
+
+    cursor.executemany('''
+    INSERT INTO professors (f_name, l_name, email, office_id, subject_id)
+    VALUES (?, ?, ?, ?, ?)
+    ''', professors)
+    database.rebuild_fuzzy_index(cursor)
+    conn.commit()
+    database.release_connection(conn)
+
+def time_call(func, iterations):
+    """Return the average latency of func in microseconds"""
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def benchmark_search(count=100000, iterations=200):
+    """Measure search_professors latency on a synthetic directory of count professors"""
+    work_dir = tempfile.mkdtemp(prefix="faculty_search_")
+    db_path = os.path.join(work_dir, "faculty_db.sqlite")
+
+    try:
+        database.configure_pool(db_path)
+        database.create_database()
+        database.populate_sample_data()
+
+        start = time.perf_counter()
+        populate_large_directory(count)
+        print(f"Inserted {count} professors (with index triggers) in {time.perf_counter() - start:.2f}s")
+
+        print(f"{'search term':<20}{'results':>10}{'latency (us)':>15}")
+        for term in SEARCH_TERMS:
+            results = database.search_professors(term)
+            latency = time_call(lambda: database.search_professors(term), iterations)
+            print(f"{term:<20}{len(results):>10}{latency:>15.1f}")
+
+        print(f"\n{'fuzzy term':<20}{'results':>10}{'latency (us)':>15}  best match")
+        for term in FUZZY_TERMS:
+            results = database.search_professors(term, fuzzy=True)
+            latency = time_call(lambda: database.search_professors(term, fuzzy=True), iterations // 10 or 1)
+            best = f"{results[0]['f_name']} {results[0]['l_name']} ({results[0]['similarity']:.2f})" if results else "-"
+            print(f"{term:<20}{len(results):>10}{latency:>15.1f}  {best}")
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    benchmark_search(count)
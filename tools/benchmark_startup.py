@@ -0,0 +1,68 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter inside a scratch copy of the database, so imports
+# and connections are as cold as a real launch
+STARTUP_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+import main
+imported = time.perf_counter()
+window = main.FacultyManagementSystem()
+constructed = time.perf_counter()
+window.show()
+while not window.first_paint_done:
+    app.processEvents()
+painted = time.perf_counter()
+frame = window.get_frame("departmentslistframe")
+while not frame.cards:
+    app.processEvents()
+loaded = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "construct": constructed - imported,
+    "first_paint": painted - start,
+    "first_data": loaded - start,
+    "frames_built": len(window.frames),
+    "frames_total": len(window.frame_classes),
+}))
+main.shutdown_data_worker()
+main.close_all_connections()
+'''
+
+def measure_startup(work_dir):
+    """Launch the app once offscreen and return its startup timings"""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=work_dir, env=env,
+                            capture_output=True, text=True, timeout=300)
+    lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f"Startup run failed:\n{result.stdout}\n{result.stderr}")
+    return json.loads(lines[-1])
+
+def benchmark_startup(runs=5):
+    """Time launches against a copy of the bundled database (the first run warms the OS cache)"""
+    work_dir = tempfile.mkdtemp(prefix="faculty_startup_")
+    try:
+        shutil.copyfile(os.path.join(ROOT, "faculty_db.sqlite"), os.path.join(work_dir, "faculty_db.sqlite"))
+        print(f"{'run':>4}{'import (ms)':>14}{'construct (ms)':>16}{'first paint (ms)':>18}"
+              f"{'first data (ms)':>17}{'frames built':>14}")
+        for run in range(runs):
+            timings = measure_startup(work_dir)
+            print(f"{run + 1:>4}{timings['import'] * 1e3:>14.0f}{timings['construct'] * 1e3:>16.0f}"
+                  f"{timings['first_paint'] * 1e3:>18.0f}{timings['first_data'] * 1e3:>17.0f}"
+                  f"{timings['frames_built']:>8} of {timings['frames_total']}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    benchmark_startup(runs)
@@ -0,0 +1,78 @@
+import os
+import sys
+import random
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path so we can import the ui package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPainter, QColor, QPixmap
+from ui.thumbnails import ThumbnailCache
+
+def make_photos(directory, count, width=3000, height=2000, seed=3):
+    """Write count camera-sized JPEGs to directory and return their paths"""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        image = QImage(width, height, QImage.Format_RGB32)
+        image.fill(QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        painter = QPainter(image)
+        for _ in range(40):
+            painter.fillRect(rng.randrange(width), rng.randrange(height), rng.randrange(50, 800),
+                             rng.randrange(50, 800), QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+        painter.end()
+        path = os.path.join(directory, f"photo_{i}.jpg")
+        image.save(path, "JPEG", 90)
+        paths.append(path)
+    return paths
+
+def load_all(app, cache, paths, size):
+    """Request every thumbnail and wait for all of them; returns (total s, GUI thread s)"""
+    start = time.perf_counter()
+    blocked = 0.0
+    missing = set(paths)
+    while missing:
+        for path in list(missing):
+            call = time.perf_counter()
+            ready = cache.get(path, size) is not None
+            blocked += time.perf_counter() - call
+            if ready:
+                missing.discard(path)
+        app.processEvents()
+        if missing:
+            time.sleep(0.001)
+    return time.perf_counter() - start, blocked
+
+def benchmark_thumbnails(count=40, size=60):
+    """Compare full-size QPixmap decoding with the thumbnail pipeline, cold and warm"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    work_dir = tempfile.mkdtemp(prefix="faculty_thumbnails_")
+    try:
+        paths = make_photos(work_dir, count)
+        thumbnail_dir = os.path.join(work_dir, "thumbnails")
+
+        start = time.perf_counter()
+        for path in paths:
+            QPixmap(path).scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        legacy = time.perf_counter() - start
+
+        cold_total, cold_blocked = load_all(app, ThumbnailCache(thumbnail_dir), paths, size)
+        warm_cache = ThumbnailCache(thumbnail_dir)
+        disk_total, disk_blocked = load_all(app, warm_cache, paths, size)
+        memory_total, memory_blocked = load_all(app, warm_cache, paths, size)
+
+        print(f"{count} photos of 3000x2000 at {size}px ({warm_cache.pool.maxThreadCount()} decoding threads)")
+        print(f"{'path':<34}{'total (ms)':>12}{'GUI thread (ms)':>18}")
+        print(f"{'QPixmap + scaled (before)':<34}{legacy * 1e3:>12.0f}{legacy * 1e3:>18.0f}")
+        print(f"{'scaled decode, cold':<34}{cold_total * 1e3:>12.0f}{cold_blocked * 1e3:>18.1f}")
+        print(f"{'disk cache':<34}{disk_total * 1e3:>12.0f}{disk_blocked * 1e3:>18.1f}")
+        print(f"{'memory cache':<34}{memory_total * 1e3:>12.1f}{memory_blocked * 1e3:>18.2f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    benchmark_thumbnails(count)
@@ -0,0 +1,79 @@
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+
+def check_concurrent_reads(readers=6, duration=3.0, hold_write=0.05):
+    """
+    Run kiosk-style readers while an admin writer keeps write transactions open,
+    and fail if any reader sees "database is locked"
+    """
+    work_dir = tempfile.mkdtemp(prefix="faculty_wal_")
+    db_path = os.path.join(work_dir, "faculty_db.sqlite")
+    source_db = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'faculty_db.sqlite')
+
+    # Work on a copy so the real database is never touched
+    shutil.copyfile(source_db, db_path)
+    database.configure_pool(db_path, size=readers + 1)
+    database.migrate_database()
+
+    stop = threading.Event()
+    errors = []
+    read_counts = [0] * readers
+    write_count = [0]
+
+    def writer():
+        conn = database.get_connection()
+        try:
+            while not stop.is_set():
+                # Hold the write lock for a while, like a slow admin save
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("UPDATE professors SET subject_id = subject_id WHERE faculty_id = 1")
+                time.sleep(hold_write)
+                conn.commit()
+                write_count[0] += 1
+        except Exception as e:
+            errors.append(f"writer: {e}")
+        finally:
+            database.release_connection(conn)
+
+    def reader(index):
+        try:
+            while not stop.is_set():
+                # Bypass the query cache so every read goes to the database
+                database.get_all_professors.uncached()
+                database.get_professor_schedule.uncached(1)
+                read_counts[index] += 1
+        except Exception as e:
+            errors.append(f"reader {index}: {e}")
+
+    threads = [threading.Thread(target=writer)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+
+    try:
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"journal_mode={database.STORAGE_PROFILE['journal_mode']}: "
+          f"{write_count[0]} writes, {sum(read_counts)} reads, {len(errors)} errors")
+    for error in errors:
+        print(f"  {error}")
+
+    return not errors
+
+if __name__ == "__main__":
+    if not check_concurrent_reads():
+        sys.exit(1)
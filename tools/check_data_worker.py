@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt5.QtCore import QCoreApplication
+import database
+from ui.data_worker import DataWorker
+
+def wait_for(app, condition, timeout=10.0):
+    """Process Qt events until condition() holds or timeout seconds pass"""
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    return condition()
+
+def check_data_worker(searches=50):
+    """
+    Fire a burst of searches on one channel and check that only the newest
+    result is delivered, that cancel() suppresses a result and that errors arrive
+    """
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    work_dir = tempfile.mkdtemp(prefix="faculty_worker_")
+    db_path = os.path.join(work_dir, "faculty_db.sqlite")
+    worker = DataWorker()
+
+    try:
+        database.configure_pool(db_path)
+        database.create_database()
+        database.populate_sample_data()
+
+        delivered = []
+        terms = ["j", "jo", "joh", "john", "john s", "smith"] * (searches // 6 + 1)
+        for term in terms[:searches]:
+            worker.submit("search", database.search_professors, term,
+                          on_result=lambda rows, term=term: delivered.append(term))
+        last_term = terms[searches - 1]
+        wait_for(app, lambda: delivered)
+        # Give superseded results a chance to (wrongly) arrive
+        wait_for(app, lambda: False, 0.2)
+        coalesced = delivered == [last_term]
+        print(f"{searches} searches submitted, delivered: {delivered}")
+
+        cancelled = []
+        worker.submit("slow", time.sleep, 0.1, on_result=cancelled.append)
+        worker.cancel("slow")
+        wait_for(app, lambda: False, 0.3)
+        print(f"cancelled request delivered: {bool(cancelled)}")
+
+        errors = []
+        worker.submit("broken", database.get_professor_by_id, on_error=errors.append)
+        wait_for(app, lambda: errors)
+        print(f"error delivered: {errors}")
+
+        return coalesced and not cancelled and bool(errors)
+    finally:
+        worker.shutdown()
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    if not check_data_worker():
+        sys.exit(1)
@@ -0,0 +1,116 @@
+import os
+import re
+import sys
+import shutil
+import tempfile
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+
+# Public functions to check, as (name, call, tables allowed to be scanned).
+# Only functions that return whole tables may scan, and only their driving table.
+PUBLIC_QUERIES = [
+    ("get_all_professors", lambda: database.get_all_professors(), {"p"}),
+    ("get_professor_by_id", lambda: database.get_professor_by_id(1), set()),
+    ("get_professor_schedule", lambda: database.get_professor_schedule(1), set()),
+    ("search_professors", lambda: database.search_professors("john"), set()),
+    ("search_professors (full name)", lambda: database.search_professors("john smith"), set()),
+    ("filter_professors_by_faculty", lambda: database.filter_professors_by_faculty("Computer Engineering"), set()),
+    ("filter_professors_by_course", lambda: database.filter_professors_by_course("Database Systems"), set()),
+    ("get_all_faculties", lambda: database.get_all_faculties(), {"faculty"}),
+    ("get_all_courses", lambda: database.get_all_courses(), {"courses"}),
+    ("get_all_departments", lambda: database.get_all_departments(), {"f"}),
+    ("get_professors_by_department", lambda: database.get_professors_by_department("Computer Engineering"), set()),
+    ("get_all_schedules", lambda: database.get_all_schedules(), {"s"}),
+    # Later pages start at their cursor in an index instead of scanning
+    ("get_professors_page", lambda: database.get_professors_page(("Johnson", "Emily", 2), 2), set()),
+    ("get_courses_page", lambda: database.get_courses_page(("CS201",), 2), set()),
+    ("get_course_by_code", lambda: database.get_course_by_code("CS101"), set()),
+    ("get_department_by_id", lambda: database.get_department_by_id(1), set()),
+    ("get_schedule_by_id", lambda: database.get_schedule_by_id(1), set()),
+    ("get_schedules_page",
+     lambda: database.get_schedules_page(("Johnson", "Emily", 2, 0, 0, 0), 2), set()),
+    # The summary table, per-department counts and professors without schedules are whole-table by nature
+    ("get_dashboard_stats", lambda: database.get_dashboard_stats(), {"dashboard_counts", "f", "p"}),
+    ("get_all_admin_users", lambda: database.get_all_admin_users(), {"admin_users"}),
+    ("authenticate_admin", lambda: database.authenticate_admin("admin", "wrong-password"), set()),
+    # The conflict engine loads every schedule into memory once, then checks without SQL
+    ("add_schedule (conflict check)",
+     lambda: database.add_schedule(1, "Monday", "08:30", "09:30", "Room 101", "2023-2024", "1st", "CS101"),
+     {"professor_sched"}),
+    ("update_schedule (conflict check)",
+     lambda: database.update_schedule(2, 1, "Monday", "08:30", "09:30", "Room 101", "2023-2024", "1st", "CS101"),
+     {"professor_sched"}),
+    ("add_schedule_item (conflict check)",
+     lambda: database.add_schedule_item(1, "Monday", "08:30", "09:30", "Room 101", "2023-2024", "1st", "CS101"),
+     {"professor_sched"}),
+    ("update_schedule_item (conflict check)",
+     lambda: database.update_schedule_item(2, 1, "Monday", "08:30", "09:30", "Room 101", "2023-2024", "1st", "CS101"),
+     {"professor_sched"}),
+    ("add_department (name check)", lambda: database.add_department("Computer Engineering", 1, 101), set()),
+    ("delete_course", lambda: database.delete_course("CS999"), set()),
+]
+
+SCAN_PATTERN = re.compile(r"^SCAN (\w+)")
+
+# A full-text MATCH shows up as a virtual table "scan" with an M constraint
+FTS_MATCH_PATTERN = re.compile(r"VIRTUAL TABLE INDEX \d+:\w*M")
+
+# Statements FTS5 runs on its own shadow tables (quoted schema name)
+SHADOW_TABLE_PATTERN = re.compile(r"FROM '\w+'\.'")
+
+def plan_scans(conn, sql):
+    """Return the tables a statement scans according to EXPLAIN QUERY PLAN"""
+    scans = []
+    for row in conn.execute("EXPLAIN QUERY PLAN " + sql):
+        match = SCAN_PATTERN.match(row[3])
+        if match and not row[3].startswith("SCAN CONSTANT ROW") and not FTS_MATCH_PATTERN.search(row[3]):
+            scans.append((match.group(1), row[3]))
+    return scans
+
+def check_query_plans(verbose=False):
+    """
+    Run every public query against a copy of the database, capture the SQL it
+    executes and fail if any SELECT regresses to a scan it is not allowed
+    """
+    work_dir = tempfile.mkdtemp(prefix="faculty_plans_")
+    db_path = os.path.join(work_dir, "faculty_db.sqlite")
+    source_db = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'faculty_db.sqlite')
+    shutil.copyfile(source_db, db_path)
+
+    statements = []
+    database.configure_pool(db_path, on_connect=lambda conn: conn.set_trace_callback(statements.append))
+    failures = []
+
+    try:
+        database.migrate_database()
+        conn = database.get_connection()
+        conn.set_trace_callback(None)
+
+        for name, call, allowed_scans in PUBLIC_QUERIES:
+            statements.clear()
+            call()
+            for sql in list(statements):
+                if not sql.lstrip().upper().startswith("SELECT") or SHADOW_TABLE_PATTERN.search(sql):
+                    continue
+                for table, detail in plan_scans(conn, sql):
+                    if table not in allowed_scans:
+                        failures.append((name, detail, " ".join(sql.split())))
+                    elif verbose:
+                        print(f"{name}: allowed {detail}")
+
+        database.release_connection(conn)
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for name, detail, sql in failures:
+        print(f"FAIL {name}: {detail}\n    {sql}")
+    print(f"{len(PUBLIC_QUERIES)} public queries checked, {len(failures)} unexpected scans")
+
+    return not failures
+
+if __name__ == "__main__":
+    if not check_query_plans(verbose="-v" in sys.argv):
+        sys.exit(1)
@@ -0,0 +1,78 @@
+import os
+import sys
+import shutil
+import tempfile
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+from autocomplete import Autocomplete
+
+def course_teachers(course_code):
+    """The ids of the professors with a class of course_code, read directly"""
+    conn = database.get_connection()
+    ids = {row[0] for row in conn.execute(
+        'SELECT DISTINCT faculty_id FROM professor_sched WHERE course_code = ?', (course_code,))}
+    database.release_connection(conn)
+    return ids
+
+def misspellings(name):
+    """A few one-letter slips of name: a letter left out, one typed twice, the last one dropped"""
+    return [name[:2] + name[3:], name[:-1] + name[-2:], name[:-1]]
+
+def check_search_suggestions():
+    """
+    Pick every course suggestion the search box offers, by name and by typed
+    code, and fail unless the search lists exactly the professors teaching it.
+    Also fail if a typed name with a typo does not find its professor.
+    """
+    work_dir = tempfile.mkdtemp(prefix="faculty_suggest_")
+    failures = []
+    checked = 0
+
+    try:
+        database.configure_pool(os.path.join(work_dir, "faculty_db.sqlite"))
+        database.create_database()
+        database.populate_sample_data()
+
+        service = Autocomplete()
+        service.load()
+
+        for course in database.get_all_courses():
+            expected = course_teachers(course['course_code'])
+            suggestions = service.suggest(course['course_code'])
+            if ('course', course['course_name']) not in suggestions:
+                failures.append(f"{course['course_code']}: not suggested, got {suggestions}")
+                continue
+
+            searches = [(course['course_name'], 'course'), (course['course_code'], None),
+                        (course['course_code'].lower(), None)]
+            for term, kind in searches:
+                found = {row['faculty_id'] for row in database.search_directory(term, kind)}
+                checked += 1
+                if found != expected:
+                    failures.append(f"{term!r} ({kind}): found {sorted(found)}, expected {sorted(expected)}")
+
+        if not any(course_teachers(course['course_code']) for course in database.get_all_courses()):
+            failures.append("sample data has no scheduled courses to search for")
+
+        for professor in database.get_all_professors():
+            for typo in misspellings(professor['last_name']):
+                term = f"{professor['first_name']} {typo}"
+                found = [row['faculty_id'] for row in database.search_directory(term)]
+                checked += 1
+                if professor['faculty_id'] not in found:
+                    failures.append(f"{term!r}: {professor['first_name']} {professor['last_name']} not found")
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print(f"{checked} searches checked, {len(failures)} failures")
+
+    return not failures
+
+if __name__ == "__main__":
+    if not check_search_suggestions():
+        sys.exit(1)
@@ -0,0 +1,68 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+
+def load_rows(path, file_format=None):
+    """Read schedule rows from a CSV file with a header row, or a JSON list of objects"""
+    file_format = file_format or os.path.splitext(path)[1].lstrip('.').lower()
+    if file_format == 'csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            return list(csv.DictReader(f))
+    if file_format == 'json':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        # Accept a bare list or {"schedules": [...]}
+        return data['schedules'] if isinstance(data, dict) else data
+    raise ValueError(f"Unknown file format '{file_format}'; use .csv or .json")
+
+def main(argv=None):
+    """Import schedules from a CSV or JSON file in one transaction"""
+    default_db = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), database.DB_PATH)
+
+    parser = argparse.ArgumentParser(
+        description="Bulk import professor schedules. Columns: " + ", ".join(database.SCHEDULE_IMPORT_FIELDS))
+    parser.add_argument("file", help="CSV (with a header row) or JSON file of schedules")
+    parser.add_argument("--format", choices=["csv", "json"], help="file format (default: from the extension)")
+    parser.add_argument("--db", default=default_db, help="database file (default: the app database)")
+    parser.add_argument("--dry-run", action="store_true", help="validate everything but import nothing")
+    parser.add_argument("--report", help="write the per-row error report to this JSON file")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Database not found: {args.db}", file=sys.stderr)
+        return 2
+
+    try:
+        rows = load_rows(args.file, args.format)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Could not read {args.file}: {e}", file=sys.stderr)
+        return 2
+
+    database.configure_pool(args.db)
+    try:
+        database.migrate_database()
+        start = time.perf_counter()
+        success, message, row_errors = database.import_schedules(rows, dry_run=args.dry_run)
+        elapsed = time.perf_counter() - start
+    finally:
+        database.close_all_connections()
+
+    for error in row_errors:
+        print(f"row {error['row']}: {error['error']}")
+    print(f"{message} ({elapsed:.2f}s)")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({'success': success, 'message': message, 'rows': len(rows), 'errors': row_errors}, f, indent=2)
+
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,65 +1,221 @@
 import os
-import sqlite3
-import random
-import shutil
+import re
 import sys
+import json
+import time
+import argparse
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 
 # Add parent directory to path so we can import from database.py
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+import database
 from database import ensure_photos_directory_exists
 
-def populate_sample_photos():
+# Square sizes every photo is stored at; photo_url points at the first
+PHOTO_SIZES = (512, 128)
+PHOTO_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp', '.tif', '.tiff'}
+
+# Progress of every processed file, so an interrupted run can resume
+MANIFEST_NAME = '.ingest_manifest.jsonl'
+
+def match_key(text):
+    """Lower-case text, strip accents and reduce it to words joined by '_'"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return '_'.join(re.findall(r'[a-z0-9]+', text.casefold()))
+
+def professor_keys(cursor):
+    """
+    Map every file name a professor's photo may have to their faculty_id:
+    the id, first_last, last_first and the email's local part. Names shared
+    by several professors map to None, as they cannot be told apart.
+    """
+    keys = {}
+    cursor.execute('SELECT faculty_id, f_name, l_name, email FROM professors')
+    for faculty_id, f_name, l_name, email in cursor.fetchall():
+        candidates = {str(faculty_id), match_key(f"{f_name} {l_name}"), match_key(f"{l_name} {f_name}")}
+        if email:
+            candidates.add(match_key(email.split('@')[0]))
+        for key in candidates:
+            if key:
+                keys[key] = faculty_id if keys.get(key, faculty_id) == faculty_id else None
+    return keys
+
+def find_photos(source_dir):
+    """Yield (path relative to source_dir, size, mtime_ns) of every image below source_dir"""
+    for directory, _, filenames in os.walk(source_dir):
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in PHOTO_EXTENSIONS:
+                path = os.path.join(directory, filename)
+                stat = os.stat(path)
+                yield os.path.relpath(path, source_dir), stat.st_size, stat.st_mtime_ns
+
+def photo_file(digest, size):
+    """File name of a stored photo; the full size keeps the plain name"""
+    return f"{digest}.jpg" if size == PHOTO_SIZES[0] else f"{digest}-{size}.jpg"
+
+def process_photo(job):
     """
-    Download sample profile photos and update the database with their paths
-    This uses placeholder images that are locally stored
+    Hash one photo and store it at every PHOTO_SIZES size (runs in a worker
+    process). Returns (relative path, digest or None, error or None).
+    """
+    from PyQt5.QtGui import QImageReader
+    from ui.thumbnails import decode_thumbnail, file_digest
+
+    source_dir, relative_path, photos_dir = job
+    path = os.path.join(source_dir, relative_path)
+    try:
+        digest = file_digest(path)
+        # Files with the same contents are stored once, whichever worker gets there first
+        if all(os.path.exists(os.path.join(photos_dir, photo_file(digest, size))) for size in PHOTO_SIZES):
+            return relative_path, digest, None
+
+        original = QImageReader(path).size()
+        if not original.isValid():
+            return relative_path, None, "not a readable image"
+        for size in PHOTO_SIZES:
+            # Never enlarge a small photo
+            image = decode_thumbnail(path, min(size, original.width(), original.height()))
+            if image is None:
+                return relative_path, None, "could not be decoded"
+            target = os.path.join(photos_dir, photo_file(digest, size))
+            temp_path = f"{target}.{os.getpid()}.tmp"
+            if not image.save(temp_path, "JPEG", 88):
+                return relative_path, None, "could not be saved"
+            os.replace(temp_path, target)
+        return relative_path, digest, None
+    except OSError as e:
+        return relative_path, None, str(e)
+
+def load_manifest(path):
+    """Read the {relative path: (size, mtime_ns, digest)} entries of earlier runs"""
+    entries = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short by an interrupted run
+                    continue
+                entries[entry['path']] = (entry['size'], entry['mtime_ns'], entry['digest'])
+    return entries
+
+def report_progress(done, total, started):
+    rate = done / max(time.perf_counter() - started, 1e-9)
+    print(f"\rProcessed {done}/{total} photos ({done * 100 // max(total, 1)}%, {rate:.0f}/s)",
+          end='' if done < total else '\n', file=sys.stderr, flush=True)
+
+def populate_sample_photos(source_dir, db_path=None, workers=None, resume=False, dry_run=False):
     """
-    # Ensure photos directory exists
+    Ingest the photos of a drop folder: match each file to a professor by name,
+    email or id, store it cropped and resized under assets/photos (once per
+    distinct content) and point the professors' photo_url at it in one transaction
+    """
+    if db_path is not None:
+        database.configure_pool(db_path)
     photos_dir = ensure_photos_directory_exists()
-    
-    # Create connection to database - use the correct path relative to script location
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'faculty_db.sqlite')
-    conn = sqlite3.connect(db_path)
+    manifest_path = os.path.join(photos_dir, MANIFEST_NAME)
+
+    conn = database.get_connection()
     cursor = conn.cursor()
-    
     try:
-        # Get all professors
-        cursor.execute('SELECT faculty_id, f_name, l_name FROM professors')
-        professors = cursor.fetchall()
-        
-        # Create placeholder images (in a real app, you might download from an API)
-        for faculty_id, f_name, l_name in professors:
-            # Create a filename based on faculty name
-            filename = f"{f_name.lower()}_{l_name.lower()}.jpg"
-            photo_path = os.path.join(photos_dir, filename)
-            
-            # In a real app, you would download actual photos
-            # Here we create colored placeholder images
-            # This is just a simulation - in a real application you'd download actual photos
-            
-            # Generate a path relative to the application root
-            relative_path = os.path.join("assets", "photos", filename)
-            
-            # Update the database with the photo path
-            cursor.execute(
-                'UPDATE professors SET photo_url = ? WHERE faculty_id = ?',
-                (relative_path, faculty_id)
-            )
-            
-            print(f"Updated photo path for {f_name} {l_name}")
-        
+        keys = professor_keys(cursor)
+
+        matches = {}
+        unmatched = []
+        ambiguous = []
+        files = list(find_photos(source_dir))
+        for relative_path, size, mtime_ns in files:
+            key = match_key(os.path.splitext(os.path.basename(relative_path))[0])
+            if key not in keys:
+                unmatched.append(relative_path)
+            elif keys[key] is None:
+                ambiguous.append(relative_path)
+            else:
+                matches[relative_path] = (keys[key], size, mtime_ns)
+
+        # With resume, files processed by an earlier run and unchanged since are skipped
+        previous = load_manifest(manifest_path) if resume else {}
+        digests = {}
+        todo = []
+        for relative_path, (faculty_id, size, mtime_ns) in matches.items():
+            entry = previous.get(relative_path)
+            if entry and entry[:2] == (size, mtime_ns):
+                digests[relative_path] = entry[2]
+            else:
+                todo.append(relative_path)
+
+        print(f"{len(files)} photos found: {len(matches)} matched, {len(unmatched)} unmatched, "
+              f"{len(ambiguous)} ambiguous; {len(matches) - len(todo)} already processed")
+
+        errors = []
+        if todo and not dry_run:
+            started = time.perf_counter()
+            jobs = [(source_dir, relative_path, photos_dir) for relative_path in todo]
+            with open(manifest_path, 'a' if resume else 'w', encoding='utf-8') as manifest, \
+                    ProcessPoolExecutor(max_workers=workers) as executor:
+                chunksize = max(1, min(64, len(jobs) // ((workers or os.cpu_count() or 1) * 8)))
+                for done, (relative_path, digest, error) in enumerate(
+                        executor.map(process_photo, jobs, chunksize=chunksize), 1):
+                    if error:
+                        errors.append((relative_path, error))
+                    else:
+                        digests[relative_path] = digest
+                        faculty_id, size, mtime_ns = matches[relative_path]
+                        manifest.write(json.dumps({'path': relative_path, 'size': size,
+                                                   'mtime_ns': mtime_ns, 'digest': digest}) + '\n')
+                    if done % 100 == 0 or done == len(jobs):
+                        manifest.flush()
+                        report_progress(done, len(jobs), started)
+
+        for relative_path, error in errors:
+            print(f"Skipped {relative_path}: {error}")
+
+        # Several files for one professor: the last in folder order wins
+        updates = {}
+        for relative_path in sorted(digests):
+            faculty_id = matches[relative_path][0]
+            updates[faculty_id] = os.path.join("assets", "photos", photo_file(digests[relative_path], PHOTO_SIZES[0]))
+
+        if dry_run:
+            print(f"Dry run: {len(matches)} professors would be updated")
+            return True
+
+        cursor.execute('BEGIN')
+        cursor.executemany('UPDATE professors SET photo_url = ? WHERE faculty_id = ?',
+                           [(photo_url, faculty_id) for faculty_id, photo_url in updates.items()])
         conn.commit()
-        print("Sample photos have been populated and database updated.")
-        
+        print(f"Updated photo_url of {len(updates)} professors from "
+              f"{len(set(digests.values()))} distinct photos")
+        return not errors
     except Exception as e:
         print(f"Error populating photos: {e}")
         conn.rollback()
+        return False
     finally:
-        conn.close()
+        database.release_connection(conn)
 
-if __name__ == "__main__":
-    # Create tools directory if it doesn't exist
-    if not os.path.exists(os.path.dirname(os.path.abspath(__file__))):
-        os.makedirs(os.path.dirname(os.path.abspath(__file__)))
-    
+def main():
+    parser = argparse.ArgumentParser(description="Ingest professor photos from a drop folder")
+    parser.add_argument("source", help="folder of photos named after professors "
+                                       "(first_last, last_first, email name or faculty id)")
+    parser.add_argument("--db", default=os.path.join(ROOT, 'faculty_db.sqlite'), help="database file")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip photos an earlier run already processed and that have not changed")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be matched")
+    args = parser.parse_args()
+
+    # Stored paths are relative to the application root, like the app expects
+    os.chdir(ROOT)
+    source = os.path.abspath(args.source)
     print("Populating sample photos...")
-    populate_sample_photos() 
\ No newline at end of file
+    ok = populate_sample_photos(source, os.path.abspath(args.db), args.workers, args.resume, args.dry_run)
+    database.close_all_connections()
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+# Add parent directory to path so we can import from database.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+
+def open_database(path):
+    """Point the shared pool at path and bring it up to the current schema"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Database not found: {path}")
+    database.configure_pool(path)
+    database.migrate_database()
+
+def export_delta(primary, since):
+    """Read the changes after change `since` from the primary database"""
+    open_database(primary)
+    try:
+        return database.export_changes(since)
+    finally:
+        database.close_all_connections()
+
+def replica_seq(replica):
+    """The last primary change a replica has applied"""
+    open_database(replica)
+    try:
+        return database.get_sync_seq()
+    finally:
+        database.close_all_connections()
+
+def acknowledge(primary, name, seq):
+    """Record on the primary that kiosk name has its changes up to seq; returns (success, message)"""
+    open_database(primary)
+    try:
+        return database.acknowledge_replica(name, seq)
+    finally:
+        database.close_all_connections()
+
+def apply_delta(replica, delta):
+    """Apply a delta to a replica database; returns (success, message, rows changed)"""
+    open_database(replica)
+    try:
+        return database.apply_changes(delta)
+    finally:
+        database.close_all_connections()
+
+def main(argv=None):
+    """Ship a kiosk only the rows changed since it last synced, instead of the whole file"""
+    parser = argparse.ArgumentParser(
+        description="Incremental kiosk sync. A replica starts as a copy of the primary "
+                    "database file; afterwards only changed rows are sent.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync = commands.add_parser("sync", help="bring a replica up to date from a primary it can reach")
+    sync.add_argument("primary", help="primary database file")
+    sync.add_argument("replica", help="kiosk database file")
+    sync.add_argument("--name", help="kiosk name the primary knows the replica by (default: its file name)")
+
+    export = commands.add_parser("export", help="write the changes since a replica's seq to a JSON delta")
+    export.add_argument("--db", required=True, help="primary database file")
+    export.add_argument("--since", type=int, required=True,
+                        help="last change the replica has (see the status command)")
+    export.add_argument("-o", "--output", help="delta file (default: standard output)")
+    export.add_argument("--name", help="kiosk the delta is for; records that it has the changes up to --since")
+
+    apply = commands.add_parser("apply", help="apply a JSON delta to a replica")
+    apply.add_argument("delta", help="delta file written by export")
+    apply.add_argument("--db", required=True, help="kiosk database file")
+
+    status = commands.add_parser("status", help="print the last primary change a replica has applied")
+    status.add_argument("--db", required=True, help="kiosk database file")
+
+    kiosks = commands.add_parser("kiosks", help="list the kiosks a primary knows and how far each has synced")
+    kiosks.add_argument("--db", required=True, help="primary database file")
+
+    forget = commands.add_parser("forget", help="stop keeping changes for a retired kiosk")
+    forget.add_argument("name", help="kiosk name")
+    forget.add_argument("--db", required=True, help="primary database file")
+
+    prune = commands.add_parser("prune", help="delete the change log entries every known kiosk has applied "
+                                              "(a kiosk is known once it has synced or exported with --name)")
+    prune.add_argument("--db", required=True, help="primary database file")
+    prune.add_argument("--max-entries", type=int,
+                       help="also drop entries beyond this many; kiosks further behind must be copied again")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "status":
+            print(replica_seq(args.db))
+            return 0
+
+        if args.command == "kiosks":
+            open_database(args.db)
+            try:
+                for kiosk in database.get_replicas():
+                    print(f"{kiosk['replica']}\tchange {kiosk['last_seq']}\tsynced {kiosk['synced_at']}")
+            finally:
+                database.close_all_connections()
+            return 0
+
+        if args.command in ("forget", "prune"):
+            open_database(args.db)
+            try:
+                if args.command == "forget":
+                    success, message = database.forget_replica(args.name)
+                else:
+                    success, message, deleted = database.prune_change_log(args.max_entries)
+            finally:
+                database.close_all_connections()
+            print(message)
+            return 0 if success else 1
+
+        if args.command == "export":
+            delta = export_delta(args.db, args.since)
+            if args.name:
+                acknowledge(args.db, args.name, args.since)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    json.dump(delta, f)
+            else:
+                json.dump(delta, sys.stdout)
+                print()
+            print(f"Exported {len(delta['changes'])} changed rows "
+                  f"(changes {delta['since'] + 1} to {delta['last_seq']})", file=sys.stderr)
+            return 0
+
+        if args.command == "apply":
+            with open(args.delta, encoding="utf-8") as f:
+                delta = json.load(f)
+        else:
+            delta = export_delta(args.primary, replica_seq(args.replica))
+            args.db = args.replica
+
+        start = time.perf_counter()
+        success, message, changed = apply_delta(args.db, delta)
+        print(f"{message} ({(time.perf_counter() - start) * 1e3:.1f} ms)")
+        if success and args.command == "sync":
+            name = args.name or os.path.basename(args.replica)
+            print(acknowledge(args.primary, name, delta['last_seq'])[1])
+        return 0 if success else 1
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Sync failed: {e}", file=sys.stderr)
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
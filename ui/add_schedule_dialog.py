@@ -9,6 +9,8 @@ from database import (add_schedule, get_all_professors, get_all_courses)
 class AddScheduleDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
+        # The added schedule row, once accepted
+        self.schedule = None
         self.setWindowTitle("Add Schedule")
         self.setFixedWidth(500)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
@@ -185,12 +187,14 @@ class AddScheduleDialog(QDialog):
                 return
             
             # Add schedule to database
-            success, message = add_schedule(
+            success, message, schedule = add_schedule(
                 faculty_id, day_of_week, start_time, end_time,
                 room_location, academic_year, semester_num, course_code
             )
             
             if success:
+                # Lets the schedule table insert just this row
+                self.schedule = schedule
                 self.accept()  # Close dialog with success
             else:
                 QMessageBox.warning(self, "Error", message)
@@ -2,7 +2,12 @@ from PyQt5.QtWidgets import (QWidget, QLabel, QFrame, QVBoxLayout, QHBoxLayout,
                            QScrollArea, QGridLayout, QPushButton, QSizePolicy, QMessageBox)
 from PyQt5.QtCore import Qt, pyqtSignal, QSize
 from PyQt5.QtGui import QFont, QCursor
-from database import get_all_professors, get_all_departments, get_all_faculties, get_all_courses, get_all_schedules
+from database import get_dashboard_stats, take_snapshot
+from ui.data_worker import get_data_worker
+from ui.change_bus import get_change_bus
+
+# Departments listed in the dashboard's breakdown line
+TOP_DEPARTMENTS_SHOWN = 3
 
 class StatCard(QFrame):
     def __init__(self, title, parent=None):
@@ -29,6 +34,9 @@ class StatCard(QFrame):
         self.count_label.setText(str(value))
 
 class AdminDashboardFrame(QWidget):
+    # Backup progress in pages (copied, total), emitted from the data worker's thread
+    backup_progress = pyqtSignal(int, int)
+    
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -101,6 +109,13 @@ class AdminDashboardFrame(QWidget):
         self.schedule_card = StatCard("Schedules")
         stats_layout.addWidget(self.schedule_card, 0, 3)
         
+        # Breakdown of the counts below the cards
+        self.details_label = QLabel("")
+        self.details_label.setFont(QFont("Arial", 11))
+        self.details_label.setStyleSheet("color: black;")
+        self.details_label.setWordWrap(True)
+        stats_layout.addWidget(self.details_label, 1, 0, 1, 4)
+        
         # Add stats container to main layout
         main_layout.addWidget(stats_container)
         
@@ -199,11 +214,45 @@ class AdminDashboardFrame(QWidget):
         """)
         buttons_layout.addWidget(schedule_btn, 1, 1)
         
+        # Online backup into a verified snapshot, run in the background
+        self.backup_btn = QPushButton("Back Up Database")
+        self.backup_btn.setFont(QFont("Arial", 12))
+        self.backup_btn.setMinimumHeight(60)
+        self.backup_btn.clicked.connect(self.backup_database)
+        self.backup_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #333333;
+                color: white;
+                border-radius: 8px;
+                padding: 10px;
+                border: 2px solid #FFDD00;
+            }
+            QPushButton:hover {
+                background-color: #555555;
+                border: 2px solid white;
+            }
+            QPushButton:disabled {
+                background-color: #AAAAAA;
+                color: #DDDDDD;
+            }
+        """)
+        buttons_layout.addWidget(self.backup_btn, 2, 0)
+        
+        self.backup_label = QLabel("")
+        self.backup_label.setFont(QFont("Arial", 11))
+        self.backup_label.setWordWrap(True)
+        buttons_layout.addWidget(self.backup_label, 2, 1)
+        self.backup_progress.connect(self.show_backup_progress)
+        
         # Add buttons container to sections layout
         sections_layout.addWidget(buttons_container)
         
         # Add sections container to main layout
         main_layout.addWidget(sections_container)
+        
+        # Counts are read again when the data changes, or on the next show while hidden
+        self.stale = True
+        get_change_bus().changed.connect(self.on_data_changed)
     
     def set_admin_info(self, admin_info):
         """Set admin information and update the welcome message"""
@@ -214,18 +263,41 @@ class AdminDashboardFrame(QWidget):
         self.refresh_dashboard()
     
     def refresh_dashboard(self):
-        """Refresh dashboard statistics"""
-        # Get counts from database
-        professors = get_all_professors()
-        departments = get_all_departments()
-        courses = get_all_courses()
-        schedules = get_all_schedules()
+        """Refresh dashboard statistics (counted in the background)"""
+        self.stale = False
+        get_data_worker().submit("admin_dashboard", get_dashboard_stats, on_result=self.show_counts)
+    
+    def show_counts(self, stats):
+        """Update the statistic cards from a get_dashboard_stats result"""
+        self.faculty_card.update_count(stats['professors'])
+        self.dept_card.update_count(stats['departments'])
+        self.course_card.update_count(stats['courses'])
+        self.schedule_card.update_count(stats['schedules'])
         
-        # Update statistics
-        self.faculty_card.update_count(len(professors))
-        self.dept_card.update_count(len(departments))
-        self.course_card.update_count(len(courses))
-        self.schedule_card.update_count(len(schedules))
+        semesters = ", ".join(f"{semester}: {count}" for semester, count in stats['schedules_by_semester'].items())
+        departments = ", ".join(f"{name} ({count})"
+                                for name, count in stats['faculty_by_department'][:TOP_DEPARTMENTS_SHOWN])
+        self.details_label.setText(
+            f"Schedules by semester: {semesters}\n"
+            f"Largest departments: {departments or 'none'}\n"
+            f"Faculty without a schedule: {stats['unscheduled_faculty']}")
+    
+    def backup_database(self):
+        """Take a verified snapshot of the database without holding up the screen"""
+        self.backup_btn.setEnabled(False)
+        self.backup_label.setText("Backing up...")
+        get_data_worker().submit("backup", take_snapshot, progress=self.backup_progress.emit,
+                                 on_result=self.show_backup_result,
+                                 on_error=lambda message: self.show_backup_result((False, message, None)))
+    
+    def show_backup_progress(self, copied, total):
+        self.backup_label.setText(f"Backing up... {copied * 100 // max(total, 1)}%")
+    
+    def show_backup_result(self, result):
+        success, message, path = result
+        self.backup_btn.setEnabled(True)
+        self.backup_label.setText(message)
+        self.backup_label.setStyleSheet("color: black;" if success else "color: red;")
     
     def show_faculty_management(self):
         """Show faculty management screen"""
@@ -251,6 +323,14 @@ class AdminDashboardFrame(QWidget):
         if reply == QMessageBox.Yes:
             self.controller.logout()
             
+    def on_data_changed(self, changes):
+        """Most changes move some count"""
+        if self.isVisible():
+            self.refresh_dashboard()
+        else:
+            self.stale = True
+    
     def on_show(self):
-        """Called when frame is shown - refresh data"""
-        self.refresh_dashboard() 
\ No newline at end of file
+        """Called when frame is shown - refresh data if it changed"""
+        if self.stale:
+            self.refresh_dashboard()
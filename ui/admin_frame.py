@@ -4,6 +4,7 @@ from PyQt5.QtWidgets import (QWidget, QLabel, QFrame, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
 from database import add_professor, get_all_faculties
+from ui.change_bus import get_change_bus
 
 class AdminFrame(QWidget):
     def __init__(self, parent, controller):
@@ -55,7 +56,8 @@ class AdminFrame(QWidget):
         self.office_combo = QComboBox()
         self.office_combo.setMinimumWidth(300)
         form_layout.addWidget(self.office_combo, 3, 1)
-        self.load_faculties()
+        # Filled by load_faculties when the frame is shown
+        self.faculty_map = {}
 
         # Subject/Specialization
         subject_label = QLabel("Subject/Specialization:")
@@ -93,8 +95,21 @@ class AdminFrame(QWidget):
         # Add some space at the bottom
         main_layout.addStretch(1)
 
+        # Offices are loaded on first show and again after departments change
+        self.stale = True
+        get_change_bus().changed.connect(self.on_data_changed)
+
+    def on_data_changed(self, changes):
+        if changes.touches('department'):
+            self.stale = True
+
+    def on_show(self):
+        if self.stale:
+            self.load_faculties()
+
     def load_faculties(self):
         """Load faculty offices into the combobox"""
+        self.stale = False
         try:
             faculties = get_all_faculties()
             self.faculty_map = {f["office_name"]: f["office_id"] for f in faculties}
@@ -126,8 +141,12 @@ class AdminFrame(QWidget):
             QMessageBox.critical(self, "Input Error", "Selected Faculty/Office is invalid.")
             return
 
-        # Call database function
-        success, message = add_professor(f_name, l_name, email, office_id, subject_id)
+        # Call database function (it raises ValueError when the professor cannot be added)
+        try:
+            professor = add_professor(f_name, l_name, email, None, office_name, subject_id)
+            success, message = True, f"Professor {professor['first_name']} {professor['last_name']} added"
+        except ValueError as e:
+            success, message = False, str(e)
 
         if success:
             QMessageBox.information(self, "Success", message)
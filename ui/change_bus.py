@@ -0,0 +1,108 @@
+import traceback
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+import database
+
+# Milliseconds between checks for commits made by other processes (other kiosks)
+EXTERNAL_POLL_MS = 2000
+
+# More changes to one entity than this in a batch reload a table rather than patch it
+MAX_PATCHED_CHANGES = 200
+
+class ChangeBatch:
+    """
+    The database changes announced during one pass of the event loop, as
+    (entity, entity_id, operation) events in commit order
+    """
+
+    def __init__(self, events):
+        self.events = events
+
+    def touches(self, *entities):
+        """Whether any event is about one of entities"""
+        return any(entity in entities for entity, _, _ in self.events)
+
+    def of(self, entity):
+        """The (entity_id, operation) events about entity"""
+        return [(entity_id, operation) for kind, entity_id, operation in self.events if kind == entity]
+
+    def needs_reload(self, entity):
+        """
+        Whether a view of entity should be read again rather than patched: a
+        'reload' event, or more than MAX_PATCHED_CHANGES changes
+        """
+        changes = self.of(entity)
+        return len(changes) > MAX_PATCHED_CHANGES or any(operation == 'reload' for _, operation in changes)
+
+class ChangeBus(QObject):
+    """
+    Delivers the database's change events (see database.notify_change) to the
+    frames on the GUI thread, whichever thread made the write. Events are
+    gathered into one ChangeBatch per pass of the event loop, so a cascade of
+    deletes arrives as a single update. A timer polls for other processes'
+    commits, which arrive as 'reload' events.
+    """
+
+    changed = pyqtSignal(object)
+
+    # Emitted on the writing thread; queued to the GUI thread by Qt
+    _received = pyqtSignal(str, object, str)
+
+    def __init__(self, poll_interval=EXTERNAL_POLL_MS, parent=None):
+        super().__init__(parent)
+        self.pending = []
+        self._received.connect(self._queue, Qt.QueuedConnection)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(0)
+        self.flush_timer.timeout.connect(self.flush)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(poll_interval)
+        self.poll_timer.timeout.connect(self.poll)
+
+        database.add_change_listener(self.announce)
+        # The first poll only records where the database is now
+        self.poll()
+        self.poll_timer.start()
+
+    def announce(self, entity, entity_id, operation):
+        """database change listener; runs on the thread that made the write"""
+        self._received.emit(entity, entity_id, operation)
+
+    def _queue(self, entity, entity_id, operation):
+        self.pending.append((entity, entity_id, operation))
+        self.flush_timer.start()
+
+    def flush(self):
+        """Hand the gathered events to the subscribers"""
+        if self.pending:
+            batch, self.pending = ChangeBatch(self.pending), []
+            self.changed.emit(batch)
+
+    def poll(self):
+        try:
+            database.poll_external_changes()
+        except Exception as e:
+            print(f"Error checking for external changes: {e}")
+            traceback.print_exc()
+
+    def stop(self):
+        self.poll_timer.stop()
+        database.remove_change_listener(self.announce)
+
+_change_bus = None
+
+def get_change_bus():
+    """Get the shared change bus, creating it on first use (needs a QApplication)"""
+    global _change_bus
+    if _change_bus is None:
+        _change_bus = ChangeBus()
+    return _change_bus
+
+def shutdown_change_bus():
+    """Stop polling and listening, e.g. on application shutdown"""
+    global _change_bus
+    if _change_bus is not None:
+        _change_bus.stop()
+        _change_bus = None
@@ -5,7 +5,16 @@ from PyQt5.QtWidgets import (QWidget, QLabel, QFrame, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 import sqlite3
-from database import get_all_courses, add_course, update_course, delete_course
+from database import (get_courses_page, get_course_by_code, course_page_key, add_course, update_course,
+                      delete_course)
+from ui.table_models import RecordTableModel, RecordTableView
+from ui.change_bus import get_change_bus
+
+# Columns of the course table, as (header, value of a course row)
+COURSE_COLUMNS = [
+    ("Course Code", lambda course: course['course_code']),
+    ("Course Name", lambda course: course['course_name']),
+]
 
 class CourseManagementFrame(QWidget):
     def __init__(self, parent, controller):
@@ -13,6 +22,8 @@ class CourseManagementFrame(QWidget):
         self.controller = controller
         self.selected_course_code = None
         self.current_mode = "add"
+        # Loaded on first show, then kept current by on_data_changed
+        self.stale = True
         
         # Set background color
         self.setStyleSheet("background-color: #FFDD00;")
@@ -138,15 +149,17 @@ class CourseManagementFrame(QWidget):
         table_title.setFont(QFont("Arial", 14, QFont.Bold))
         table_layout.addWidget(table_title)
         
-        # Course table
-        self.course_table = QTableWidget()
-        self.course_table.setColumnCount(2)
-        self.course_table.setHorizontalHeaderLabels(["Course Code", "Course Name"])
-        self.course_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.course_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.course_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.course_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Filter for the loaded courses
+        self.filter_entry = QLineEdit()
+        self.filter_entry.setPlaceholderText("Filter courses...")
+        table_layout.addWidget(self.filter_entry)
+        
+        # Course table, read a page at a time as it is scrolled
+        self.course_model = RecordTableModel(COURSE_COLUMNS, lambda course: course['course_code'],
+                                             course_page_key, get_courses_page, parent=self)
+        self.course_table = RecordTableView(self.course_model)
         self.course_table.clicked.connect(self.select_course)
+        self.filter_entry.textChanged.connect(self.course_table.set_filter_text)
         table_layout.addWidget(self.course_table)
         
         # Action buttons container
@@ -181,34 +194,26 @@ class CourseManagementFrame(QWidget):
         
         # Add content container to main layout
         main_layout.addWidget(content_container)
+        
+        get_change_bus().changed.connect(self.on_data_changed)
     
     def load_courses(self):
-        """Load courses into table"""
-        self.course_table.setRowCount(0)
+        """Load the first page of courses into the table; more load on scroll"""
         try:
-            courses = get_all_courses()
-            self.course_table.setRowCount(len(courses))
-            
-            for i, course in enumerate(courses):
-                self.course_table.setItem(i, 0, QTableWidgetItem(course['course_code']))
-                self.course_table.setItem(i, 1, QTableWidgetItem(course['course_name']))
+            self.course_model.reload()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load courses: {str(e)}")
     
     def select_course(self):
         """Handle course selection from table"""
-        selected_rows = self.course_table.selectedIndexes()
-        if selected_rows:
-            row = selected_rows[0].row()
-            course_code = self.course_table.item(row, 0).text()
-            self.selected_course_code = course_code
+        course = self.course_table.selected_row()
+        if course:
+            self.selected_course_code = course['course_code']
             self.delete_btn.setEnabled(True)
             
             # Load course data into form
-            name = self.course_table.item(row, 1).text()
-            
-            self.code_entry.setText(course_code)
-            self.name_entry.setText(name)
+            self.code_entry.setText(course['course_code'])
+            self.name_entry.setText(course['course_name'] or "")
             
             # Update UI for edit mode
             self.current_mode = "edit"
@@ -249,26 +254,24 @@ class CourseManagementFrame(QWidget):
         try:
             if self.current_mode == "add":
                 # Add new course
-                success, msg = add_course(code, name)
+                success, msg, course = add_course(code, name)
                 
                 if success:
+                    self.course_model.apply_change(course)
                     QMessageBox.information(self, "Success", "Course added successfully")
                     self.reset_form()
                 else:
                     QMessageBox.warning(self, "Error", msg)
             else:
                 # Update existing course
-                success, msg = update_course(self.selected_course_code, name)
+                success, msg, course = update_course(self.selected_course_code, name)
                 
                 if success:
+                    self.course_model.apply_change(course)
                     QMessageBox.information(self, "Success", "Course updated successfully")
                     self.reset_form()
                 else:
                     QMessageBox.warning(self, "Error", msg)
-            
-            # Refresh course list
-            self.load_courses()
-            
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save course: {str(e)}")
     
@@ -284,17 +287,28 @@ class CourseManagementFrame(QWidget):
         
         if reply == QMessageBox.Yes:
             try:
-                success, msg = delete_course(self.selected_course_code)
+                success, msg, course = delete_course(self.selected_course_code)
                 
                 if success:
                     QMessageBox.information(self, "Success", "Course deleted successfully")
+                    self.course_model.remove_row(self.selected_course_code)
                     self.reset_form()
-                    self.load_courses()
                 else:
                     QMessageBox.warning(self, "Error", msg)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to delete course: {str(e)}")
     
+    def on_data_changed(self, changes):
+        """Apply committed course changes to the table"""
+        if self.stale or not changes.touches('course'):
+            return
+        if changes.needs_reload('course'):
+            self.load_courses()
+        else:
+            self.course_model.apply_changes(changes.of('course'), get_course_by_code)
+    
     def on_show(self):
         """Called when frame is shown"""
-        self.load_courses() 
\ No newline at end of file
+        if self.stale:
+            self.stale = False
+            self.load_courses() 
\ No newline at end of file
@@ -0,0 +1,155 @@
+import atexit
+import itertools
+import queue
+import threading
+from PyQt5.QtCore import QObject, QThread, QCoreApplication, pyqtSignal
+
+# Threads running database calls; in WAL mode SQLite serves readers concurrently
+DATA_WORKER_THREADS = 2
+
+class DataRequest:
+    """One database call queued on the worker"""
+    __slots__ = ('request_id', 'channel', 'func', 'args', 'kwargs', 'on_result', 'on_error')
+
+    def __init__(self, request_id, channel, func, args, kwargs, on_result, on_error):
+        self.request_id = request_id
+        self.channel = channel
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_result = on_result
+        self.on_error = on_error
+
+class _WorkerThread(QThread):
+    def __init__(self, worker):
+        super().__init__()
+        self.worker = worker
+
+    def run(self):
+        while True:
+            request = self.worker._next_request()
+            if request is None:
+                return
+            try:
+                result = request.func(*request.args, **request.kwargs)
+            except Exception as e:
+                self.worker.failed.emit(request, str(e))
+            else:
+                self.worker.finished.emit(request, result)
+
+class DataWorker(QObject):
+    """
+    Runs database calls on background threads and hands the results back on
+    the GUI thread. Every request belongs to a channel (e.g. one per frame):
+    a newer request replaces one still waiting on the same channel, and only
+    the newest request of a channel ever has its result delivered.
+    """
+
+    # Emitted from the worker threads; queued to the GUI thread by Qt
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(object, str)
+
+    def __init__(self, threads=DATA_WORKER_THREADS, parent=None):
+        super().__init__(parent)
+        self._ids = itertools.count(1)
+        self._queue = queue.Queue()
+        # Requests not yet started, and the id of the newest request, by channel
+        self._pending = {}
+        self._latest = {}
+        self._lock = threading.Lock()
+        self.finished.connect(self._deliver_result)
+        self.failed.connect(self._deliver_error)
+
+        self._threads = [_WorkerThread(self) for _ in range(threads)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, channel, func, *args, on_result=None, on_error=None, **kwargs):
+        """
+        Queue func(*args, **kwargs) on channel; on_result(result) or
+        on_error(message) is called on the GUI thread unless a newer request
+        on the channel or cancel() supersedes it first. Returns the request id.
+        """
+        with self._lock:
+            request = DataRequest(next(self._ids), channel, func, args, kwargs, on_result, on_error)
+            self._latest[channel] = request.request_id
+            waiting = channel in self._pending
+            self._pending[channel] = request
+        # A channel already waiting in the queue just picks up the newer request
+        if not waiting:
+            self._queue.put(channel)
+        return request.request_id
+
+    def cancel(self, channel):
+        """Drop the waiting request of channel and ignore the result of a running one"""
+        with self._lock:
+            self._pending.pop(channel, None)
+            self._latest.pop(channel, None)
+
+    def is_current(self, request):
+        """Whether request is still the newest one of its channel"""
+        return self._latest.get(request.channel) == request.request_id
+
+    def _next_request(self):
+        """Block until a request is due; None tells the thread to stop"""
+        while True:
+            channel = self._queue.get()
+            if channel is None:
+                return None
+            with self._lock:
+                request = self._pending.pop(channel, None)
+            # None when the channel was cancelled after it was queued
+            if request is not None:
+                return request
+
+    def _claim(self, request):
+        with self._lock:
+            if not self.is_current(request):
+                return False
+            del self._latest[request.channel]
+            return True
+
+    def _deliver_result(self, request, result):
+        if self._claim(request) and request.on_result is not None:
+            request.on_result(result)
+
+    def _deliver_error(self, request, message):
+        if not self._claim(request):
+            return
+        if request.on_error is not None:
+            request.on_error(message)
+        else:
+            print(f"Background request on {request.channel} failed: {message}")
+
+    def shutdown(self):
+        """Stop the threads once they finish their current request"""
+        with self._lock:
+            self._pending.clear()
+            self._latest.clear()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.wait()
+        self._threads = []
+
+_data_worker = None
+
+def get_data_worker():
+    """Get the shared data worker, starting its threads on first use"""
+    global _data_worker
+    if _data_worker is None:
+        _data_worker = DataWorker()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(shutdown_data_worker)
+    return _data_worker
+
+def shutdown_data_worker():
+    """Stop the shared data worker, if it was started"""
+    global _data_worker
+    if _data_worker is not None:
+        _data_worker.shutdown()
+        _data_worker = None
+
+# Threads still running when the interpreter exits would abort it
+atexit.register(shutdown_data_worker)
@@ -5,7 +5,17 @@ from PyQt5.QtWidgets import (QWidget, QLabel, QFrame, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 import sqlite3
-from database import get_all_departments, add_department, update_department, delete_department
+from database import get_all_departments, get_department_by_id, add_department, update_department, delete_department
+from ui.table_models import RecordTableModel, RecordTableView
+from ui.change_bus import get_change_bus
+
+# Columns of the department table, as (header, value of a department row)
+DEPARTMENT_COLUMNS = [
+    ("ID", lambda dept: dept['office_id']),
+    ("Department Name", lambda dept: dept['office_name']),
+    ("Building", lambda dept: dept['building_num']),
+    ("Room", lambda dept: dept['room_num']),
+]
 
 class DepartmentManagementFrame(QWidget):
     def __init__(self, parent, controller):
@@ -13,6 +23,8 @@ class DepartmentManagementFrame(QWidget):
         self.controller = controller
         self.selected_dept_id = None
         self.current_mode = "add"
+        # Loaded on first show, then kept current by on_data_changed
+        self.stale = True
         
         # Set background color
         self.setStyleSheet("background-color: #FFDD00;")
@@ -143,15 +155,17 @@ class DepartmentManagementFrame(QWidget):
         table_title.setFont(QFont("Arial", 14, QFont.Bold))
         table_layout.addWidget(table_title)
         
-        # Department table
-        self.dept_table = QTableWidget()
-        self.dept_table.setColumnCount(4)
-        self.dept_table.setHorizontalHeaderLabels(["ID", "Department Name", "Building", "Room"])
-        self.dept_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.dept_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.dept_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.dept_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Filter for the departments
+        self.filter_entry = QLineEdit()
+        self.filter_entry.setPlaceholderText("Filter departments...")
+        table_layout.addWidget(self.filter_entry)
+        
+        # Department table, in get_all_departments order
+        self.dept_model = RecordTableModel(DEPARTMENT_COLUMNS, lambda dept: dept['office_id'],
+                                           lambda dept: (dept['office_name'],), parent=self)
+        self.dept_table = RecordTableView(self.dept_model)
         self.dept_table.clicked.connect(self.select_department)
+        self.filter_entry.textChanged.connect(self.dept_table.set_filter_text)
         table_layout.addWidget(self.dept_table)
         
         # Action buttons container
@@ -186,47 +200,27 @@ class DepartmentManagementFrame(QWidget):
         
         # Add content container to main layout
         main_layout.addWidget(content_container)
+        
+        get_change_bus().changed.connect(self.on_data_changed)
     
     def load_departments(self):
         """Load departments into table"""
-        self.dept_table.setRowCount(0)
         try:
-            departments = get_all_departments()
-            self.dept_table.setRowCount(len(departments))
-            
-            for i, dept in enumerate(departments):
-                self.dept_table.setItem(i, 0, QTableWidgetItem(str(dept['office_id'])))
-                self.dept_table.setItem(i, 1, QTableWidgetItem(dept['office_name']))
-                
-                # Convert building number to string (handling None values)
-                building_num = dept['building_num']
-                building_str = str(building_num) if building_num is not None else ""
-                self.dept_table.setItem(i, 2, QTableWidgetItem(building_str))
-                
-                # Convert room number to string (handling None values)
-                room_num = dept['room_num']
-                room_str = str(room_num) if room_num is not None else ""
-                self.dept_table.setItem(i, 3, QTableWidgetItem(room_str))
+            self.dept_model.set_rows(get_all_departments())
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load departments: {str(e)}")
     
     def select_department(self):
         """Handle department selection from table"""
-        selected_rows = self.dept_table.selectedIndexes()
-        if selected_rows:
-            row = selected_rows[0].row()
-            dept_id = int(self.dept_table.item(row, 0).text())
-            self.selected_dept_id = dept_id
+        dept = self.dept_table.selected_row()
+        if dept:
+            self.selected_dept_id = dept['office_id']
             self.delete_btn.setEnabled(True)
             
-            # Load department data into form
-            name = self.dept_table.item(row, 1).text()
-            building = self.dept_table.item(row, 2).text()
-            room = self.dept_table.item(row, 3).text()
-            
-            self.name_entry.setText(name)
-            self.building_entry.setText(building)
-            self.room_entry.setText(room)
+            # Load department data into form (building and room may be empty)
+            self.name_entry.setText(dept['office_name'])
+            self.building_entry.setText(str(dept['building_num']) if dept['building_num'] is not None else "")
+            self.room_entry.setText(str(dept['room_num']) if dept['room_num'] is not None else "")
             
             # Update UI for edit mode
             self.current_mode = "edit"
@@ -263,26 +257,24 @@ class DepartmentManagementFrame(QWidget):
         try:
             if self.current_mode == "add":
                 # Add new department
-                success, msg = add_department(name, building, room)
+                success, msg, dept = add_department(name, building, room)
                 
                 if success:
+                    self.dept_model.apply_change(dept)
                     QMessageBox.information(self, "Success", "Department added successfully")
                     self.reset_form()
                 else:
                     QMessageBox.warning(self, "Error", msg)
             else:
                 # Update existing department
-                success, msg = update_department(self.selected_dept_id, name, building, room)
+                success, msg, dept = update_department(self.selected_dept_id, name, building, room)
                 
                 if success:
+                    self.dept_model.apply_change(dept)
                     QMessageBox.information(self, "Success", "Department updated successfully")
                     self.reset_form()
                 else:
                     QMessageBox.warning(self, "Error", msg)
-            
-            # Refresh department list
-            self.load_departments()
-            
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save department: {str(e)}")
     
@@ -298,17 +290,33 @@ class DepartmentManagementFrame(QWidget):
         
         if reply == QMessageBox.Yes:
             try:
-                success, msg = delete_department(self.selected_dept_id)
+                success, msg, dept = delete_department(self.selected_dept_id)
                 
                 if success:
                     QMessageBox.information(self, "Success", "Department deleted successfully")
+                    self.dept_model.remove_row(self.selected_dept_id)
                     self.reset_form()
-                    self.load_departments()
                 else:
                     QMessageBox.warning(self, "Error", msg)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to delete department: {str(e)}")
     
+    def on_data_changed(self, changes):
+        """Apply committed department changes to the table"""
+        if self.stale or not changes.touches('department', 'professor'):
+            return
+        if changes.needs_reload('department') or changes.needs_reload('professor'):
+            self.load_departments()
+            return
+        self.dept_model.apply_changes(changes.of('department'), get_department_by_id)
+        if changes.touches('professor'):
+            # Professors joining or leaving change the faculty counts of departments
+            # the events do not name; the list is short, so refresh every row in place
+            loaded = [(dept['office_id'], 'update') for dept in self.dept_model.rows]
+            self.dept_model.apply_changes(loaded, get_department_by_id)
+    
     def on_show(self):
         """Called when frame is shown"""
-        self.load_departments() 
\ No newline at end of file
+        if self.stale:
+            self.stale = False
+            self.load_departments() 
\ No newline at end of file
@@ -4,6 +4,7 @@ from PyQt5.QtCore import Qt, pyqtSignal, QSize
 from PyQt5.QtGui import QFont, QColor
 import sqlite3
 from database import get_all_departments
+from ui.change_bus import get_change_bus
 
 class DepartmentCard(QFrame):
     clicked = pyqtSignal(str)
@@ -100,11 +101,13 @@ class DepartmentsListFrame(QWidget):
         
         main_layout.addWidget(content_area)
         
-        # Track number of columns in grid
+        # Track number of columns in grid, and the cards laid out in it
         self.columns = 3
+        self.cards = []
         
-        # Create departments grid
-        self.create_departments_grid()
+        # Cards are built on first show and again after departments change
+        self.stale = True
+        get_change_bus().changed.connect(self.on_data_changed)
     
     def on_resize(self, window_width, window_height):
         # Calculate the available width (window width minus sidebar and padding)
@@ -119,7 +122,14 @@ class DepartmentsListFrame(QWidget):
         
         if max_cols != self.columns:
             self.columns = max_cols
-            self.create_departments_grid()
+            self.arrange_cards()
+    
+    def arrange_cards(self):
+        """Reposition the existing cards for the current column count"""
+        for card in self.cards:
+            self.grid_layout.removeWidget(card)
+        for index, card in enumerate(self.cards):
+            self.grid_layout.addWidget(card, index // self.columns, index % self.columns)
     
     def create_departments_grid(self, max_cols=None):
         # Clear existing grid
@@ -133,25 +143,21 @@ class DepartmentsListFrame(QWidget):
         if max_cols is not None:
             self.columns = max_cols
         
+        self.cards = []
+        self.stale = False
+        
         try:
             # Get all departments
             departments = get_all_departments()
             
             # Create department cards and add to grid
-            row, col = 0, 0
-            
             for dept in departments:
                 department_name = dept['office_name']  # Now accessing the dictionary key
                 card = DepartmentCard(department_name)
                 card.clicked.connect(self.show_department_detail)
-                
-                self.grid_layout.addWidget(card, row, col)
-                
-                # Move to next grid position
-                col += 1
-                if col >= self.columns:
-                    col = 0
-                    row += 1
+                self.cards.append(card)
+            
+            self.arrange_cards()
                     
         except Exception as e:
             error_label = QLabel(f"Error loading departments: {str(e)}")
@@ -161,6 +167,14 @@ class DepartmentsListFrame(QWidget):
     def show_department_detail(self, department_name):
         self.controller.show_department_detail(department_name)
     
+    def on_data_changed(self, changes):
+        if changes.touches('department'):
+            if self.isVisible():
+                self.create_departments_grid()
+            else:
+                self.stale = True
+    
     def on_show(self):
-        # Refresh departments when frame is shown
-        self.create_departments_grid() 
\ No newline at end of file
+        # Refresh departments when frame is shown, if they changed
+        if self.stale:
+            self.create_departments_grid()
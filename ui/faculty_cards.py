@@ -0,0 +1,211 @@
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QFrame
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRectF, QSize, pyqtSignal
+from PyQt5.QtGui import QFont, QColor, QPainter, QPainterPath, QPen, QFontMetrics
+from ui.thumbnails import get_thumbnail_cache
+
+# Item data roles beyond Qt.DisplayRole (the professor's name)
+FacultyIdRole = Qt.UserRole + 1
+CardRole = Qt.UserRole + 2
+
+def card_fields(professor):
+    """
+    Get the fields a card shows from a professor row, which comes either with
+    first_name/last_name/department_name or with f_name/l_name/office_name
+    """
+    keys = professor.keys()
+    if 'first_name' in keys:
+        first_name, last_name = professor['first_name'], professor['last_name']
+    else:
+        first_name, last_name = professor['f_name'], professor['l_name']
+    department = professor['department_name'] if 'department_name' in keys else professor['office_name']
+    return {
+        'faculty_id': professor['faculty_id'],
+        'name': f"{first_name} {last_name}",
+        'department': department or "",
+        'email': professor['email'] or "",
+        'subject': professor['subject_id'] or "",
+        'photo_url': professor['photo_url'] if 'photo_url' in keys else None,
+    }
+
+class FacultyCardModel(QAbstractListModel):
+    """List model of professors shown as cards"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.professors = []
+        # Card fields by row, filled in as rows are first painted
+        self.cards = {}
+
+    def set_professors(self, professors):
+        """Replace the cards with one per professor row"""
+        self.beginResetModel()
+        self.professors = professors if isinstance(professors, list) else list(professors)
+        self.cards = {}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.professors)
+
+    def card(self, row):
+        """Get the card fields of a row"""
+        card = self.cards.get(row)
+        if card is None:
+            card = self.cards[row] = card_fields(self.professors[row])
+        return card
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.professors):
+            return None
+        card = self.card(index.row())
+        if role == Qt.DisplayRole:
+            return card['name']
+        if role == FacultyIdRole:
+            return card['faculty_id']
+        if role == CardRole:
+            return card
+        return None
+
+class FacultyCardDelegate(QStyledItemDelegate):
+    """
+    Paints a professor card: name, department and email, or with show_photo
+    a round photo, the name and the subject, all centered
+    """
+
+    def __init__(self, card_size, show_photo=False, parent=None):
+        super().__init__(parent)
+        self.card_size = card_size
+        self.show_photo = show_photo
+        self.name_font = QFont("Arial", 16 if show_photo else 14, QFont.Bold)
+        self.detail_font = QFont("Arial", 10)
+        self.avatar_font = QFont("Arial", 30)
+
+    def sizeHint(self, option, index):
+        return self.card_size
+
+    def paint(self, painter, option, index):
+        card = index.data(CardRole)
+        if card is None:
+            return
+        hovered = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -0.5)
+        painter.setPen(QPen(QColor("#FFDD00" if hovered else "#555555"), 1))
+        painter.setBrush(QColor("#4D4D4D" if hovered else "#3D3D3D"))
+        painter.drawRoundedRect(rect, 8, 8)
+
+        content = option.rect.adjusted(15, 15, -15, -15)
+        if self.show_photo:
+            self.paint_photo_card(painter, content, card)
+        else:
+            self.paint_contact_card(painter, content, card)
+        painter.restore()
+
+    def paint_contact_card(self, painter, content, card):
+        painter.setFont(self.name_font)
+        painter.setPen(Qt.white)
+        name_rect = painter.boundingRect(content, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, card['name'])
+        painter.drawText(content, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, card['name'])
+
+        painter.setFont(self.detail_font)
+        painter.setPen(QColor("#CCCCCC"))
+        metrics = QFontMetrics(self.detail_font)
+        top = name_rect.bottom() + 6
+        for text in (card['department'], card['email']):
+            if not text:
+                continue
+            line = content.adjusted(0, top - content.top(), 0, 0)
+            painter.drawText(line, Qt.AlignLeft | Qt.AlignTop,
+                             metrics.elidedText(text, Qt.ElideRight, content.width()))
+            top += metrics.height() + 4
+
+    def paint_photo_card(self, painter, content, card):
+        photo_rect = QRectF(content.center().x() - 30, content.top(), 60, 60)
+        # Placeholder until the thumbnail has been decoded in the background
+        pixmap = get_thumbnail_cache().get(card['photo_url'], 60)
+        painter.setPen(QPen(QColor("#777777"), 1))
+        painter.setBrush(QColor("#555555"))
+        painter.drawEllipse(photo_rect)
+        if pixmap is not None:
+            path = QPainterPath()
+            path.addEllipse(photo_rect)
+            painter.setClipPath(path)
+            painter.drawPixmap(photo_rect.toRect(), pixmap)
+            painter.setClipping(False)
+        else:
+            painter.setFont(self.avatar_font)
+            painter.setPen(Qt.white)
+            painter.drawText(photo_rect, Qt.AlignCenter, "👤")
+
+        text_rect = content.adjusted(0, 68, 0, 0)
+        painter.setFont(self.name_font)
+        painter.setPen(Qt.white)
+        metrics = QFontMetrics(self.name_font)
+        painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop,
+                         metrics.elidedText(card['name'], Qt.ElideRight, text_rect.width()))
+
+        if card['subject']:
+            painter.setFont(self.detail_font)
+            painter.setPen(QColor("#CCCCCC"))
+            subject_rect = text_rect.adjusted(0, metrics.height() + 4, 0, 0)
+            painter.drawText(subject_rect, Qt.AlignHCenter | Qt.AlignTop,
+                             QFontMetrics(self.detail_font).elidedText(card['subject'], Qt.ElideRight,
+                                                                      subject_rect.width()))
+
+class FacultyCardView(QListView):
+    """
+    Grid of professor cards painted by FacultyCardDelegate; only the cards in
+    view are painted, so any number of professors loads and scrolls alike
+    """
+
+    # Emitted with the faculty_id of a clicked card
+    faculty_selected = pyqtSignal(int)
+
+    def __init__(self, card_size, show_photo=False, parent=None):
+        super().__init__(parent)
+        self.message = ""
+        self.message_color = QColor("#666666")
+
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(True)
+        self.setSpacing(10)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setEditTriggers(QListView.NoEditTriggers)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setStyleSheet("QListView { background-color: #FCFCFC; }")
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WA_Hover)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+
+        self.setModel(FacultyCardModel(self))
+        self.setItemDelegate(FacultyCardDelegate(card_size, show_photo, self))
+        self.clicked.connect(lambda index: self.faculty_selected.emit(index.data(FacultyIdRole)))
+        if show_photo:
+            # Repaint when a photo finishes loading; only visible cards are actually drawn
+            get_thumbnail_cache().thumbnail_ready.connect(lambda path, size: self.viewport().update())
+
+    def set_professors(self, professors):
+        """Show one card per professor row"""
+        self.message = ""
+        self.model().set_professors(professors)
+        self.verticalScrollBar().setValue(0)
+
+    def set_message(self, text, color="#666666"):
+        """Clear the cards and show text in their place"""
+        self.model().set_professors([])
+        self.message = text
+        self.message_color = QColor(color)
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.message and not self.model().rowCount():
+            painter = QPainter(self.viewport())
+            painter.setPen(self.message_color)
+            painter.setFont(QFont("Arial", 11))
+            painter.drawText(self.viewport().rect(), Qt.AlignCenter | Qt.TextWordWrap, self.message)
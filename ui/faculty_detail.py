@@ -1,9 +1,11 @@
 from PyQt5.QtWidgets import (QWidget, QLabel, QFrame, QVBoxLayout, QHBoxLayout,
                            QScrollArea, QGridLayout, QPushButton, QSizePolicy)
 from PyQt5.QtCore import Qt, pyqtSignal, QSize
-from PyQt5.QtGui import QFont, QCursor, QPixmap, QColor
+from PyQt5.QtGui import QFont, QCursor, QPixmap, QColor, QPainter, QPainterPath
 import sqlite3
 from database import get_professor_by_id
+from ui.thumbnails import get_thumbnail_cache
+from ui.change_bus import get_change_bus
 
 class InfoCard(QFrame):
     """A styled card widget for displaying information sections"""
@@ -42,6 +44,7 @@ class FacultyDetailFrame(QWidget):
         super().__init__(parent)
         self.controller = controller
         self.current_faculty_id = None
+        self.stale = False
         
         # Set background color
         self.setStyleSheet("background-color: #FFDD00;")
@@ -107,6 +110,8 @@ class FacultyDetailFrame(QWidget):
         self.profile_photo.setText("👤")
         self.profile_photo.setFont(QFont("Arial", 40))
         photo_layout.addWidget(self.profile_photo, 0, Qt.AlignCenter)
+        self.current_photo_url = None
+        get_thumbnail_cache().thumbnail_ready.connect(self.on_thumbnail_ready)
         
         # Add photo container to header layout
         header_layout.addWidget(self.photo_container, 1)
@@ -261,6 +266,8 @@ class FacultyDetailFrame(QWidget):
         
         # Add content area to main layout
         main_layout.addWidget(content_background)
+        
+        get_change_bus().changed.connect(self.on_data_changed)
     
     def on_resize(self, window_width, window_height):
         # Calculate available width
@@ -272,6 +279,7 @@ class FacultyDetailFrame(QWidget):
     def load_faculty(self, faculty_id):
         """Load faculty details"""
         self.current_faculty_id = faculty_id
+        self.stale = False
         
         try:
             # Get professor details from database
@@ -297,34 +305,12 @@ class FacultyDetailFrame(QWidget):
                 # Set specialty (subject_id)
                 self.subject_value.setText(professor['subject_id'] if professor['subject_id'] else "N/A")
                 
-                # Handle profile photo if available
-                if 'photo_url' in professor and professor['photo_url']:
-                    try:
-                        pixmap = QPixmap(professor['photo_url'])
-                        if not pixmap.isNull():
-                            # Scale the pixmap to fit the label while maintaining aspect ratio
-                            pixmap = pixmap.scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                            # Set the pixmap on the label
-                            self.profile_photo.setText("")
-                            self.profile_photo.setPixmap(pixmap)
-                            # Make the label circular by setting a stylesheet with border-radius
-                            self.profile_photo.setStyleSheet("""
-                                background-color: #555555;
-                                border-radius: 40px;
-                                border: 2px solid #FFFFFF;
-                            """)
-                        else:
-                            # Fallback to default icon if pixmap is null
-                            self.profile_photo.setText("👤")
-                            self.profile_photo.setFont(QFont("Arial", 40))
-                    except Exception as e:
-                        print(f"Error loading profile image: {str(e)}")
-                        self.profile_photo.setText("👤")
-                        self.profile_photo.setFont(QFont("Arial", 40))
-                else:
-                    # Default icon if no photo_url
-                    self.profile_photo.setText("👤")
-                    self.profile_photo.setFont(QFont("Arial", 40))
+                # Show the placeholder until the thumbnail is decoded in the background
+                self.current_photo_url = professor['photo_url']
+                self.show_photo_placeholder()
+                pixmap = get_thumbnail_cache().get(self.current_photo_url, 80)
+                if pixmap is not None:
+                    self.show_photo(pixmap)
             else:
                 # Handle case where professor is not found
                 self.name_label.setText("Faculty not found")
@@ -335,8 +321,8 @@ class FacultyDetailFrame(QWidget):
                 self.schedule_btn.setEnabled(False)
                 
                 # Reset profile photo
-                self.profile_photo.setText("👤")
-                self.profile_photo.setFont(QFont("Arial", 40))
+                self.current_photo_url = None
+                self.show_photo_placeholder()
         
         except Exception as e:
             print(f"Error loading faculty: {str(e)}")
@@ -348,8 +334,56 @@ class FacultyDetailFrame(QWidget):
             self.schedule_btn.setEnabled(False)
             
             # Reset profile photo
-            self.profile_photo.setText("👤")
-            self.profile_photo.setFont(QFont("Arial", 40))
+            self.current_photo_url = None
+            self.show_photo_placeholder()
+    
+    def show_photo_placeholder(self):
+        """Show the default icon in place of the profile photo"""
+        self.profile_photo.setText("👤")
+        self.profile_photo.setFont(QFont("Arial", 40))
+    
+    def show_photo(self, pixmap):
+        """Show a profile photo thumbnail, clipped to the circle inside the border"""
+        size = self.profile_photo.contentsRect().width()
+        photo = QPixmap(size, size)
+        photo.fill(Qt.transparent)
+        painter = QPainter(photo)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        path = QPainterPath()
+        path.addEllipse(0, 0, size, size)
+        painter.setClipPath(path)
+        painter.drawPixmap(photo.rect(), pixmap)
+        painter.end()
+        
+        self.profile_photo.setText("")
+        self.profile_photo.setPixmap(photo)
+        # Keep the label circular, as it is around the placeholder
+        self.profile_photo.setStyleSheet("""
+            background-color: #555555;
+            border-radius: 40px;
+            border: 2px solid #FFFFFF;
+        """)
+    
+    def on_thumbnail_ready(self, path, size):
+        """Swap in the photo of the professor on display once its thumbnail is decoded"""
+        if path == self.current_photo_url and size == 80:
+            self.show_photo(get_thumbnail_cache().get(path, size))
+    
+    def on_data_changed(self, changes):
+        # The department name and location shown come from the department row
+        if self.current_faculty_id and (changes.touches('department') or any(
+                entity_id == self.current_faculty_id or operation == 'reload'
+                for entity_id, operation in changes.of('professor'))):
+            if self.isVisible():
+                self.load_faculty(self.current_faculty_id)
+            else:
+                self.stale = True
+    
+    def on_show(self):
+        # Refresh content if it changed while hidden
+        if self.current_faculty_id and self.stale:
+            self.load_faculty(self.current_faculty_id)
     
     def view_schedule(self):
         """View faculty schedule"""
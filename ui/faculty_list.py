@@ -1,67 +1,24 @@
 from PyQt5.QtWidgets import (QWidget, QLabel, QFrame, QVBoxLayout, QHBoxLayout,
-                           QScrollArea, QGridLayout, QPushButton)
-from PyQt5.QtCore import Qt, pyqtSignal, QSize
+                           QPushButton, QLineEdit, QCompleter)
+from PyQt5.QtCore import Qt, pyqtSignal, QSize, QStringListModel
 from PyQt5.QtGui import QFont, QColor, QCursor
 import sqlite3
-from database import get_all_professors, search_professors, filter_professors_by_faculty, get_all_faculties, get_all_courses, filter_professors_by_course
-
-class FacultyCard(QFrame):
-    def __init__(self, professor, controller, parent=None):
-        super().__init__(parent)
-        self.professor = professor
-        self.controller = controller
-        self.faculty_id = professor["faculty_id"]
-        
-        # Configure card style
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #3D3D3D;
-                border-radius: 8px;
-                color: white;
-                border: 1px solid #555555;
-            }
-            QFrame:hover {
-                background-color: #4D4D4D;
-                border: 1px solid #FFDD00;
-            }
-        """)
-        
-        # Set fixed size for card
-        self.setFixedSize(220, 140)
-        
-        # Create layout
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(15, 15, 15, 15)
-        
-        # Faculty name
-        name_label = QLabel(f"{professor['f_name']} {professor['l_name']}")
-        name_label.setFont(QFont("Arial", 14, QFont.Bold))
-        name_label.setStyleSheet("color: white;")
-        name_label.setWordWrap(True)
-        layout.addWidget(name_label)
-        
-        # Department
-        if professor['office_name']:
-            dept_label = QLabel(professor['office_name'])
-            dept_label.setStyleSheet("color: #CCCCCC;")
-            layout.addWidget(dept_label)
-        
-        # Email
-        email_label = QLabel(professor['email'])
-        email_label.setStyleSheet("color: #CCCCCC;")
-        email_label.setWordWrap(True)
-        layout.addWidget(email_label)
-        
-        # Make card clickable
-        self.setCursor(Qt.PointingHandCursor)
-    
-    def mousePressEvent(self, event):
-        self.controller.show_faculty_detail(self.faculty_id)
+from database import get_all_professors, search_directory
+from autocomplete import suggest
+from ui.data_worker import get_data_worker
+from ui.faculty_cards import FacultyCardView
+from ui.change_bus import get_change_bus
 
 class FacultyListFrame(QWidget):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+        # The search shown ("" for everyone); read again when professors change
+        self.search_term = ""
+        self.search_kind = None
+        # Kind of each suggestion on offer, so a picked course lists its teachers
+        self.suggestion_kinds = {}
+        self.stale = True
         
         # Main layout
         main_layout = QVBoxLayout(self)
@@ -79,6 +36,19 @@ class FacultyListFrame(QWidget):
         title_label.setStyleSheet("color: black;")
         title_layout.addWidget(title_label)
         
+        # Search box with search-as-you-type suggestions from the in-memory trie
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search by name, email, subject or course...")
+        self.search_edit.setStyleSheet("background-color: white; color: black; padding: 6px;")
+        self.suggestion_model = QStringListModel(self)
+        completer = QCompleter(self.suggestion_model, self)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        completer.activated.connect(self.search_suggestion)
+        self.search_edit.setCompleter(completer)
+        self.search_edit.textEdited.connect(self.update_suggestions)
+        self.search_edit.returnPressed.connect(lambda: self.search_suggestion(self.search_edit.text()))
+        title_layout.addWidget(self.search_edit)
+        
         main_layout.addWidget(title_container)
         
         # White content area
@@ -87,131 +57,86 @@ class FacultyListFrame(QWidget):
         content_layout = QVBoxLayout(content_area)
         content_layout.setContentsMargins(20, 20, 20, 20)
         
-        # Create scrollable area for faculty members
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setFrameShape(QFrame.NoFrame)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        # Create widget to hold grid
-        self.scroll_content = QWidget()
-        self.scroll_content.setStyleSheet("background-color: #FCFCFC;")
-        
-        # Grid layout for faculty cards
-        self.grid_layout = QGridLayout(self.scroll_content)
-        self.grid_layout.setSpacing(20)
-        
-        scroll_area.setWidget(self.scroll_content)
-        content_layout.addWidget(scroll_area)
+        # Cards are painted by a delegate, so only the visible ones cost anything
+        self.card_view = FacultyCardView(QSize(220, 140))
+        self.card_view.faculty_selected.connect(self.controller.show_faculty_detail)
+        content_layout.addWidget(self.card_view)
         
         main_layout.addWidget(content_area)
         
-        # Number of columns in grid
-        self.columns = 4
-        
-        # Load faculty data
-        self.load_faculty_list()
+        get_change_bus().changed.connect(self.on_data_changed)
     
-    def on_resize(self, window_width, window_height):
-        # Calculate the available width (window width minus sidebar and padding)
-        available_width = window_width - 260  # 220px sidebar + 40px padding
-        self.adjust_grid_layout(available_width)
-    
-    def adjust_grid_layout(self, available_width):
-        # Determine how many columns fit in the available width
-        item_width = 240  # width of each faculty card
-        padding = 20
-        max_cols = max(1, int(available_width / (item_width + padding)))
-        
-        if max_cols != self.columns:
-            self.columns = max_cols
-            self.load_faculty_list()
+    def show_message(self, text, color="#666666"):
+        """Replace the cards with a single message"""
+        self.card_view.set_message(text, color)
     
     def load_faculty_list(self):
-        """Load all faculty members into the grid layout"""
-        # Clear existing grid items
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-        
-        try:
-            # Get all professors
-            professors = get_all_professors()
-        
-            # Sort professors by name
-            professors = sorted(professors, key=lambda p: f"{p['f_name']} {p['l_name']}")
-            
-            # Create grid layout
-            row, col = 0, 0
-            
-            for prof in professors:
-                # Create faculty card
-                card = FacultyCard(prof, self.controller)
-                self.grid_layout.addWidget(card, row, col)
-                
-                # Update row and column for the next card
-                col += 1
-                if col >= self.columns:
-                    col = 0
-                    row += 1
-            
-            # If no faculty, show message
-            if not professors:
-                no_faculty_label = QLabel("No faculty members found.")
-                no_faculty_label.setAlignment(Qt.AlignCenter)
-                no_faculty_label.setStyleSheet("color: #666666; font-size: 14px;")
-                self.grid_layout.addWidget(no_faculty_label, 0, 0, 1, self.columns)
-                
-        except Exception as e:
-            error_label = QLabel(f"Error loading faculty: {str(e)}")
-            error_label.setStyleSheet("color: red;")
-            self.grid_layout.addWidget(error_label, 0, 0)
+        """Load all faculty members into the card grid (queried in the background)"""
+        self.search_term = ""
+        self.search_kind = None
+        self.stale = False
+        # Keep showing the current cards until the fresh list arrives
+        if not self.card_view.model().rowCount():
+            self.show_message("Loading faculty members...")
+        get_data_worker().submit("faculty_list", get_all_professors,
+                                 on_result=self.show_faculty_list,
+                                 on_error=lambda message: self.show_message(f"Error loading faculty: {message}", "red"))
     
-    def search_faculty(self, search_term):
-        """Search faculty by name, email, or subject"""
-        # Clear existing grid items
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
-        
+    def show_faculty_list(self, professors):
+        """Show all faculty members, sorted by name"""
+        professors = sorted(professors, key=lambda p: f"{p['first_name']} {p['last_name']}")
+        self.card_view.set_professors(professors)
+        
+        # If no faculty, show message
+        if not professors:
+            self.show_message("No faculty members found.")
+    
+    def update_suggestions(self, text):
+        """Refresh the completer with the best suggestions for the typed prefix"""
+        suggestions = suggest(text)
+        self.suggestion_kinds = {suggestion: kind for kind, suggestion in suggestions}
+        self.suggestion_model.setStringList([suggestion for kind, suggestion in suggestions])
+    
+    def search_suggestion(self, text):
+        """Search for text, as the kind of thing it is when it is one of the suggestions"""
+        self.search_faculty(text, self.suggestion_kinds.get(text))
+    
+    def search_faculty(self, search_term, kind=None):
+        """Search faculty by name, email, subject or course (queried in the background)"""
         if not search_term:
             self.load_faculty_list()
             return
         
-        try:
-            # Search professors
-            professors = search_professors(search_term)
+        # Shares the list's channel, so only the latest search or reload is ever shown
+        self.search_term = search_term
+        self.search_kind = kind
+        self.stale = False
+        self.show_message("Searching...")
+        get_data_worker().submit("faculty_list", search_directory, search_term, kind,
+                                 on_result=lambda professors: self.show_search_results(search_term, professors),
+                                 on_error=lambda message: self.show_message(f"Error searching faculty: {message}", "red"))
+    
+    def show_search_results(self, search_term, professors):
+        """Show the professors matching search_term, best matches first"""
+        self.card_view.set_professors(professors)
         
-            # Create grid layout for search results
-            row, col = 0, 0
-            
-            for prof in professors:
-                # Create faculty card
-                card = FacultyCard(prof, self.controller)
-                self.grid_layout.addWidget(card, row, col)
-                
-                # Update row and column for the next card
-                col += 1
-                if col >= self.columns:
-                    col = 0
-                    row += 1
-                    
-            # Show message if no results found
-            if not professors:
-                no_results_label = QLabel(f"No faculty members found matching '{search_term}'")
-                no_results_label.setAlignment(Qt.AlignCenter)
-                no_results_label.setStyleSheet("color: #666666; font-size: 14px;")
-                self.grid_layout.addWidget(no_results_label, 0, 0, 1, self.columns)
-                
-        except Exception as e:
-            error_label = QLabel(f"Error searching faculty: {str(e)}")
-            error_label.setStyleSheet("color: red;")
-            self.grid_layout.addWidget(error_label, 0, 0)
+        # Show message if no results found
+        if not professors:
+            self.show_message(f"No faculty members found matching '{search_term}'")
+    
+    def on_data_changed(self, changes):
+        """Show professor changes, now if shown, otherwise when next shown"""
+        entities = ('professor', 'department')
+        if self.search_term and self.search_kind in ('course', None):
+            # A course's professors also depend on the timetable
+            entities += ('course', 'schedule')
+        if changes.touches(*entities):
+            if self.isVisible():
+                self.search_faculty(self.search_term, self.search_kind)
+            else:
+                self.stale = True
     
     def on_show(self):
         """Called when frame is shown"""
-        self.load_faculty_list()
\ No newline at end of file
+        if self.stale:
+            self.search_faculty(self.search_term, self.search_kind)
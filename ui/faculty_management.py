@@ -6,7 +6,22 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 import sqlite3
 import os
-from database import add_professor, update_professor, delete_professor, get_all_professors, get_all_faculties, get_professor_by_id
+from database import (add_professor, update_professor, delete_professor, get_professors_page, get_all_faculties,
+                      get_professor_by_id, professor_page_key)
+from ui.table_models import RecordTableModel, RecordTableView
+from ui.thumbnails import get_thumbnail_cache
+from ui.change_bus import get_change_bus
+
+# Columns of the faculty table, as (header, value of a professor row)
+FACULTY_COLUMNS = [
+    ("ID", lambda prof: prof['faculty_id']),
+    ("First Name", lambda prof: prof['first_name']),
+    ("Last Name", lambda prof: prof['last_name']),
+    ("Department", lambda prof: prof['department_name']),
+    ("Email", lambda prof: prof['email']),
+    ("Phone", lambda prof: prof['phone']),
+    ("Specialty", lambda prof: prof['subject_id']),
+]
 
 class FacultyManagementFrame(QWidget):
     def __init__(self, parent, controller):
@@ -15,6 +30,8 @@ class FacultyManagementFrame(QWidget):
         self.selected_faculty_id = None
         self.current_mode = "add"
         self.photo_path = None
+        # Loaded on first show, then kept current by on_data_changed
+        self.stale = True
         
         # Set background color
         self.setStyleSheet("background-color: #FFDD00;")
@@ -185,15 +202,17 @@ class FacultyManagementFrame(QWidget):
         table_title.setFont(QFont("Arial", 14, QFont.Bold))
         table_layout.addWidget(table_title)
         
-        # Faculty table
-        self.faculty_table = QTableWidget()
-        self.faculty_table.setColumnCount(7)
-        self.faculty_table.setHorizontalHeaderLabels(["ID", "First Name", "Last Name", "Department", "Email", "Phone", "Specialty"])
-        self.faculty_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.faculty_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.faculty_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.faculty_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Filter for the loaded faculty
+        self.filter_entry = QLineEdit()
+        self.filter_entry.setPlaceholderText("Filter faculty...")
+        table_layout.addWidget(self.filter_entry)
+        
+        # Faculty table, read a page at a time as it is scrolled
+        self.faculty_model = RecordTableModel(FACULTY_COLUMNS, lambda prof: prof['faculty_id'],
+                                              professor_page_key, get_professors_page, parent=self)
+        self.faculty_table = RecordTableView(self.faculty_model)
         self.faculty_table.clicked.connect(self.select_faculty)
+        self.filter_entry.textChanged.connect(self.faculty_table.set_filter_text)
         table_layout.addWidget(self.faculty_table)
         
         # Delete button
@@ -222,42 +241,36 @@ class FacultyManagementFrame(QWidget):
         
         # Add content container to main layout
         main_layout.addWidget(content_container)
+        
+        get_change_bus().changed.connect(self.on_data_changed)
     
     def load_departments(self):
         """Load departments into combo box"""
+        current = self.dept_combo.currentText()
         self.dept_combo.clear()
         try:
             faculties = get_all_faculties()
             for faculty in faculties:
                 self.dept_combo.addItem(faculty['office_name'])
+            # Keep the department of a form being filled in
+            if self.dept_combo.findText(current) >= 0:
+                self.dept_combo.setCurrentText(current)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load departments: {str(e)}")
     
     def load_faculty_list(self):
-        """Load faculty list into table"""
-        self.faculty_table.setRowCount(0)
+        """Load the first page of faculty into the table; more load on scroll"""
         try:
-            professors = get_all_professors()
-            self.faculty_table.setRowCount(len(professors))
-            
-            for i, prof in enumerate(professors):
-                self.faculty_table.setItem(i, 0, QTableWidgetItem(str(prof['faculty_id'])))
-                self.faculty_table.setItem(i, 1, QTableWidgetItem(prof['first_name']))
-                self.faculty_table.setItem(i, 2, QTableWidgetItem(prof['last_name']))
-                self.faculty_table.setItem(i, 3, QTableWidgetItem(prof['department_name']))
-                self.faculty_table.setItem(i, 4, QTableWidgetItem(prof['email']))
-                self.faculty_table.setItem(i, 5, QTableWidgetItem(prof['phone']))
-                self.faculty_table.setItem(i, 6, QTableWidgetItem(prof['subject_id']))
+            self.faculty_model.reload()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load faculty list: {str(e)}")
     
     def select_faculty(self):
         """Handle faculty selection from table"""
-        selected_rows = self.faculty_table.selectedIndexes()
-        if selected_rows:
+        selected = self.faculty_table.selected_row()
+        if selected:
             self.delete_btn.setEnabled(True)
-            row = selected_rows[0].row()
-            self.selected_faculty_id = int(self.faculty_table.item(row, 0).text())
+            self.selected_faculty_id = selected['faculty_id']
             self.current_mode = "edit"
             
             try:
@@ -278,9 +291,7 @@ class FacultyManagementFrame(QWidget):
                         self.dept_combo.setCurrentIndex(dept_index)
                     
                     self.email_entry.setText(faculty['email'])
-                    # Get phone from previous load_faculty_list operation
-                    row = selected_rows[0].row()
-                    self.phone_entry.setText(self.faculty_table.item(row, 5).text())
+                    self.phone_entry.setText(faculty['phone'] or "")
                     self.specialty_entry.setText(faculty['subject_id'])
                     
                     # Handle photo, if needed in the future
@@ -351,32 +362,29 @@ class FacultyManagementFrame(QWidget):
         try:
             if self.current_mode == "add":
                 # Add new faculty
-                success, msg = add_professor(
+                professor = add_professor(
                     first_name, last_name, email, phone, department, specialty, 
                     photo_url=self.photo_path
                 )
-                
-                if success:
-                    QMessageBox.information(self, "Success", "Faculty added successfully")
-                    self.reset_form()
-                else:
-                    QMessageBox.warning(self, "Error", msg)
+                QMessageBox.information(self, "Success", "Faculty added successfully")
             else:
                 # Update existing faculty
-                success, msg = update_professor(
+                professor = update_professor(
                     self.selected_faculty_id, first_name, last_name, 
                     email, phone, department, specialty, photo_url=self.photo_path
                 )
-                
-                if success:
-                    QMessageBox.information(self, "Success", "Faculty updated successfully")
-                    self.reset_form()
-                else:
-                    QMessageBox.warning(self, "Error", msg)
+                QMessageBox.information(self, "Success", "Faculty updated successfully")
             
-            # Refresh faculty list
-            self.load_faculty_list()
+            # The photo may have been replaced on disk under the same path
+            if self.photo_path:
+                get_thumbnail_cache().invalidate(self.photo_path)
+            
+            # Show the saved row in place
+            self.faculty_model.apply_change(professor)
+            self.reset_form()
             
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save faculty: {str(e)}")
     
@@ -391,18 +399,34 @@ class FacultyManagementFrame(QWidget):
         
         if reply == QMessageBox.Yes:
             try:
-                success, msg = delete_professor(self.selected_faculty_id)
+                success, msg, professor = delete_professor(self.selected_faculty_id)
                 
                 if success:
                     QMessageBox.information(self, "Success", "Faculty deleted successfully")
+                    self.faculty_model.remove_row(self.selected_faculty_id)
                     self.reset_form()
-                    self.load_faculty_list()
                 else:
                     QMessageBox.warning(self, "Error", msg)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to delete faculty: {str(e)}")
     
+    def on_data_changed(self, changes):
+        """Apply committed changes to the table and the department choices"""
+        if self.stale:
+            return
+        if changes.touches('department'):
+            self.load_departments()
+        
+        # Faculty rows show their department's name
+        department_changed = any(operation != 'insert' for _, operation in changes.of('department'))
+        if department_changed or changes.needs_reload('professor'):
+            self.load_faculty_list()
+        elif changes.touches('professor'):
+            self.faculty_model.apply_changes(changes.of('professor'), get_professor_by_id)
+    
     def on_show(self):
         """Called when frame is shown"""
-        self.load_departments()
-        self.load_faculty_list()
\ No newline at end of file
+        if self.stale:
+            self.stale = False
+            self.load_departments()
+            self.load_faculty_list()
\ No newline at end of file
@@ -6,8 +6,23 @@ from PyQt5.QtCore import Qt, QTime
 from PyQt5.QtGui import QFont
 import sqlite3
 from database import (get_all_professors, get_all_courses, get_professor_schedule,
-                    add_schedule, update_schedule, delete_schedule, get_all_schedules)
+                    add_schedule, update_schedule, delete_schedule, get_schedules_page, get_schedule_by_id,
+                    schedule_page_key)
 from ui.add_schedule_dialog import AddScheduleDialog
+from ui.table_models import RecordTableModel, RecordTableView
+from ui.change_bus import get_change_bus
+
+# Columns of the schedule table, as (header, value of a schedule row)
+SCHEDULE_COLUMNS = [
+    ("ID", lambda sched: sched['schedule_id']),
+    ("Professor", lambda sched: f"{sched['first_name']} {sched['last_name']}"),
+    ("Course", lambda sched: sched['course_code']),
+    ("Day", lambda sched: sched['day_of_week']),
+    ("Time", lambda sched: f"{sched['start_time']} - {sched['end_time']}"),
+    ("Room", lambda sched: sched['room_location']),
+    ("Year", lambda sched: sched['academic_year']),
+    ("Semester", lambda sched: sched['semester_num']),
+]
 
 class ScheduleManagementFrame(QWidget):
     def __init__(self, parent, controller):
@@ -15,6 +30,8 @@ class ScheduleManagementFrame(QWidget):
         self.controller = controller
         self.selected_schedule_id = None
         self.current_mode = "add"
+        # Loaded on first show, then kept current by on_data_changed
+        self.stale = True
         
         # Set background color
         self.setStyleSheet("background-color: #FFDD00;")
@@ -74,16 +91,16 @@ class ScheduleManagementFrame(QWidget):
         table_title.setFont(QFont("Arial", 14, QFont.Bold))
         table_layout.addWidget(table_title)
         
-        # Schedule table
-        self.schedule_table = QTableWidget()
-        self.schedule_table.setColumnCount(8)
-        self.schedule_table.setHorizontalHeaderLabels([
-            "ID", "Professor", "Course", "Day", "Time", "Room", "Year", "Semester"
-        ])
-        self.schedule_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.schedule_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.schedule_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.schedule_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # Filter for the loaded schedules
+        self.filter_entry = QLineEdit()
+        self.filter_entry.setPlaceholderText("Filter schedules...")
+        table_layout.addWidget(self.filter_entry)
+        
+        # Schedule table, read a page at a time as it is scrolled
+        self.schedule_model = RecordTableModel(SCHEDULE_COLUMNS, lambda sched: sched['schedule_id'],
+                                               schedule_page_key, get_schedules_page, parent=self)
+        self.schedule_table = RecordTableView(self.schedule_model)
+        self.filter_entry.textChanged.connect(self.schedule_table.set_filter_text)
         table_layout.addWidget(self.schedule_table)
         
         # Action buttons container
@@ -140,14 +157,15 @@ class ScheduleManagementFrame(QWidget):
         
         # Connect table selection
         self.schedule_table.clicked.connect(self.on_table_click)
+        
+        get_change_bus().changed.connect(self.on_data_changed)
     
     def on_table_click(self):
         """Enable delete button when a row is selected"""
-        selected_rows = self.schedule_table.selectedIndexes()
-        if selected_rows:
+        schedule = self.schedule_table.selected_row()
+        if schedule:
             self.delete_btn.setEnabled(True)
-            row = selected_rows[0].row()
-            self.selected_schedule_id = int(self.schedule_table.item(row, 0).text())
+            self.selected_schedule_id = schedule['schedule_id']
         else:
             self.delete_btn.setEnabled(False)
             self.selected_schedule_id = None
@@ -158,7 +176,7 @@ class ScheduleManagementFrame(QWidget):
         result = dialog.exec_()
         
         if result == QDialog.Accepted:
-            self.load_schedules()
+            self.schedule_model.apply_change(dialog.schedule)
             QMessageBox.information(self, "Success", "Schedule added successfully")
     
     def delete_selected_schedule(self):
@@ -172,11 +190,11 @@ class ScheduleManagementFrame(QWidget):
         
         if reply == QMessageBox.Yes:
             try:
-                success, msg = delete_schedule(self.selected_schedule_id)
+                success, msg, schedule = delete_schedule(self.selected_schedule_id)
                 
                 if success:
                     QMessageBox.information(self, "Success", "Schedule deleted successfully")
-                    self.load_schedules()
+                    self.schedule_model.remove_row(self.selected_schedule_id)
                     self.selected_schedule_id = None
                     self.delete_btn.setEnabled(False)
                 else:
@@ -185,32 +203,31 @@ class ScheduleManagementFrame(QWidget):
                 QMessageBox.critical(self, "Error", f"Failed to delete schedule: {str(e)}")
     
     def load_schedules(self):
-        """Load schedules into table"""
-        self.schedule_table.setRowCount(0)
+        """Load the first page of schedules into the table; more load on scroll"""
         try:
-            schedules = get_all_schedules()
-            self.schedule_table.setRowCount(len(schedules))
-            
-            for i, sched in enumerate(schedules):
-                self.schedule_table.setItem(i, 0, QTableWidgetItem(str(sched['schedule_id'])))
-                
-                professor_name = f"{sched['first_name']} {sched['last_name']}"
-                self.schedule_table.setItem(i, 1, QTableWidgetItem(professor_name))
-                
-                self.schedule_table.setItem(i, 2, QTableWidgetItem(sched['course_code']))
-                self.schedule_table.setItem(i, 3, QTableWidgetItem(sched['day_of_week']))
-                
-                time_str = f"{sched['start_time']} - {sched['end_time']}"
-                self.schedule_table.setItem(i, 4, QTableWidgetItem(time_str))
-                
-                self.schedule_table.setItem(i, 5, QTableWidgetItem(sched['room_location']))
-                self.schedule_table.setItem(i, 6, QTableWidgetItem(sched['academic_year']))
-                self.schedule_table.setItem(i, 7, QTableWidgetItem(sched['semester_num']))
+            self.schedule_model.reload()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load schedules: {str(e)}")
     
+    def on_data_changed(self, changes):
+        """Apply committed schedule changes, and professor renames, to the table"""
+        if self.stale or not changes.touches('schedule', 'professor'):
+            return
+        if changes.needs_reload('schedule') or changes.needs_reload('professor'):
+            self.load_schedules()
+            return
+        
+        # Rows show their professor's name; deleted professors' schedules have events of their own
+        renamed = {faculty_id for faculty_id, operation in changes.of('professor') if operation == 'update'}
+        updates = [(sched['schedule_id'], 'update') for sched in self.schedule_model.rows
+                   if sched['faculty_id'] in renamed]
+        self.schedule_model.apply_changes(changes.of('schedule') + updates, get_schedule_by_id)
+    
     def on_show(self):
         """Called when frame is shown"""
-        self.load_schedules()
+        if self.stale:
+            self.stale = False
+            self.load_schedules()
+        self.schedule_table.clearSelection()
         self.delete_btn.setEnabled(False)
         self.selected_schedule_id = None
\ No newline at end of file
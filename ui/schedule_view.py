@@ -4,12 +4,19 @@ from PyQt5.QtCore import Qt, pyqtSignal, QSize
 from PyQt5.QtGui import QFont, QCursor
 import sqlite3
 from database import get_professor_by_id, get_professor_schedule
+from ui.data_worker import get_data_worker
+from ui.change_bus import get_change_bus
+
+def fetch_schedule(faculty_id):
+    """Get (professor, schedule items) for the schedule view; runs on the data worker"""
+    return get_professor_by_id(faculty_id), get_professor_schedule(faculty_id)
 
 class ScheduleViewFrame(QWidget):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
         self.current_faculty_id = None
+        self.stale = False
         
         # Set background color
         self.setStyleSheet("background-color: #FFDD00;")
@@ -72,6 +79,8 @@ class ScheduleViewFrame(QWidget):
         
         # Add content area to main layout
         main_layout.addWidget(content_area)
+        
+        get_change_bus().changed.connect(self.on_data_changed)
     
     def on_resize(self, window_width, window_height):
         # Calculate available width
@@ -87,12 +96,19 @@ class ScheduleViewFrame(QWidget):
             self.schedule_table.setColumnWidth(2, int(header_width * 0.40))
     
     def load_schedule(self, faculty_id):
-        """Load schedule for a faculty member"""
+        """Load schedule for a faculty member (queried in the background)"""
         self.current_faculty_id = faculty_id
+        self.stale = False
+        self.name_label.setText("Loading schedule...")
+        self.schedule_table.setRowCount(0)
+        get_data_worker().submit("schedule_view", fetch_schedule, faculty_id,
+                                 on_result=self.show_schedule, on_error=self.show_error)
+    
+    def show_schedule(self, result):
+        """Fill the table with a (professor, schedule items) result of fetch_schedule"""
+        professor, schedule_items = result
         
         try:
-            # Get professor details
-            professor = get_professor_by_id(faculty_id)
             if not professor:
                 raise Exception("Professor not found!")
             
@@ -103,9 +119,6 @@ class ScheduleViewFrame(QWidget):
             # Clear existing schedule items
             self.schedule_table.setRowCount(0)
             
-            # Get schedule items
-            schedule_items = get_professor_schedule(faculty_id)
-            
             # Create schedule items display
             for i, item in enumerate(schedule_items):
                 self.schedule_table.insertRow(i)
@@ -144,13 +157,33 @@ class ScheduleViewFrame(QWidget):
                 self.schedule_table.setItem(0, 0, no_schedule)
             
         except Exception as e:
-            self.schedule_table.setRowCount(0)
-            self.schedule_table.insertRow(0)
-            error_item = QTableWidgetItem(f"Error: {str(e)}")
-            error_item.setTextAlignment(Qt.AlignCenter)
-            error_item.setForeground(Qt.red)
-            self.schedule_table.setSpan(0, 0, 1, 4)
-            self.schedule_table.setItem(0, 0, error_item)
+            self.show_error(str(e))
+    
+    def show_error(self, message):
+        """Replace the table contents with an error message"""
+        self.schedule_table.setRowCount(0)
+        self.schedule_table.insertRow(0)
+        error_item = QTableWidgetItem(f"Error: {message}")
+        error_item.setTextAlignment(Qt.AlignCenter)
+        error_item.setForeground(Qt.red)
+        self.schedule_table.setSpan(0, 0, 1, 4)
+        self.schedule_table.setItem(0, 0, error_item)
+    
+    def on_data_changed(self, changes):
+        # Schedule events carry the class id, not the professor's, so any of them
+        # (or a course rename) may change this table
+        if self.current_faculty_id and (changes.touches('schedule', 'course') or any(
+                entity_id == self.current_faculty_id or operation == 'reload'
+                for entity_id, operation in changes.of('professor'))):
+            if self.isVisible():
+                self.load_schedule(self.current_faculty_id)
+            else:
+                self.stale = True
+    
+    def on_show(self):
+        # Refresh content if it changed while hidden
+        if self.current_faculty_id and self.stale:
+            self.load_schedule(self.current_faculty_id)
     
     def back_to_details(self):
         """Go back to faculty details"""
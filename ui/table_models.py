@@ -0,0 +1,200 @@
+from bisect import bisect_left, bisect_right
+from PyQt5.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from database import PAGE_SIZE
+
+# Item data roles beyond Qt.DisplayRole (the cell text)
+RowRole = Qt.UserRole + 1
+SortRole = Qt.UserRole + 2
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    Table of database rows (dicts) for the admin screens. columns are
+    (header, value) pairs, value(row) giving a cell's value; row_id(row)
+    identifies a row and order_key(row) places it, in the order the rows are
+    read. With fetch_page, a keyset read like database.get_schedules_page,
+    rows load a page at a time as the view scrolls; otherwise set_rows()
+    loads them all. After a write, apply_change() and remove_row() update
+    just the affected row.
+    """
+
+    def __init__(self, columns, row_id, order_key, fetch_page=None, page_size=PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.row_id = row_id
+        self.order_key = order_key
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.rows = []
+        # order_key of every row, kept in step with rows for bisecting
+        self.keys = []
+        # order_key of every loaded row by row_id, so a row is found by bisecting too
+        self.key_of = {}
+        self.next_cursor = None
+        self.exhausted = True
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        row = self.rows[index.row()]
+        if role == RowRole:
+            return row
+        if role in (Qt.DisplayRole, SortRole):
+            value = self.columns[index.column()][1](row)
+            if value is None:
+                return ""
+            return str(value) if role == Qt.DisplayRole else value
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section < len(self.columns):
+            return self.columns[section][0]
+        return super().headerData(section, orientation, role)
+
+    def reload(self):
+        """Drop the loaded rows and read the first page again"""
+        self.beginResetModel()
+        self.rows = []
+        self.keys = []
+        self.key_of = {}
+        self.next_cursor = None
+        self.exhausted = self.fetch_page is None
+        self.endResetModel()
+        self.fetchMore()
+
+    def set_rows(self, rows):
+        """Show rows, already in order_key order, as the complete table"""
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.keys = [self.order_key(row) for row in self.rows]
+        self.key_of = {self.row_id(row): key for row, key in zip(self.rows, self.keys)}
+        self.next_cursor = None
+        self.exhausted = True
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        rows, self.next_cursor = self.fetch_page(self.next_cursor, self.page_size)
+        self.exhausted = self.next_cursor is None
+
+        # Rows apply_change() already placed come again with their page
+        rows = [row for row in rows if self.row_id(row) not in self.key_of]
+        if rows:
+            start = len(self.rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self.rows.extend(rows)
+            for row in rows:
+                key = self.order_key(row)
+                self.keys.append(key)
+                self.key_of[self.row_id(row)] = key
+            self.endInsertRows()
+
+    def find_row(self, row_id):
+        """Position of the row with this id among the loaded rows, or -1"""
+        key = self.key_of.get(row_id)
+        if key is None:
+            return -1
+        # Rows with equal keys sit together; look through them for the id
+        position = bisect_left(self.keys, key)
+        while position < len(self.rows) and self.keys[position] == key:
+            if self.row_id(self.rows[position]) == row_id:
+                return position
+            position += 1
+        return -1
+
+    def apply_change(self, row):
+        """Insert or update one row (as returned by a write function) in place"""
+        key = self.order_key(row)
+        position = self.find_row(self.row_id(row))
+        if position >= 0 and self.keys[position] == key:
+            self.rows[position] = row
+            self.dataChanged.emit(self.index(position, 0), self.index(position, len(self.columns) - 1))
+            return
+
+        if position >= 0:
+            self.remove_at(position)
+        target = bisect_right(self.keys, key)
+        # Past the last loaded row the row belongs to a page not read yet
+        if target == len(self.rows) and not self.exhausted:
+            return
+        self.beginInsertRows(QModelIndex(), target, target)
+        self.rows.insert(target, row)
+        self.keys.insert(target, key)
+        self.key_of[self.row_id(row)] = key
+        self.endInsertRows()
+
+    def remove_row(self, row_id):
+        """Remove the row with this id, e.g. after it was deleted"""
+        position = self.find_row(row_id)
+        if position >= 0:
+            self.remove_at(position)
+
+    def apply_changes(self, changes, fetch_row):
+        """
+        Bring the rows named by (row_id, operation) change events up to date:
+        deleted rows are removed, the others read again with fetch_row(row_id)
+        """
+        # Only the latest event per row matters
+        for row_id, operation in dict(changes).items():
+            row = None if operation == 'delete' else fetch_row(row_id)
+            if row is None:
+                self.remove_row(row_id)
+            else:
+                self.apply_change(row)
+
+    def remove_at(self, position):
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self.key_of[self.row_id(self.rows[position])]
+        del self.rows[position]
+        del self.keys[position]
+        self.endRemoveRows()
+
+class RecordFilterProxyModel(QSortFilterProxyModel):
+    """Sorts and filters the loaded rows of a RecordTableModel in memory, on every column"""
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self.setSortRole(SortRole)
+        self.setSortCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterKeyColumn(-1)
+
+class RecordTableView(QTableView):
+    """
+    Read-only, single-row-selection view of a RecordTableModel through a
+    RecordFilterProxyModel; header clicks sort and set_filter_text() filters
+    """
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.record_model = model
+        self.proxy = RecordFilterProxyModel(model, self)
+        self.setModel(self.proxy)
+
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # Keep the order rows are read in until a header is clicked
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.setSortingEnabled(True)
+
+    def set_filter_text(self, text):
+        """Show only rows with a cell containing text"""
+        self.proxy.setFilterFixedString(text)
+
+    def selected_row(self):
+        """The selected row's dict, or None"""
+        indexes = self.selectionModel().selectedRows()
+        return indexes[0].data(RowRole) if indexes else None
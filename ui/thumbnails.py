@@ -0,0 +1,176 @@
+import atexit
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QRect, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+
+# Pre-scaled thumbnails kept between runs, next to assets/photos
+THUMBNAIL_DIR = "assets/thumbnails"
+
+# Ready-to-paint thumbnails kept in memory
+THUMBNAIL_MEMORY_LIMIT = 512
+
+# Threads decoding photos; decoding is CPU-bound, so keep a core free for the GUI
+THUMBNAIL_THREADS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+def file_digest(path):
+    """SHA-1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def decode_thumbnail(path, size):
+    """
+    Decode an image straight at size x size (cropped to a centered square)
+    without decoding it at full resolution first; None if it is unreadable
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    original = reader.size()
+    if original.isValid():
+        # Let the decoder scale (JPEG decodes at 1/2, 1/4 or 1/8 for free)
+        reader.setScaledSize(original.scaled(size, size, Qt.KeepAspectRatioByExpanding))
+    image = reader.read()
+    if image.isNull():
+        return None
+    if image.width() != size or image.height() != size:
+        image = image.scaled(size, size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        image = image.copy(QRect((image.width() - size) // 2, (image.height() - size) // 2, size, size))
+    return image
+
+class _ThumbnailJob(QRunnable):
+    def __init__(self, cache, path, size):
+        super().__init__()
+        self.cache = cache
+        self.path = path
+        self.size = size
+
+    def run(self):
+        try:
+            image = self.cache.load_image(self.path, self.size)
+        except Exception as e:
+            print(f"Error loading thumbnail for {self.path}: {e}")
+            image = None
+        self.cache._loaded.emit(self.path, self.size, image if image is not None else QImage())
+
+class ThumbnailCache(QObject):
+    """
+    Photo thumbnails decoded off the GUI thread at the size they are shown.
+    get() returns a ready pixmap or None and queues the decode; thumbnail_ready
+    fires on the GUI thread once it is available. Thumbnails are also written to
+    THUMBNAIL_DIR under the hash of the photo's contents, so later runs and
+    professors sharing a photo skip decoding; the file's mtime and size decide
+    when that hash has to be recomputed.
+    """
+
+    # (photo path, size) of a thumbnail that just became available
+    thumbnail_ready = pyqtSignal(str, int)
+    # Emitted from the decoding threads; queued to the GUI thread by Qt
+    _loaded = pyqtSignal(str, int, QImage)
+
+    def __init__(self, directory=THUMBNAIL_DIR, limit=THUMBNAIL_MEMORY_LIMIT, threads=THUMBNAIL_THREADS,
+                 parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        self.limit = limit
+        self.pixmaps = OrderedDict()
+        self.pending = set()
+        # Photos that could not be read, so they are not retried on every paint
+        self.failed = set()
+        # Pending decodes started before their photo was invalidated; their results are dropped
+        self.superseded = set()
+        # (path, mtime, file size) -> content hash, so unchanged photos are hashed once
+        self._digests = {}
+        self._digest_lock = threading.Lock()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(threads)
+        self._loaded.connect(self._store)
+
+    def get(self, path, size):
+        """Return the size x size thumbnail of path if ready, else None (and start loading it)"""
+        if not path:
+            return None
+        key = (path, size)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            return pixmap
+        if key not in self.pending and key not in self.failed:
+            self.pending.add(key)
+            self.pool.start(_ThumbnailJob(self, path, size))
+        return None
+
+    def content_digest(self, path):
+        """Hash of a photo's contents, recomputed only when its mtime or size changes"""
+        stat = os.stat(path)
+        stamp = (path, stat.st_mtime_ns, stat.st_size)
+        with self._digest_lock:
+            digest = self._digests.get(stamp)
+        if digest is None:
+            digest = file_digest(path)
+            with self._digest_lock:
+                self._digests[stamp] = digest
+        return digest
+
+    def load_image(self, path, size):
+        """Get a thumbnail from the disk cache, or decode and store it (runs on a pool thread)"""
+        if not os.path.isfile(path):
+            return None
+        cached_path = os.path.join(self.directory, f"{self.content_digest(path)}-{size}.png")
+        if os.path.exists(cached_path):
+            image = QImage(cached_path)
+            if not image.isNull():
+                return image
+
+        image = decode_thumbnail(path, size)
+        if image is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write under a temporary name so readers never see half a file
+            temp_path = f"{cached_path}.{threading.get_ident()}.tmp"
+            if image.save(temp_path, "PNG"):
+                os.replace(temp_path, cached_path)
+        return image
+
+    def _store(self, path, size, image):
+        key = (path, size)
+        if key in self.superseded:
+            # Decode the replaced photo again; thumbnail_ready fires for that one
+            self.superseded.discard(key)
+            self.pool.start(_ThumbnailJob(self, path, size))
+            return
+        self.pending.discard(key)
+        if image.isNull():
+            self.failed.add(key)
+            return
+        self.pixmaps[key] = QPixmap.fromImage(image)
+        while len(self.pixmaps) > self.limit:
+            self.pixmaps.popitem(last=False)
+        self.thumbnail_ready.emit(path, size)
+
+    def invalidate(self, path):
+        """Forget the in-memory thumbnails of a photo, e.g. after it was replaced"""
+        for key in [key for key in self.pixmaps if key[0] == path]:
+            del self.pixmaps[key]
+        self.failed = {key for key in self.failed if key[0] != path}
+        self.superseded.update(key for key in self.pending if key[0] == path)
+
+_thumbnail_cache = None
+
+def get_thumbnail_cache():
+    """Get the shared thumbnail cache, creating it on first use"""
+    global _thumbnail_cache
+    if _thumbnail_cache is None:
+        _thumbnail_cache = ThumbnailCache()
+    return _thumbnail_cache
+
+def wait_for_thumbnails():
+    """Let queued decodes finish; threads still running when the interpreter exits would abort it"""
+    if _thumbnail_cache is not None:
+        _thumbnail_cache.pool.clear()
+        _thumbnail_cache.pool.waitForDone()
+
+atexit.register(wait_for_thumbnails)